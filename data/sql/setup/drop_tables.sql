@@ -4,4 +4,5 @@ DROP TABLE matches;
 DROP TABLE networks;
 DROP TABLE odds;
 DROP TABLE bets;
-DROP TABLE metrics;
\ No newline at end of file
+DROP TABLE metrics;
+DROP TABLE inactive_matches;
\ No newline at end of file
@@ -0,0 +1,14 @@
+CREATE TABLE IF NOT EXISTS inactive_matches (
+    match_id VARCHAR(255) NOT NULL,
+    network_name VARCHAR(255) NOT NULL,
+    node1 VARCHAR(255) NOT NULL,
+    node2 VARCHAR(255) NOT NULL,
+    season VARCHAR(255) NOT NULL,
+    round VARCHAR(255) NOT NULL,
+    day INTEGER NOT NULL,
+    winner VARCHAR(255),
+    PRIMARY KEY (match_id, network_name),
+    FOREIGN KEY (network_name)
+    REFERENCES networks (network_name)
+    ON UPDATE CASCADE ON DELETE CASCADE
+);
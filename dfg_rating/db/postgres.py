@@ -1,23 +1,46 @@
+import csv
+import io
 import os
+import uuid
+import weakref
+from contextlib import contextmanager
 
 import psycopg2 as psql
 from configparser import ConfigParser
 
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from psycopg2.extras import DictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 from dfg_rating import settings
 from dfg_rating.settings import get_relative_path
 
+MIGRATIONS = ['inactive_matches.sql']
+
 
 class PostgreSQLDriver:
-    def __init__(self, config=None, config_file='database.ini'):
-        self.connection_params = None
+    """PostgreSQL access of the simulator. Queries run on connections borrowed from a pool of the dfg_rating
+    database, created once by connect.
+
+    Attributes:
+        itersize (int): Number of rows fetched per round trip by the server-side cursors of stream_query.
+        copy_size (int): Number of rows sent per COPY statement by copy_many.
+        min_connections (int): Connections kept open by the pool.
+        max_connections (int): Maximum number of connections of the pool.
+        pool (ThreadedConnectionPool): Connection pool, None until connect.
+        prepared_statements (WeakKeyDictionary): Names of the statements prepared on each pooled connection.
+    """
+    def __init__(self, config=None, config_file='database.ini', itersize=10000, copy_size=100000, min_connections=1,
+                 max_connections=8):
+        self.connection_params = config
         if config is None:
             self.connection_params = self.read_config_params(config_file)
-        self.connection = None
-        #self.connect()
-        pass
+        self.itersize = itersize
+        self.copy_size = copy_size
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.pool = None
+        self.prepared_statements = weakref.WeakKeyDictionary()
 
     def read_config_params(self, filename="database.ini", section='postgresql'):
         # create a parser
@@ -37,71 +60,190 @@ class PostgreSQLDriver:
         return db
 
     def connect(self):
-        if self.connection is None:
+        if self.pool is None:
             try:
-                self.connection = psql.connect(**self.connection_params)
-                cur = self.connection.cursor()
+                connection = psql.connect(**self.connection_params)
+                cur = connection.cursor()
                 cur.execute('SELECT version()')
                 db_version = cur.fetchone()
                 print(db_version)
                 cur.execute("SELECT * FROM pg_catalog.pg_database WHERE datname = 'dfg_rating';")
                 databases = cur.fetchall()
                 cur.close()
-                self.connection.commit()
+                connection.commit()
                 if len(databases) == 0:
-                    self.connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-                    cur = self.connection.cursor()
+                    connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                    cur = connection.cursor()
                     print("Creating dfg_rating database")
                     cur.execute('CREATE DATABASE dfg_rating;')
-                    self.connection.close()
+                connection.close()
                 print("dfg_rating database exists. Loading database")
                 self.connection_params['database'] = 'dfg_rating'
-                self.connection = psql.connect(**self.connection_params)
+                self.pool = ThreadedConnectionPool(
+                    self.min_connections, self.max_connections, **self.connection_params
+                )
                 tables_list = self.execute_query(file_name=os.path.join("..", "data", "sql", "setup", "get_tables_list.sql"))
                 if len(tables_list) == 0:
                     self.execute_query(file_name=os.path.join("..", "data", "sql", "setup", "create_tables.sql"), commit=True)
+                self.migrate()
             except (Exception, psql.DatabaseError) as error:
                 print(error)
 
+    def migrate(self):
+        """Runs the scripts of data/sql/setup/migrations, which bring databases created with an older
+        create_tables.sql up to date. Each script must be safe to run on every connection (IF NOT EXISTS).
+        """
+        for file_name in MIGRATIONS:
+            self.execute_query(
+                file_name=os.path.join("..", "data", "sql", "setup", "migrations", file_name), commit=True
+            )
+
     def close(self):
-        if self.connection is not None:
-            self.connection.close()
+        if self.pool is not None:
+            self.pool.closeall()
+            self.pool = None
+            self.prepared_statements = weakref.WeakKeyDictionary()
             print('Database connection closed.')
 
-    def execute_query(self, file_name=None, query=None, commit=False):
+    @contextmanager
+    def pooled_connection(self):
+        """Borrows a connection from the pool, given back when the context ends"""
+        connection = self.pool.getconn()
+        try:
+            yield connection
+        finally:
+            self.pool.putconn(connection)
+
+    def execute_query(self, file_name=None, query=None, commit=False, params=None):
+        """Runs a query, read from <file_name> or given as <query>, and returns all its rows. Values are passed
+        apart in <params> and bound by the driver (%s placeholders).
+        """
         if file_name is not None:
+            sql_file = open(get_relative_path(file_name))
+            query = sql_file.read()
+            sql_file.close()
+        if query is None:
+            return None
+        with self.pooled_connection() as connection:
             try:
-                cursor: DictCursor = self.connection.cursor(cursor_factory=DictCursor)
-                sql_file = open(get_relative_path(file_name))
-                cursor.execute(sql_file.read())
-                sql_file.close()
+                cursor: DictCursor = connection.cursor(cursor_factory=DictCursor)
+                cursor.execute(query, params)
+                rows = cursor.fetchall() if cursor.description is not None else []
                 if commit:
-                    self.connection.commit()
-                return cursor.fetchall()
+                    connection.commit()
+                return rows
             except (Exception, psql.DatabaseError) as error:
                 print(error)
-        elif query is not None:
+                connection.rollback()
+
+    def execute_prepared(self, statement_name, query, params=()):
+        """Runs <query> as the prepared statement <statement_name> and returns all its rows.
+
+        The statement is prepared once per pooled connection ($1, $2... placeholders) and executed with <params>,
+        so the server parses and plans it only once. Prepared statements are tracked on the connection objects, and
+        prepared again if the server does not know them. Errors are printed and raised.
+        """
+        placeholders = f"({', '.join(['%s'] * len(params))})" if len(params) > 0 else ""
+        with self.pooled_connection() as connection:
             try:
-                cursor: DictCursor = self.connection.cursor(cursor_factory=DictCursor)
-                cursor.execute(query)
-                if commit:
-                    self.connection.commit()
-                return cursor.fetchall()
+                cursor: DictCursor = connection.cursor(cursor_factory=DictCursor)
+                prepared = self.prepared_statements.setdefault(connection, set())
+                if statement_name not in prepared:
+                    cursor.execute(f"PREPARE {statement_name} AS {query}")
+                    prepared.add(statement_name)
+                try:
+                    cursor.execute(f"EXECUTE {statement_name}{placeholders}", params)
+                except psql.errors.InvalidSqlStatementName:
+                    connection.rollback()
+                    cursor.execute(f"PREPARE {statement_name} AS {query}")
+                    cursor.execute(f"EXECUTE {statement_name}{placeholders}", params)
+                rows = cursor.fetchall()
+                connection.commit()
+                return rows
+            except (Exception, psql.DatabaseError) as error:
+                print(error)
+                connection.rollback()
+                raise
+
+    def stream_query(self, query, itersize=None, params=None):
+        """Runs <query> on a named server-side cursor and yields its rows in chunks of <itersize> rows, so that the
+        result is never loaded as a whole in memory.
+        """
+        itersize = itersize or self.itersize
+        with self.pooled_connection() as connection:
+            cursor = None
+            try:
+                cursor = connection.cursor(name=f"dfg_stream_{uuid.uuid4().hex}", cursor_factory=DictCursor)
+                cursor.itersize = itersize
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(itersize)
+                    if len(rows) == 0:
+                        break
+                    yield rows
             except (Exception, psql.DatabaseError) as error:
                 print(error)
+            finally:
+                if cursor is not None:
+                    cursor.close()
+                connection.commit()
+
+    def copy_many(self, table, columns, rows):
+        """Inserts an iterable of row dictionaries into <table> with COPY ... FROM STDIN in CSV format.
+
+        Rows are copied in chunks of copy_size rows into a temporary table and moved to <table> skipping the
+        existing keys, as the ON CONFLICT DO NOTHING inserts did.
+        """
+        columns = list(columns)
+        column_list = ','.join(columns)
+        staging_table = f"staging_{table}"
+        with self.pooled_connection() as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.execute(
+                    f"CREATE TEMP TABLE IF NOT EXISTS {staging_table} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                n_buffered = 0
+                for row in rows:
+                    writer.writerow([row[c] for c in columns])
+                    n_buffered += 1
+                    if n_buffered == self.copy_size:
+                        self._copy_buffer(cursor, staging_table, column_list, buffer)
+                        buffer = io.StringIO()
+                        writer = csv.writer(buffer)
+                        n_buffered = 0
+                if n_buffered > 0:
+                    self._copy_buffer(cursor, staging_table, column_list, buffer)
+                cursor.execute(
+                    f"INSERT INTO {table}({column_list}) SELECT {column_list} FROM {staging_table} "
+                    f"ON CONFLICT DO NOTHING"
+                )
+            except (Exception, psql.DatabaseError) as error:
+                print(error)
+                connection.rollback()
+            finally:
+                connection.commit()
+
+    @staticmethod
+    def _copy_buffer(cursor, table, column_list, buffer):
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table}({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
 
     def insert_many(self, query_string, values):
         print(query_string)
-        try:
-            cursor: DictCursor = self.connection.cursor(cursor_factory=DictCursor)
-            execute_values(cursor, query_string, values)
-            #self.connection.commit()
-        except (psql.errors.UniqueViolation) as e:
-            print("Entity already exists")
-        except (Exception, psql.DatabaseError) as error:
-            print(error)
-        finally:
-            self.connection.commit()
+        with self.pooled_connection() as connection:
+            try:
+                cursor: DictCursor = connection.cursor(cursor_factory=DictCursor)
+                execute_values(cursor, query_string, values)
+                #self.connection.commit()
+            except (psql.errors.UniqueViolation) as e:
+                print("Entity already exists")
+            except (Exception, psql.DatabaseError) as error:
+                print(error)
+            finally:
+                connection.commit()
 
 
 class DummyDriver:
@@ -119,13 +261,24 @@ class DummyDriver:
     def close(self):
         print("DummyDriver: Connection closed (dummy mode)")
 
-    def execute_query(self, file_name=None, query=None, _commit=False):
+    def execute_query(self, file_name=None, query=None, _commit=False, params=None):
         if file_name is not None:
             print(f"DummyDriver: Would execute SQL file: {file_name} (dummy mode)")
         elif query is not None:
             print(f"DummyDriver: Would execute query: {query[:50]}... (dummy mode)")
         return []
 
+    def execute_prepared(self, statement_name, query, params=()):
+        print(f"DummyDriver: Would execute prepared statement {statement_name}: {query[:50]}... (dummy mode)")
+        return []
+
+    def stream_query(self, query, itersize=None, params=None):
+        print(f"DummyDriver: Would stream query: {query[:50]}... (dummy mode)")
+        return iter([])
+
+    def copy_many(self, table, columns, rows):
+        print(f"DummyDriver: Would copy {len(rows)} records into {table} (dummy mode)")
+
     def insert_many(self, query_string, values):
         print(f"DummyDriver: Would insert {len(values)} records with query: {query_string[:50]}... (dummy mode)")
 
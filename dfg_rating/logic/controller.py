@@ -1,4 +1,7 @@
+import copy
+import itertools
 import os
+import time
 import pandas as pd
 import numpy as np
 from typing import Dict
@@ -7,7 +10,10 @@ from dfg_rating.db.postgres import PostgreSQLDriver, DummyDriver
 from dfg_rating.model import factory
 from dfg_rating.model.betting.betting import BaseBetting
 from dfg_rating.model.bookmaker.base_bookmaker import BaseBookmaker
-from dfg_rating.model.network.base_network import BaseNetwork, WhiteNetwork
+from dfg_rating.model.network.base_network import BaseNetwork, WhiteNetwork, group_by_match, report_rows
+
+SERIALIZED_TABLES = ['matches', 'forecasts', 'odds', 'bets', 'metrics', 'ratings', 'inactive_matches']
+MATCH_TABLES = ['forecasts', 'odds', 'bets', 'metrics']
 
 
 class Controller:
@@ -199,11 +205,32 @@ class Controller:
         return 1
 
     def load_network_from_tabular(self, network_name: str, file_path: str, new_mapping: str, **params):
+        """Loads a network out of a csv or xlsx file with one of the pre-defined mappings.
+
+        With a <chunksize>, csv files are streamed: read in chunks of typed columns (those of the mapping, unless
+        <all_columns>) and appended to the network one after another. The file must be sorted by day.
+        """
         if network_name in self.networks:
             return 0, f"Network <{network_name}> already exists"
+        mapping = factory.pre_mappings.get(new_mapping, {})
         extension = file_path.split('.')[-1]
+        chunksize = params.get("chunksize", None)
+        if chunksize is not None:
+            if extension != 'csv':
+                return 0, "Streaming is only available for csv files"
+            columns, dtypes = WhiteNetwork.mapping_columns(mapping)
+            all_columns = params.get("all_columns", False)
+            chunks = pd.read_csv(
+                file_path,
+                sep=params.get("delimiter", ","),
+                chunksize=chunksize,
+                usecols=None if all_columns else (lambda c: c in columns),
+                dtype=dtypes
+            )
+            self.networks[network_name] = WhiteNetwork(data=chunks, mapping=mapping)
+            return 1, "Network loaded correctly"
         if extension == 'csv':
-            network_df = pd.read_csv(file_path, params.get("delimiter", None))
+            network_df = pd.read_csv(file_path, sep=params.get("delimiter", None), engine="python")
         elif extension == 'xlsx':
             network_df = pd.read_excel(file_path, engine="openpyxl")
         else:
@@ -212,7 +239,7 @@ class Controller:
             return 0, f"Network <{network_name}> empty at {file_path}"
         self.networks[network_name] = WhiteNetwork(
             data=network_df,
-            mapping=factory.pre_mappings.get(new_mapping, {})
+            mapping=mapping
         )
         return 1, "Network loaded correctly"
 
@@ -221,43 +248,74 @@ class Controller:
         if new_network_name in self.networks:
             return 0, f"Network <{network_name}> already exists"
         self.db.connect()
-        db_networks = self.db.execute_query(
-            query=f"SELECT * FROM public.networks m WHERE m.network_name = '{network_name}'")
+        db_networks = self.db.execute_prepared(
+            "load_network", "SELECT * FROM public.networks n WHERE n.network_name = $1", (network_name,)
+        )
         if len(db_networks) == 0:
             return 0, f"Database does not contain network <{network_name}>"
-        matches = self.db.execute_query(query=f"SELECT * FROM public.matches m WHERE m.network_name = '{network_name}'")
-        forecasts = self.db.execute_query(
-            query=f"SELECT * FROM public.forecasts f WHERE f.network_name = '{network_name}'")
-        odds = self.db.execute_query(
-            query=f"SELECT * FROM public.odds o WHERE o.network_name = '{network_name}'")
-        bets = self.db.execute_query(
-            query=f"SELECT * FROM public.bets b WHERE b.network_name = '{network_name}'")
-        metrics = self.db.execute_query(
-            query=f"SELECT * FROM public.metrics m WHERE m.network_name = '{network_name}'")
-        ratings = self.db.execute_query(query=f"SELECT * FROM public.ratings r WHERE r.network_name = '{network_name}'")
-        print(f"Total of {len(matches)} matches.")
-        print(f"Total of {len(forecasts)} forecasts.")
-        print(f"Total of {len(ratings)} ratings.")
-        print(f"Total of {len(odds)} odds.")
-        print(f"Total of {len(bets)} bets.")
-        print(f"Total of {len(metrics)} metrics.")
+        tables = {}
+        for table_name in SERIALIZED_TABLES:
+            start_time = time.time()
+            rows = itertools.chain.from_iterable(self.db.stream_query(
+                query=f"SELECT * FROM public.{table_name} t WHERE t.network_name = %s", params=(network_name,)))
+            if table_name in MATCH_TABLES:
+                tables[table_name] = group_by_match(rows)
+                report_rows(table_name, sum(len(v) for v in tables[table_name].values()), start_time)
+            else:
+                tables[table_name] = list(rows)
+                report_rows(table_name, len(tables[table_name]), start_time)
         for network in db_networks:
             self.networks.setdefault(
                 new_network_name,
                 factory.new_network(network['network_type'], create=False, play=False),
             ).deserialize_network(
-                network['seasons'],
-                network['rounds'],
-                network['days_between_rounds'],
-                matches=matches,
-                forecasts=forecasts,
-                ratings=ratings,
-                odds=odds,
-                bets=bets,
-                metrics=metrics
+                rounds=network['rounds'],
+                seasons=network['seasons'],
+                days=network['days_between_rounds'],
+                **tables
             )
         return 1, "Network loaded correctly"
 
+    def load_networks_from_sql(self, network_names=None):
+        """Loads several networks, all the networks of the database if <network_names> is None.
+
+        Each table is fetched once for all the networks, with one prepared query over the list of names, and its
+        rows are fanned out by network_name.
+        """
+        self.db.connect()
+        if network_names is None:
+            db_networks = self.db.execute_prepared("load_all_networks", "SELECT * FROM public.networks n")
+        else:
+            db_networks = self.db.execute_prepared(
+                "load_networks", "SELECT * FROM public.networks n WHERE n.network_name = ANY($1)",
+                (list(network_names),)
+            )
+        db_networks = [n for n in db_networks if n['network_name'] not in self.networks]
+        if len(db_networks) == 0:
+            return 0, f"Database does not contain new networks"
+        names = [n['network_name'] for n in db_networks]
+        tables = {name: {table_name: [] for table_name in SERIALIZED_TABLES} for name in names}
+        for table_name in SERIALIZED_TABLES:
+            start_time = time.time()
+            rows = self.db.execute_prepared(
+                f"load_many_{table_name}", f"SELECT * FROM public.{table_name} t WHERE t.network_name = ANY($1)",
+                (names,)
+            )
+            for row in rows:
+                tables[row['network_name']][table_name].append(row)
+            report_rows(table_name, len(rows), start_time)
+        for network in db_networks:
+            self.networks.setdefault(
+                network['network_name'],
+                factory.new_network(network['network_type'], create=False, play=False),
+            ).deserialize_network(
+                rounds=network['rounds'],
+                seasons=network['seasons'],
+                days=network['days_between_rounds'],
+                **tables[network['network_name']]
+            )
+        return 1, f"{len(db_networks)} networks loaded correctly"
+
     def save_network(self, network_name: str):
         if network_name not in self.networks:
             return 0, f"Network <{network_name}> does not exist"
@@ -266,14 +324,30 @@ class Controller:
         for table, table_rows in serialized_network.items():
             print(table, len(table_rows))
             if len(table_rows) > 0:
-                columns = table_rows[0].keys()
-                query_string = f"INSERT INTO {table}({','.join(columns)}) VALUES %s ON CONFLICT DO NOTHING"
-                values = [[value for value in r.values()] for r in table_rows]
-                self.db.insert_many(query_string, values)
+                self.db.copy_many(table, table_rows[0].keys(), table_rows)
             else:
                 print(f"No {table} to insert in the database")
         return 1, f"Network <{network_name}> saved correctly"
 
+    def save_network_to_parquet(self, network_name: str, path: str):
+        if network_name not in self.networks:
+            return 0, f"Network <{network_name}> does not exist"
+        self.networks[network_name].to_parquet(path, network_name)
+        return 1, f"Network <{network_name}> saved correctly"
+
+    def load_network_from_parquet(self, network_name: str, path: str, **params):
+        """Loads a network written with save_network_to_parquet. <backend> chooses the storage of its matches."""
+        if network_name in self.networks:
+            return 0, f"Network <{network_name}> already exists"
+        from dfg_rating.model.network.network_parquet import read_network_info
+        info = read_network_info(path)
+        network = factory.new_network(
+            info['network_type'], create=False, play=False, backend=params.get("backend", "graph")
+        )
+        network.from_parquet(path)
+        self.networks[network_name] = network
+        return 1, "Network loaded correctly"
+
     def export_network(self, network_name: str, **kwargs):
         if network_name not in self.networks:
             return 0, f"Network <{network_name}> does not exist"
@@ -345,43 +419,50 @@ class Controller:
             base_forecast=base_forecast
         )
 
+    def betting_returns(self, network, evaluator, odds, bets):
+        """BettingReturns of each (bookmaker, bettor) pair of the <odds> and <bets> lists, None for the pairs whose
+        bets, odds or true model forecasts are missing"""
+        n = self.networks[network]
+        returns = []
+        for bookmaker_name, bettor_name in zip(odds, bets):
+            pair_evaluator = copy.copy(evaluator)
+            pair_evaluator.bookmaker_name = bookmaker_name
+            pair_evaluator.player_name = bettor_name
+            pair_evaluator.true_model = evaluator.true_model or 'true_forecast'
+            returns.append(n.get_betting_returns(pair_evaluator))
+        return returns
+
     def profitability_study(self, network, evaluator, odds, bets):
         n = self.networks[network]
         analysis_dict = []
-        for away, home, match_id, match_attributes in n.iterate_over_games():
-            for o_number, o in enumerate(odds):
-                print(match_attributes)
+        for betting_returns in self.betting_returns(network, evaluator, odds, bets):
+            if betting_returns is None:
+                continue
+            expected_results = betting_returns.get('expected')
+            actual_results = betting_returns.get('actual')
+            for match_i in range(len(betting_returns)):
+                match_attributes = n.data.edges[
+                    betting_returns.away[match_i], betting_returns.home[match_i], betting_returns.key[match_i]
+                ]
                 new_row = {
-                    "HomeTeam": home,
-                    "AwayTeam": away,
+                    "HomeTeam": betting_returns.home[match_i],
+                    "AwayTeam": betting_returns.away[match_i],
                     "Season": match_attributes.get('season', None),
                     "Round": match_attributes.get('round', None),
-                    "Result": match_attributes.get('winner', None),
+                    "Result": betting_returns.winner[match_i],
                 }
                 for forecast in ['true_forecast', 'elo_forecast']:
                     forecast_object = match_attributes.get('forecasts', {}).get(forecast, None)
                     if forecast_object is not None:
                         for i, outcome in enumerate(forecast_object.outcomes):
                             new_row[f"{forecast}#{outcome}"] = float(f"{forecast_object.probabilities[i]:.2f}")
-                match_odds = match_attributes.get('odds', {}).get(o, [])
-                match_bets = match_attributes.get('bets', {}).get(bets[o_number], [])
-                print(match_odds, match_bets)
-                for i_odd, odd in enumerate(match_odds):
-                    new_row[f"odds#{forecast_object.outcomes[i_odd]}"] = float(f"{odd:.2f}")
-                for i_bet, bet in enumerate(match_bets):
-                    new_row[f"bet#{forecast_object.outcomes[i_bet]}"] = float(f"{bet:.2f}")
-                new_row['Bettor'] = bets[o_number]
-                new_row['Bookmaker'] = o
-                obj_forecast = match_attributes.get('forecasts', {}).get('true_forecast', None)
-                expected_results, actual_results = evaluator.eval(
-                    bets=match_bets,
-                    bettor_predictions=obj_forecast.probabilities,
-                    bookmaker_odds=match_odds,
-                    observed_result=new_row['Result']
-                )
-                for i_bet, bet in enumerate(match_bets):
-                    new_row[f"expected#bet#{forecast_object.outcomes[i_bet]}"] = float(f"{expected_results[i_bet]:.2f}")
-                    new_row[f"return#bet#{forecast_object.outcomes[i_bet]}"] = float(f"{actual_results[i_bet]:.2f}")
+                for i, outcome in enumerate(betting_returns.outcomes):
+                    new_row[f"odds#{outcome}"] = float(f"{betting_returns.odds[match_i, i]:.2f}")
+                    new_row[f"bet#{outcome}"] = float(f"{betting_returns.bets[match_i, i]:.2f}")
+                    new_row[f"expected#bet#{outcome}"] = float(f"{expected_results[match_i, i]:.2f}")
+                    new_row[f"return#bet#{outcome}"] = float(f"{actual_results[match_i, i]:.2f}")
+                new_row['Bettor'] = betting_returns.bettor_name
+                new_row['Bookmaker'] = betting_returns.bookmaker_name
                 analysis_dict.append(new_row)
         return analysis_dict
 
@@ -533,28 +614,7 @@ class Controller:
         self.networks["real_tennis"] = white_network"""
 
     def load_all_database(self):
-        self.db.connect()
-        db_networks = self.db.execute_query(
-            query=f"SELECT * FROM public.networks m")
-        if len(db_networks) == 0:
-            return 0, f"Database does not contain networks"
-        for n in db_networks:
-            network_name = n['network_name']
-            matches = self.db.execute_query(
-                query=f"SELECT * FROM public.matches m WHERE m.network_name = '{network_name}'")
-            forecasts = self.db.execute_query(
-                query=f"SELECT * FROM public.forecasts f WHERE f.network_name = '{network_name}'")
-            ratings = self.db.execute_query(
-                query=f"SELECT * FROM public.ratings r WHERE r.network_name = '{network_name}'")
-            self.networks.setdefault(
-                n['network_name'],
-                factory.new_network(n['network_type'])
-            ).deserialize_network(
-                matches=matches,
-                forecasts=forecasts,
-                ratings=ratings
-            )
-            self.networks[network_name].play()
+        return self.load_networks_from_sql()
 
     def close(self):
         self.db.close()
@@ -0,0 +1,131 @@
+import copy
+import csv
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from dfg_rating.model import factory
+
+MATCH_COLUMNS = ['Configuration', 'Replication', 'Season', 'Round', 'Day', 'HomeTeam', 'AwayTeam', 'Result']
+
+
+def run_simulation(configuration, seed_sequence: np.random.SeedSequence):
+    """Builds, rates, forecasts and evaluates one network and returns its per-match evaluation rows.
+
+    Args:
+        configuration: Simulation configuration with the keys:
+            - network: Network type of factory.new_network or network class.
+            - network_params: Keyword arguments of the network.
+            - ratings: List of (rating, rating_name) to add.
+            - forecasts: List of (forecast, forecast_name, base_ranking) to add.
+            - evaluators: List of (evaluator, evaluator_name) to add.
+        seed_sequence: Seed of the network, root of the random generators of the simulation.
+
+    Returns:
+        List[dict]: One row per active match with its schedule, result and metrics.
+    """
+    network_params = {**configuration.get('network_params', {}), 'seed': seed_sequence}
+    network_type = configuration.get('network', 'round-robin')
+    if isinstance(network_type, str):
+        network = factory.new_network(network_type, **network_params)
+    else:
+        network = network_type(**network_params)
+    for rating, rating_name in configuration.get('ratings', []):
+        network.add_rating(rating, rating_name)
+    for forecast, forecast_name, base_ranking in configuration.get('forecasts', []):
+        network.add_forecast(forecast, forecast_name, base_ranking)
+    evaluators = configuration.get('evaluators', [])
+    network.add_evaluation(evaluators)
+    rows = []
+    for away_team, home_team, edge_key, edge_attributes in network.iterate_over_games():
+        if edge_attributes.get('state', 'active') != 'active':
+            continue
+        row = {
+            "Season": edge_attributes.get('season', 0),
+            "Round": edge_attributes.get('round', -1),
+            "Day": edge_attributes.get('day', -1),
+            "HomeTeam": network.node_attributes[home_team].get('name', home_team),
+            "AwayTeam": network.node_attributes[away_team].get('name', away_team),
+            "Result": edge_attributes.get('winner', None),
+        }
+        for evaluator, evaluator_name in evaluators:
+            row[evaluator_name] = edge_attributes.get('metrics', {}).get(evaluator_name, None)
+        rows.append(row)
+    return rows
+
+
+def _run_task(task):
+    configuration_i, replication, configuration, seed_sequence = task
+    rows = run_simulation(configuration, seed_sequence)
+    extra = {"Configuration": configuration_i, "Replication": replication, **configuration.get('attributes', {})}
+    return [{**extra, **row} for row in rows]
+
+
+class SimulationRunner:
+    """Monte Carlo runner of a grid of simulation configurations across a pool of processes.
+
+    Each configuration is simulated <replications> times. Every task gets its own network seed, spawned in task order
+    from a np.random.SeedSequence of <seed>, so results do not depend on the number of workers. The per-match rows
+    of the tasks are written to a single csv file in task order as soon as they are available.
+
+    Attributes:
+        configurations (list): Simulation configurations (see run_simulation). The <attributes> dictionary of a
+            configuration is added as columns to all its rows.
+        replications (int): Number of simulations of each configuration.
+        seed (int): Entropy of the root seed sequence. Fresh entropy if None.
+        workers (int): Number of worker processes. Tasks run in the current process if 1.
+    """
+
+    def __init__(self, configurations, replications=1, seed=None, workers=None):
+        self.configurations = configurations
+        self.replications = replications
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.workers = workers
+
+    def tasks(self):
+        seeds = np.random.SeedSequence(self.seed).spawn(len(self.configurations) * self.replications)
+        return [
+            (c_i, replication, configuration, seeds[c_i * self.replications + replication])
+            for c_i, configuration in enumerate(self.configurations)
+            for replication in range(self.replications)
+        ]
+
+    def columns(self):
+        columns = list(MATCH_COLUMNS)
+        for configuration in self.configurations:
+            for name in list(configuration.get('attributes', {})) + [
+                evaluator_name for _, evaluator_name in configuration.get('evaluators', [])
+            ]:
+                if name not in columns:
+                    columns.append(name)
+        return columns
+
+    def run(self, file_path):
+        """Runs all the tasks and writes their rows to the csv file at <file_path>.
+
+        Returns:
+            int: Number of rows written.
+        """
+        start_time = time.time()
+        tasks = self.tasks()
+        n_rows = 0
+        with open(file_path, 'w', newline='') as result_file:
+            writer = csv.DictWriter(result_file, fieldnames=self.columns())
+            writer.writeheader()
+            if self.workers == 1:
+                results = (_run_task(copy.deepcopy(task)) for task in tasks)
+                n_rows = self._write(writer, results, len(tasks), start_time)
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    n_rows = self._write(writer, executor.map(_run_task, tasks), len(tasks), start_time)
+        return n_rows
+
+    @staticmethod
+    def _write(writer, results, n_tasks, start_time):
+        n_rows = 0
+        for task_i, rows in enumerate(results):
+            writer.writerows(rows)
+            n_rows += len(rows)
+            print(f"Task {task_i + 1}/{n_tasks}: {n_rows} rows in {time.time() - start_time:.1f} seconds")
+        return n_rows
@@ -13,6 +13,24 @@ class BaseBetting(ABC):
     def bet(self, forecast, odds):
         pass
 
+    def bet_batch(self, forecasts, odds):
+        """Computes the bets of several matches at once.
+
+        Forecasts and odds are (n_matches x n_outcomes) arrays or stacks of them that broadcast together, e.g.
+        (n_bettors x 1 x n_matches x n_outcomes) forecasts against (n_bookmakers x n_matches x n_outcomes) odds.
+        The error is drawn for each forecast and odds pair, in the order bet() would be called on them.
+        """
+        forecasts, odds = np.broadcast_arrays(np.asarray(forecasts, dtype=float), np.asarray(odds, dtype=float))
+        n_outcomes = forecasts.shape[-1]
+        bets = [self.bet(f, o) for f, o in zip(forecasts.reshape(-1, n_outcomes), odds.reshape(-1, n_outcomes))]
+        return np.array(bets).reshape(forecasts.shape)
+
+    def _forecasts_with_error(self, forecasts, odds):
+        """Forecasts broadcast against the odds with one error draw for each forecast and odds pair"""
+        forecasts, odds = np.broadcast_arrays(np.asarray(forecasts, dtype=float), np.asarray(odds, dtype=float))
+        forecasts_with_error = self.error.apply_batch(forecasts.reshape(-1, forecasts.shape[-1]))
+        return forecasts_with_error.reshape(forecasts.shape), odds
+
 
 class FixedBetting(BaseBetting):
 
@@ -29,6 +47,11 @@ class FixedBetting(BaseBetting):
 
         bets = np.array([decide_betting(i) for i in betting_inputs])
         return bets
+
+    def bet_batch(self, forecasts, odds):
+        forecasts_with_error, odds = self._forecasts_with_error(forecasts, odds)
+        betting_inputs = forecasts_with_error * odds
+        return np.where(betting_inputs > 1.0, 0.01 * self.bank_role, 0.0)
   
     
 class ThresholdBetting(BaseBetting):
@@ -47,6 +70,11 @@ class ThresholdBetting(BaseBetting):
 
         bets = np.array([decide_betting(i) for i in betting_inputs])
         return bets
+
+    def bet_batch(self, forecasts, odds):
+        forecasts_with_error, odds = self._forecasts_with_error(forecasts, odds)
+        betting_inputs = forecasts_with_error * odds
+        return np.where(betting_inputs > 1 + self.threshold, 0.01 * self.bank_role, 0.0)
     
     
 class KellyBetting(BaseBetting):
@@ -64,3 +92,9 @@ class KellyBetting(BaseBetting):
 
         bets = np.array([decide_betting(i) for i in betting_inputs])
         return bets
+
+    def bet_batch(self, forecasts, odds):
+        forecasts_with_error, odds = self._forecasts_with_error(forecasts, odds)
+        betting_inputs = np.zeros(odds.shape)
+        np.divide(forecasts_with_error * odds - 1, odds - 1, out=betting_inputs, where=odds > 1)
+        return np.where(betting_inputs > 0.0, betting_inputs * 0.01 * self.bank_role, 0.0)
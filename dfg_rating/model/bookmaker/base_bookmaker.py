@@ -12,8 +12,7 @@ class BookmakerMargin:
         self.margin = margin
 
     def apply(self, forecast_probabilities):
-        raw_odds = (1 / forecast_probabilities) * (1 - self.margin)
-        return np.maximum(np.full_like(raw_odds, 1), (1 / forecast_probabilities) * (1 - self.margin))
+        return np.maximum(1, (1 / forecast_probabilities) * (1 - self.margin))
 
 
 # Bookmaker implementation
@@ -43,6 +42,10 @@ class BaseBookmaker(ABC):
         self._compute_forecast(true_probs)
         return self._compute_odds()
 
+    def get_odds_batch(self, true_probs):
+        """Computes the (n_matches x n_outcomes) odds of several matches out of their probabilities"""
+        return np.array([self.get_odds(row) for row in true_probs])
+
 
 class SimpleBookmaker(BaseBookmaker):
 
@@ -55,3 +58,7 @@ class SimpleBookmaker(BaseBookmaker):
     def _compute_odds(self):
         odds = self.margin.apply(self.forecast)
         return odds
+
+    def get_odds_batch(self, true_probs):
+        self.forecast = self.error.apply_batch(true_probs)
+        return self._compute_odds()
@@ -6,6 +6,17 @@ from dfg_rating.model.evaluators.base_evaluators import Evaluator
 
 
 class AccuracyEvaluator(Evaluator):
+    """Evaluator of the forecast <forecast_name> of a match against its result.
+
+    Matches are evaluated one by one with eval or all at once with eval_batch.
+
+    Attributes:
+        forecast_name (str): Name of the evaluated forecast.
+        uses_true_forecast (bool): The evaluation also needs the true forecast of the matches.
+        uses_result (bool): The evaluation needs the result of the match. Matches not played are scored None.
+    """
+    uses_true_forecast = False
+    uses_result = True
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -13,19 +24,40 @@ class AccuracyEvaluator(Evaluator):
 
     def eval(self, match_attributes):
         probabilities: List[float] = match_attributes['forecasts'][self.forecast_name].probabilities
-        observed_result = match_attributes['winner']
+        observed_result = match_attributes.get('winner')
         if len(probabilities) != len(self.outcomes):
             return 0, "Probabilities do not fit in potential outcomes array"
+        if self.uses_result and observed_result is None:
+            return 1, None
         observed_probabilities = [1.0 if observed_result == outcome else 0.0 for outcome in self.outcomes]
         evaluation_score = self._compute(observed=observed_probabilities, model=probabilities)
         return 1, evaluation_score
 
+    def eval_batch(self, probabilities, observed, true_probabilities=None) -> np.ndarray:
+        """Evaluates a set of matches at once.
+
+        Args:
+            probabilities: (n_matches x n_outcomes) forecast probabilities.
+            observed: (n_matches x n_outcomes) one-hot observed results of played matches.
+            true_probabilities: (n_matches x n_outcomes) true forecast probabilities, if uses_true_forecast.
+
+        Returns:
+            np.ndarray: Evaluation score of each match.
+        """
+        return self._compute_batch(
+            observed=np.asarray(observed, dtype=float), model=np.asarray(probabilities, dtype=float)
+        )
+
     @abstractmethod
     def _compute(self, observed, model) -> float:
         """Numerical evaluation of a forecast given the probabilities set
         """
         pass
 
+    def _compute_batch(self, observed, model) -> np.ndarray:
+        """Evaluation of the rows of (n_matches x n_outcomes) arrays, row by row if not vectorized"""
+        return np.array([self._compute(observed=o, model=m) for o, m in zip(observed, model)], dtype=float)
+
 
 class RankProbabilityScore(AccuracyEvaluator):
 
@@ -38,8 +70,14 @@ class RankProbabilityScore(AccuracyEvaluator):
         score /= (r - 1)
         return score
 
+    def _compute_batch(self, observed, model) -> np.ndarray:
+        r = len(self.outcomes)
+        return (np.cumsum(model - observed, axis=1)[:, :r - 1] ** 2).sum(axis=1) / (r - 1)
+
 
 class ExpectedRankProbabilityScore(RankProbabilityScore):
+    uses_true_forecast = True
+    uses_result = False
 
     def eval(self, match_attributes):
         probabilities: List[float] = match_attributes['forecasts'][self.forecast_name].probabilities
@@ -53,8 +91,20 @@ class ExpectedRankProbabilityScore(RankProbabilityScore):
             evaluation_score += true_probabilities[i] * self._compute(observed=observed_model, model=probabilities)
         return 1, evaluation_score
 
+    def eval_batch(self, probabilities, observed, true_probabilities=None) -> np.ndarray:
+        model = np.asarray(probabilities, dtype=float)
+        true_model = np.asarray(true_probabilities, dtype=float)
+        evaluation_score = np.zeros(len(model))
+        for i in range(len(self.outcomes)):
+            observed_model = np.zeros_like(model)
+            observed_model[:, i] = 1.0
+            evaluation_score += true_model[:, i] * self._compute_batch(observed=observed_model, model=model)
+        return evaluation_score
+
 
 class ForecastError(RankProbabilityScore):
+    uses_true_forecast = True
+    uses_result = False
 
     def eval(self, match_attributes):
         probabilities: List[float] = match_attributes['forecasts'][self.forecast_name].probabilities
@@ -64,14 +114,24 @@ class ForecastError(RankProbabilityScore):
         evaluation_score = self._compute(observed=true_probabilities, model=probabilities)
         return 1, evaluation_score
 
+    def eval_batch(self, probabilities, observed, true_probabilities=None) -> np.ndarray:
+        return self._compute_batch(
+            observed=np.asarray(true_probabilities, dtype=float), model=np.asarray(probabilities, dtype=float)
+        )
+
 
 class ProbabilityDifference(AccuracyEvaluator):
+    uses_result = False
 
     def _compute(self, observed, model) -> float:
         return model[0] - model[-1]
 
+    def _compute_batch(self, observed, model) -> np.ndarray:
+        return model[:, 0] - model[:, -1]
+
 
 class ProbabilityPointer(AccuracyEvaluator):
+    uses_result = False
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -80,12 +140,19 @@ class ProbabilityPointer(AccuracyEvaluator):
     def _compute(self, observed, model) -> float:
         return model[self.probability_pointer]
 
+    def _compute_batch(self, observed, model) -> np.ndarray:
+        return model[:, self.probability_pointer]
+
 
 class FavouriteProbability(AccuracyEvaluator):
+    uses_result = False
 
     def _compute(self, observed, model) -> float:
         return max(model[0], model[-1])
 
+    def _compute_batch(self, observed, model) -> np.ndarray:
+        return np.maximum(model[:, 0], model[:, -1])
+
 
 class Likelihood(AccuracyEvaluator):
 
@@ -95,3 +162,7 @@ class Likelihood(AccuracyEvaluator):
             for m, o in zip(model, observed) if o > 0
         ])
         return score
+
+    def _compute_batch(self, observed, model) -> np.ndarray:
+        # Outcomes not observed add log(1) = 0
+        return np.log(np.where(observed > 0, model * observed, 1.0)).sum(axis=1)
@@ -1,8 +1,12 @@
 from abc import abstractmethod
 from typing import List
+import numpy as np
 
 from dfg_rating.model.evaluators.base_evaluators import Evaluator
 
+RETURN_TYPES = ['actual', 'multiplied', 'expected', 'expected_multiplied']
+MULTIPLICATIVE_RETURNS = ['multiplied', 'expected_multiplied']
+
 
 class ProfitabilityEvaluator(Evaluator):
 
@@ -19,6 +23,12 @@ class ProfitabilityEvaluator(Evaluator):
 
 
 class BettingReturnsEvaluator(ProfitabilityEvaluator):
+    """Returns of the bets of <player_name> at the odds of <bookmaker_name>.
+
+    For each outcome of a match the evaluation holds its [actual, multiplied, expected, expected multiplied] returns
+    (see RETURN_TYPES), the expected ones under the <true_model> forecast. Matches are evaluated one by one with eval
+    or all at once with eval_batch.
+    """
 
     def eval(self, match_attributes):
         # Should be using the true model forecast for evaluation
@@ -40,3 +50,98 @@ class BettingReturnsEvaluator(ProfitabilityEvaluator):
             multiplied_returns.append(1 + (bet * ((bet_result * bookmaker_odds[bet_index]) - 1)))
             expected_multiplied_returns.append(1 + (bet * ((true_model[bet_index] * bookmaker_odds[bet_index]) - 1)))
         return 1, [[a, m, e, em] for a, m, e, em in zip(actual_returns, multiplied_returns, expected_returns, expected_multiplied_returns)]
+
+    def eval_batch(self, bets, odds, true_probabilities, observed) -> np.ndarray:
+        """Returns of a set of matches at once.
+
+        Args:
+            bets: (n_matches x n_outcomes) bets.
+            odds: (n_matches x n_outcomes) bookmaker odds.
+            true_probabilities: (n_matches x n_outcomes) true model probabilities.
+            observed: (n_matches x n_outcomes) observed results, one-hot or all zeros if the match was not played.
+
+        Inputs may also be stacks of bettors or bookmakers broadcasting together.
+
+        Returns:
+            np.ndarray: (n_matches x n_outcomes x 4) returns, in the RETURN_TYPES order.
+        """
+        bets = np.asarray(bets, dtype=float)
+        odds = np.asarray(odds, dtype=float)
+        actual_returns = bets * ((np.asarray(observed, dtype=float) * odds) - 1)
+        expected_returns = bets * ((np.asarray(true_probabilities, dtype=float) * odds) - 1)
+        return np.stack([actual_returns, 1 + actual_returns, expected_returns, 1 + expected_returns], axis=-1)
+
+
+class BettingReturns:
+    """Returns of the bets of a bettor at the odds of a bookmaker, as arrays of matches ordered by season and day.
+
+    Attributes:
+        bettor_name (str): Bettor name.
+        bookmaker_name (str): Bookmaker name.
+        outcomes (list): Outcome labels.
+        season (np.ndarray): Season of each match.
+        round (np.ndarray): Round of each match.
+        day (np.ndarray): Day of each match.
+        home (np.ndarray): Home team of each match.
+        away (np.ndarray): Away team of each match.
+        key (np.ndarray): Edge key of each match.
+        winner (np.ndarray): Result label of each match, None if it has not been played.
+        bets (np.ndarray): (n_matches x n_outcomes) bets.
+        odds (np.ndarray): (n_matches x n_outcomes) bookmaker odds.
+        true_probabilities (np.ndarray): (n_matches x n_outcomes) true model probabilities.
+        returns (np.ndarray): (n_matches x n_outcomes x 4) returns, in the RETURN_TYPES order.
+    """
+
+    def __init__(self, bettor_name, bookmaker_name, outcomes, season, round, day, home, away, key, winner, bets, odds,
+                 true_probabilities, returns):
+        order = np.lexsort((np.asarray(day), np.asarray(season)))
+        self.bettor_name = bettor_name
+        self.bookmaker_name = bookmaker_name
+        self.outcomes = outcomes
+        self.season = np.asarray(season)[order]
+        self.round = np.asarray(round)[order]
+        self.day = np.asarray(day)[order]
+        self.home = np.asarray(home, dtype=object)[order]
+        self.away = np.asarray(away, dtype=object)[order]
+        self.key = np.asarray(key, dtype=object)[order]
+        self.winner = np.asarray(winner, dtype=object)[order]
+        self.bets = np.asarray(bets, dtype=float)[order]
+        self.odds = np.asarray(odds, dtype=float)[order]
+        self.true_probabilities = np.asarray(true_probabilities, dtype=float)[order]
+        self.returns = np.asarray(returns, dtype=float)[order]
+
+    def __len__(self):
+        return len(self.bets)
+
+    def get(self, return_type='actual') -> np.ndarray:
+        """(n_matches x n_outcomes) returns of a type of RETURN_TYPES"""
+        return self.returns[..., RETURN_TYPES.index(return_type)]
+
+    def placed(self, from_season=None) -> np.ndarray:
+        """(n_matches x n_outcomes) mask of the placed bets, in matches of <from_season> or later if given"""
+        placed = self.bets > 0
+        if from_season is not None:
+            placed &= (self.season >= from_season)[:, None]
+        return placed
+
+    def path(self, return_type='actual', from_season=None, by_match=False) -> np.ndarray:
+        """Accumulated returns after each placed bet, or after each match if <by_match>.
+
+        Additive returns are accumulated with a cumulative sum and multiplied returns with a cumulative product, so the
+        multiplied paths are the bankroll growth factors.
+        """
+        multiplicative = return_type in MULTIPLICATIVE_RETURNS
+        values = self.get(return_type)
+        placed = self.placed(from_season)
+        if by_match:
+            values = np.where(placed, values, 1.0 if multiplicative else 0.0)
+            if from_season is not None:
+                values = values[self.season >= from_season]
+            values = values.prod(axis=1) if multiplicative else values.sum(axis=1)
+        else:
+            values = values[placed]
+        return np.cumprod(values) if multiplicative else np.cumsum(values)
+
+    def staked(self, from_season=None) -> np.ndarray:
+        """Accumulated stakes after each placed bet"""
+        return np.cumsum(self.bets[self.placed(from_season)])
@@ -27,6 +27,12 @@ class BaseForecast(ABC):
     def get_forecast(self, match_data=None, home_team=None, away_team=None, base_ranking='true_rating', round_values=None):
         pass
 
+    def get_forecasts_batch(self, home_ratings, away_ratings):
+        """Computes the (n_matches x n_outcomes) probabilities of several matches out of the ratings of their teams.
+        Forecasts that can not be computed from the ratings alone return None.
+        """
+        return None
+
     def print(self):
         forecast_string = ""
         for i in range(len(self.outcomes)):
@@ -43,3 +49,29 @@ class SimpleForecast(BaseForecast):
 
     def get_forecast(self, match_data=None, home_team=None, away_team=None, base_ranking='true_forecast', round_values=None):
         return self.probabilities
+
+
+class ForecastRow(BaseForecast):
+    """Forecast of a single match. The forecast definition (type, outcomes, parameters) is shared by all the matches
+    and only the probabilities of the match are stored, usually as a row view of the array of all the matches.
+
+    Attributes:
+        definition: Forecast object the probabilities were computed with.
+        probabilities: Probabilities of the match.
+    """
+    computed = True
+
+    def __init__(self, definition: BaseForecast, probabilities):
+        self.definition = definition
+        self.probabilities = probabilities
+
+    @property
+    def type(self):
+        return self.definition.type
+
+    @property
+    def outcomes(self):
+        return self.definition.outcomes
+
+    def get_forecast(self, match_data=None, home_team=None, away_team=None, base_ranking='true_rating', round_values=None):
+        return self.probabilities
@@ -6,20 +6,33 @@ class ForecastError:
     def apply(self, initial_probabilities):
         pass
 
+    def apply_batch(self, probabilities):
+        """Applies the error to the (n_matches x n_outcomes) <probabilities> of several matches"""
+        return np.array([self.apply(row) for row in probabilities])
+
+    def set_random_number_generator(self, random_number_generator):
+        self.random_number_generator = random_number_generator
+
 
 class ForecastNullError(ForecastError):
 
     def apply(self, initial_probabilities):
         return initial_probabilities
 
+    def apply_batch(self, probabilities):
+        return probabilities
+
 
 class ForecastFactorError(ForecastError):
 
-    def __init__(self, error: float, scope: str = None, random_number_generator = np.random.default_rng()):
+    def __init__(self, error: float, scope: str = None, random_number_generator=None):
         self.type = 'factor'
         self.error = error
         self.scope = scope
-        self.random_number_generator = random_number_generator
+        self.own_generator = random_number_generator is not None
+        self.random_number_generator = (
+            random_number_generator if random_number_generator is not None else np.random.default_rng()
+        )
 
     def apply(self, initial_probabilities):
         error_factor = self.random_number_generator.uniform(-1.0, 1.0)
@@ -33,17 +46,34 @@ class ForecastFactorError(ForecastError):
         applied_probs = applied_probabilities / sum(applied_probabilities)
         return applied_probs
 
+    def apply_batch(self, probabilities):
+        error_factors = self.random_number_generator.uniform(-1.0, 1.0, size=len(probabilities))
+        if self.scope == "positive":
+            abs_errors = np.abs(error_factors) * self.error
+        elif self.scope == "negative":
+            abs_errors = -1 * np.abs(error_factors) * self.error
+        else:
+            abs_errors = error_factors * self.error
+        applied_probabilities = abs_errors[:, None] + probabilities
+        return applied_probabilities / applied_probabilities.sum(axis=1, keepdims=True)
+
 
 class ForecastSimulatedError(ForecastError):
 
-    def __init__(self, error: str, random_number_generator = np.random.default_rng(), **args):
+    def __init__(self, error: str, random_number_generator=None, **args):
+        self.own_generator = random_number_generator is not None
+        self.error = error
+        self.error_arguments = args
+        self.set_random_number_generator(
+            random_number_generator if random_number_generator is not None else np.random.default_rng()
+        )
+
+    def set_random_number_generator(self, random_number_generator):
         self.random_number_generator = random_number_generator
         try:
-            self.error_method = getattr(self.random_number_generator, error)
+            self.error_method = getattr(self.random_number_generator, self.error)
         except AttributeError:
             print("Error method not available")
-            return
-        self.error_arguments = args
 
     def apply(self, initial_probabilities):
         logit_probs = np.log(initial_probabilities / (1 - initial_probabilities))
@@ -51,3 +81,11 @@ class ForecastSimulatedError(ForecastError):
         error = self.error_method(**self.error_arguments)
         final_probs = 1 / (1 + (np.exp((-1 * (logit_probs + error)))))
         return final_probs / sum(final_probs)
+
+    def apply_batch(self, probabilities):
+        probabilities = np.asarray(probabilities, dtype=float)
+        logit_probs = np.log(probabilities / (1 - probabilities))
+        error_arguments = {k: v for k, v in self.error_arguments.items() if k != 'size'}
+        error = self.error_method(size=logit_probs.shape, **error_arguments)
+        final_probs = 1 / (1 + (np.exp((-1 * (logit_probs + error)))))
+        return final_probs / final_probs.sum(axis=1, keepdims=True)
@@ -44,6 +44,18 @@ class LogFunctionForecast(BaseForecast):
         self.computed = True
         return self.probabilities
 
+    def get_forecasts_batch(self, home_ratings, away_ratings):
+        diff = self.home_error.apply_batch(home_ratings) - self.away_error.apply_batch(away_ratings)
+        n = len(self.outcomes)
+        # Cumulative link values for outcome numbers 0..n, one column each
+        link = np.empty([len(diff), n + 1])
+        link[:, 0] = 0
+        link[:, n] = 1
+        for outcome_number in range(1, n):
+            z = -(self.coefficients[outcome_number - 1]) + (self.beta * diff)
+            link[:, outcome_number] = 1 / (1 + np.exp(z))
+        return link[:, n:0:-1] - link[:, n - 1::-1]
+
     def logit_link_function(self, outcome_number, covar):
         if outcome_number == 0:
             return 0
@@ -97,5 +109,14 @@ class BradleyTerryForecast(BaseForecast):
         self.computed = True
         return self.probabilities
 
+    def get_forecasts_batch(self, home_ratings, away_ratings):
+        home_rating_transformed = (np.asarray(home_ratings, dtype=float) + self.ha) ** self.exponent
+        away_rating_transformed = np.asarray(away_ratings, dtype=float) ** self.exponent
+        home_strength = home_rating_transformed / (home_rating_transformed + away_rating_transformed)
+        away_strength = away_rating_transformed / (home_rating_transformed + away_rating_transformed)
+        draw_strength = np.sqrt(home_strength * away_strength)
+        strengths = np.stack([home_strength, draw_strength, away_strength], axis=1)
+        return strengths / strengths.sum(axis=1, keepdims=True)
+
 
 
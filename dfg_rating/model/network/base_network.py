@@ -1,5 +1,5 @@
 import json
-from copy import deepcopy
+import time
 from datetime import date
 import numpy as np
 import networkx as nx
@@ -14,12 +14,17 @@ from numpy import int64
 from dfg_rating.model.betting.betting import BaseBetting
 from dfg_rating.model.bookmaker.base_bookmaker import BaseBookmaker
 from dfg_rating.model.evaluators.base_evaluators import Evaluator
-from dfg_rating.model.forecast.base_forecast import BaseForecast, SimpleForecast
+from dfg_rating.model.evaluators.profitability import ProfitabilityEvaluator, BettingReturnsEvaluator, BettingReturns
+from dfg_rating.model.forecast.base_forecast import BaseForecast, SimpleForecast, ForecastRow
+from dfg_rating.model.network.match_table import MatchTable, MatchArrays, STATE_CODES
+from dfg_rating.model.network.rating_store import RatingStore, TeamRatings
 
 from tqdm import tqdm
 
 TeamId = NewType('TeamId', int)
 
+RANDOM_COMPONENTS = ['schedule', 'true_rating', 'play', 'bookmaker_error', 'bettor_error', 'rating', 'forecast_error']
+
 
 def get_seasons(games):
     seasons = set([data['season'] for a, h, k, data in games])
@@ -35,25 +40,131 @@ def weighted_winner(forecast: BaseForecast, match_data, home_team, away_team, ro
             return forecast.outcomes[i]
 
 
+def weighted_winners(probabilities, random_number_generator):
+    """Vectorized version of weighted_winner over a (n_matches x n_outcomes) probabilities matrix.
+
+    Uniform values are drawn in a single call, consuming the generator exactly as one weighted_winner call per row
+    would do.
+
+    Returns:
+        np.ndarray: Index of the winning outcome of each match, -1 if no outcome is selected.
+    """
+    weights = np.abs(probabilities).cumsum(axis=1)
+    x = random_number_generator.uniform(0, 1, size=len(weights))
+    winners = (x[:, None] >= weights).sum(axis=1)
+    winners[winners == weights.shape[1]] = -1
+    return winners
+
+
 def base_edge_filter(edge):
     return True
 
 
+def group_by_match(rows):
+    """Groups the rows of a child table (forecasts, odds, bets, metrics) by match_id in a single pass.
+    Rows already grouped as a {match_id: [rows]} dictionary are returned as they are.
+    """
+    if isinstance(rows, dict):
+        return rows
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row['match_id'], []).append(row)
+    return grouped
+
+
+def report_rows(table_name, n_rows, start_time):
+    elapsed = time.time() - start_time
+    rows_per_second = n_rows / elapsed if elapsed > 0 else float('inf')
+    print(f"Loaded {n_rows} {table_name} in {elapsed:.2f} seconds ({rows_per_second:.0f} rows/s).")
+
+
+class SeasonFilter:
+    """Edge filter selecting the matches of a single season.
+    Columnar networks apply it as a mask over the season column instead of calling it per edge.
+    """
+
+    def __init__(self, season):
+        self.season = season
+
+    def __call__(self, edge):
+        return edge[3]['season'] == self.season
+
+
+def _last_ratings(ratings):
+    """Last value of each row of a NaN padded (... x n_rounds) ratings array, NaN for rows without values"""
+    valid = ~np.isnan(ratings)
+    last = ratings.shape[-1] - 1 - np.argmax(valid[..., ::-1], axis=-1)
+    return np.where(valid.any(axis=-1), np.take_along_axis(ratings, last[..., None], axis=-1)[..., 0], np.nan)
+
+
+class MatchFilter:
+    """Edge filter selecting a given list of (away, home, key) matches.
+    Networks look the matches up directly instead of calling it per edge: by their key, which is their row, in
+    columnar networks and by their edge in graph networks.
+    """
+
+    def __init__(self, matches):
+        self.matches = [(away, home, key) for away, home, key in matches]
+        self.match_set = set(self.matches)
+
+    def __call__(self, edge):
+        return (edge[0], edge[1], edge[2]) in self.match_set
+
+
 class BaseNetwork(ABC):
     """Abstract class defining the interface of Network object.
     A network is a set of nodes and edges defining the relationship between teams in a tournament.
     Teams can be modelled as individuals (Tennis) or collective teams (soccer).
     An edge between two teams identifies a competition between them
 
+    Matches are stored either in a networkx MultiDiGraph (backend='graph', default) or in a columnar MatchTable
+    (backend='columnar'). In the columnar backend the graph in <data> is only built when it is accessed, and it is
+    read-only: its matches are updated through the network methods or its MatchTable.
+    Team ratings are kept in a RatingStore, in a memory mapped file when <ratings_path> is given, and exposed as a
+    read-only 'ratings' view on each node.
+
+    Random draws come from a tree of generators rooted at <seed> (an int or a np.random.SeedSequence, fresh entropy
+    if None): each of the RANDOM_COMPONENTS (schedule, true rating, play, bookmaker error, bettor error, other ratings
+    and forecast errors) draws from its own child of the seed sequence, so a network is reproducible from its seed and
+    the draws of one component do not shift the others. A <random_number_generator> given instead is shared by all the
+    components. Ratings, forecasts, bookmakers and bettors created without their own generator, and the random parts
+    they hold, are bound to these generators when they are added to the network.
+
+    Matches a generator leaves inactive (random, clustered, random rounds and configuration model networks) are kept
+    apart in the <inactive_matches> table, out of the graph or match table every rating, forecast and evaluation pass
+    goes through, unless <keep_inactive> is True. They are listed with inactive_edges() or
+    iterate_over_games(include_inactive=True).
+
+    The ratings, forecasts, odds, bets and evaluations added to a network are kept in <derivations>, in the order they
+    were added, so append_matches computes them for new matches without going through the whole network again.
+
     Attributes:
         network_type (str): Text descriptor of the network type.
         kwargs (dict): Dictionary of key-value parameters for the network configuration
+        rating_store (RatingStore): Ratings of the teams of the network.
+        seed_sequence (np.random.SeedSequence): Root of the random generators of the network.
+        inactive_matches (MatchTable): Scheduled matches left inactive, apart from the network matches.
+        derivations (dict): Arguments of the ratings, forecasts, odds, bets and evaluations added, by (kind, name).
 
     """
 
-    def __init__(self, network_type: str, random_number_generator = np.random.default_rng(), **kwargs):
-        self.random_number_generator = random_number_generator
+    def __init__(self, network_type: str, random_number_generator=None, **kwargs):
+        seed = kwargs.get('seed', None)
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self._generators = {}
+        if random_number_generator is not None:
+            self._generators = dict.fromkeys(RANDOM_COMPONENTS, random_number_generator)
+        self.random_number_generator = self.generator('play')
+        self.backend = kwargs.get('backend', 'graph')
+        self.matches: MatchTable = MatchTable() if self.backend == 'columnar' else None
+        self._nodes = {}
+        self._graph = None
+        self._graph_version = -1
         self.data = None
+        self.rating_store = RatingStore(kwargs.get('ratings_path', None))
+        self.inactive_matches = MatchTable()
+        self.keep_inactive = kwargs.get('keep_inactive', False)
+        self.derivations = {}
         self.type = network_type
         self.params = kwargs
         self.number_of_clusters = kwargs.get('clusters', 1)
@@ -69,17 +180,195 @@ class BaseNetwork(ABC):
         self.true_rating = kwargs.get(
             'true_rating',
             ControlledTrendRating(
-                starting_point=ControlledRandomFunction(random_number_generator = self.random_number_generator, distribution='normal', loc=1000, scale=150),
-                delta=ControlledRandomFunction(random_number_generator = self.random_number_generator, distribution='normal', loc=0, scale=.5),
-                trend=ControlledRandomFunction(random_number_generator = self.random_number_generator, distribution='normal', loc=0, scale=.2),
-                season_delta=ControlledRandomFunction(random_number_generator = self.random_number_generator, distribution='normal', loc=0, scale=30),
-                random_number_generator = self.random_number_generator
+                starting_point=ControlledRandomFunction(distribution='normal', loc=1000, scale=150),
+                delta=ControlledRandomFunction(distribution='normal', loc=0, scale=.5),
+                trend=ControlledRandomFunction(distribution='normal', loc=0, scale=.2),
+                season_delta=ControlledRandomFunction(distribution='normal', loc=0, scale=30)
             )
         )
+        self._seed_component(self.true_rating, 'true_rating')
         self.true_forecast = kwargs.get(
             'true_forecast',
             LogFunctionForecast(outcomes=['home', 'draw', 'away'], coefficients=[-0.9, 0.3], beta_parameter=0.006)
         )
+        self._seed_component(self.true_forecast, 'forecast_error')
+
+    def generator(self, component: str) -> np.random.Generator:
+        """Random number generator of one of the RANDOM_COMPONENTS of the network.
+
+        The generator of the i-th component is seeded with the i-th child of <seed_sequence>, the same child
+        seed_sequence.spawn() would give, and is kept for the following calls.
+        """
+        if component not in self._generators:
+            child = np.random.SeedSequence(
+                self.seed_sequence.entropy,
+                spawn_key=tuple(self.seed_sequence.spawn_key) + (RANDOM_COMPONENTS.index(component),),
+                pool_size=self.seed_sequence.pool_size
+            )
+            self._generators[component] = np.random.default_rng(child)
+        return self._generators[component]
+
+    def _seed_component(self, component, component_name):
+        """Makes a random component created without its own generator, and the random components it holds (e.g. the
+        rating errors of a forecast or the error of a bookmaker), draw from the <component_name> generator"""
+        if getattr(component, 'own_generator', True) is False:
+            component.set_random_number_generator(self.generator(component_name))
+        for attribute in getattr(component, '__dict__', {}).values():
+            if hasattr(attribute, 'set_random_number_generator'):
+                self._seed_component(attribute, component_name)
+
+    @property
+    def data(self) -> nx.MultiDiGraph:
+        if self.matches is not None and self._graph_version != self.matches.version:
+            self._graph = self.matches.to_graph(self._nodes, read_only=True)
+            self._graph_version = self.matches.version
+        return self._graph
+
+    @data.setter
+    def data(self, graph: nx.MultiDiGraph):
+        if self.matches is None:
+            self._graph = graph
+        elif graph is None:
+            self.matches = MatchTable()
+            self._nodes = {}
+            self._graph_version = -1
+        else:
+            self._nodes = {node: attributes for node, attributes in graph.nodes(data=True)}
+            self.matches = MatchTable.from_graph(graph, keep_keys=False)
+            self._graph_version = -1
+
+    @property
+    def node_attributes(self):
+        """Mapping of node labels to node attributes that does not require building the graph"""
+        return self._nodes if self.matches is not None else self.data.nodes
+
+    def _table_rows(self, season=None):
+        """Rows of the matches of <season> (all if None) of the match table, in the order of the edges of <data>"""
+        rows = self.matches.edge_order(self._nodes)
+        return rows if season is None else rows[self.matches.season[rows] == season]
+
+    def _edges(self):
+        if self.matches is not None:
+            return self.matches.edges(self._table_rows())
+        return self.data.edges(keys=True, data=True)
+
+    def get_match_arrays(self, edge_filter=None, extra=()) -> MatchArrays:
+        """Collects the schedule and results of the matches passing <edge_filter> as aligned arrays.
+
+        Args:
+            edge_filter: Edge filter function. All matches if None.
+            extra: Names of other edge attributes to collect.
+        """
+        teams = list(self.node_attributes)
+        team_position = {team: i for i, team in enumerate(teams)}
+        n_rounds, round_values = self.get_rounds()
+        table_filters = (SeasonFilter, MatchFilter)
+        if (self.matches is not None) and ((edge_filter is None) or isinstance(edge_filter, table_filters)):
+            table = self.matches
+            if isinstance(edge_filter, MatchFilter):
+                rows = np.array([key for _, _, key in edge_filter.matches], dtype=np.int64)
+            else:
+                rows = self._table_rows(None if edge_filter is None else edge_filter.season)
+            positions = np.array([team_position[t] for t in table.teams], dtype=np.int64)
+            away = positions[table.away[rows]]
+            home = positions[table.home[rows]]
+            rounds = table.round[rows]
+            days = table.day[rows]
+            active = table.state[rows] == STATE_CODES['active']
+            winner = np.array(table.results + [None], dtype=object)[table.winner[rows]]
+            extra_values = {
+                name: table.extra.get(name, np.full(len(table), None, dtype=object))[rows] for name in extra
+            }
+            seasons = table.season[rows]
+            keys = rows
+        else:
+            if isinstance(edge_filter, MatchFilter):
+                games = [(a, h, k, self.data.edges[a, h, k]) for a, h, k in edge_filter.matches]
+            else:
+                games = list(filter(edge_filter or base_edge_filter, self._edges()))
+            away = [team_position[a] for a, h, k, d in games]
+            home = [team_position[h] for a, h, k, d in games]
+            rounds = np.array([d.get('round', -1) for a, h, k, d in games])
+            days = [d.get('day', -1) for a, h, k, d in games]
+            active = [d.get('state', 'active') == 'active' for a, h, k, d in games]
+            winner = [d.get('winner', None) for a, h, k, d in games]
+            extra_values = {name: np.array([d.get(name) for a, h, k, d in games], dtype=object) for name in extra}
+            seasons = np.array([d.get('season', 0) for a, h, k, d in games])
+            keys = np.array([k for a, h, k, d in games])
+        round_position = {round_value: i for i, round_value in enumerate(round_values)}
+        unique_rounds, round_inverse = np.unique(rounds, return_inverse=True)
+        round_positions = np.array([round_position.get(r, -1) for r in unique_rounds], dtype=np.int64)[
+            round_inverse.reshape(-1)
+        ] if len(rounds) > 0 else np.empty(0, dtype=np.int64)
+        return MatchArrays(teams, away, home, round_positions, days, active, winner, extra_values, seasons, keys)
+
+    def get_match_ratings(self, rating_name, schedule: MatchArrays):
+        """Ratings <rating_name> of the home and away teams of each match in <schedule> at the round of the match.
+        NaN for matches out of the rounds of the network or teams without the rating.
+        """
+        home_ratings = np.full(len(schedule), np.nan)
+        away_ratings = np.full(len(schedule), np.nan)
+        n_rounds, round_values = self.get_rounds()
+        for season in np.unique(schedule.season):
+            season_ratings = self.rating_store.matrix(rating_name, season, schedule.teams, len(round_values) + 1)
+            season_ratings[:, -1] = np.nan
+            in_season = schedule.season == season
+            # Rounds out of range point at the last column, always NaN
+            rounds = schedule.round[in_season]
+            home_ratings[in_season] = season_ratings[schedule.home[in_season], rounds]
+            away_ratings[in_season] = season_ratings[schedule.away[in_season], rounds]
+        return home_ratings, away_ratings
+
+    def _append_matches(self, graph, away, home, season, rounds, days, active=None):
+        """Adds a season of scheduled matches, given as aligned arrays, to the network storage.
+
+        Args:
+            graph: Graph to add the matches to. Not used in columnar networks.
+            away: Away team labels.
+            home: Home team labels.
+            season: Season of the matches.
+            rounds: Round of each match.
+            days: Day of each match.
+            active: Active mask of the matches. No state is set if None. Inactive matches go to <inactive_matches>
+                unless <keep_inactive> is True.
+        """
+        if self.matches is not None:
+            self.matches.team_codes(list(self._nodes))
+            for team in dict.fromkeys(np.asarray(away).tolist() + np.asarray(home).tolist()):
+                self._nodes.setdefault(team, {})
+        if (active is not None) and not self.keep_inactive:
+            active = np.asarray(active, dtype=bool)
+            self.inactive_matches.append(
+                away=np.asarray(away)[~active].tolist(),
+                home=np.asarray(home)[~active].tolist(),
+                season=season,
+                round=np.asarray(rounds, dtype=np.int64)[~active],
+                day=np.asarray(days, dtype=np.int64)[~active],
+                state=np.full(int((~active).sum()), STATE_CODES['inactive'], dtype=np.int8)
+            )
+            away, home = np.asarray(away)[active], np.asarray(home)[active]
+            rounds, days = np.asarray(rounds)[active], np.asarray(days)[active]
+            active = active[active]
+        away, home = np.asarray(away).tolist(), np.asarray(home).tolist()
+        if self.matches is not None:
+            self.matches.append(
+                away=away,
+                home=home,
+                season=season,
+                round=np.asarray(rounds, dtype=np.int64),
+                day=np.asarray(days, dtype=np.int64),
+                state=None if active is None else np.where(
+                    active, STATE_CODES['active'], STATE_CODES['inactive']
+                ).astype(np.int8)
+            )
+        else:
+            attributes = [
+                dict(season=season, round=r, day=d) for r, d in zip(np.asarray(rounds).tolist(), np.asarray(days).tolist())
+            ]
+            if active is not None:
+                for match_attributes, match_active in zip(attributes, np.asarray(active).tolist()):
+                    match_attributes['state'] = 'active' if match_active else 'inactive'
+            graph.add_edges_from(zip(away, home, attributes))
 
     @abstractmethod
     def create_data(self):
@@ -132,56 +421,372 @@ class BaseNetwork(ABC):
     def get_rounds(self):
         return self.n_rounds * 2, [r for r in range(self.n_rounds * 2)]
 
-    def iterate_over_games(self):
-        return sorted(self.data.edges(keys=True, data=True), key=lambda t: (int(t[3].get('day', 0))))
+    def iterate_over_games(self, include_inactive=False):
+        if self.matches is not None:
+            rows = self._table_rows()
+            games = self.matches.edges(rows[np.argsort(self.matches.day[rows], kind='stable')])
+        else:
+            games = sorted(self.data.edges(keys=True, data=True), key=lambda t: (int(t[3].get('day', 0))))
+        if include_inactive and len(self.inactive_matches) > 0:
+            games = sorted(games + self.inactive_edges(), key=lambda t: (int(t[3].get('day', 0))))
+        return games
+
+    def inactive_edges(self):
+        """(away, home, key, attributes) matches kept apart as inactive. Keys are rows of <inactive_matches>."""
+        return self.inactive_matches.edges()
 
-    def play_sub_network(self, games):
+    def play_sub_network(self, games, batch=True):
+        """Simulates the result of the given games out of their true forecast.
+
+        Args:
+            games: List of (away, home, key, attributes) matches in playing order.
+            batch: Draws all the results at once. Results are the same as in the match by match simulation.
+        """
+        if batch:
+            return self._play_batch(list(games))
         r, rv = self.get_rounds()
         for away_team, home_team, edge_key, edge_attributes in games:
             # Random winner with weighted choices
-            if 'true_rating' not in self.data.nodes[away_team].get('ratings', {}):
+            if 'true_rating' not in self.node_attributes[away_team].get('ratings', {}):
                 print('Error: Network needs true rating')
-                pass
+                continue
             if 'true_forecast' not in edge_attributes.get('forecasts', {}):
                 print('Error: Network needs true forecast')
-                pass
+                continue
             winner = weighted_winner(
                 edge_attributes['forecasts']['true_forecast'],
                 edge_attributes,
-                self.data.nodes[home_team],
-                self.data.nodes[away_team],
-                rv,                
+                self.node_attributes[home_team],
+                self.node_attributes[away_team],
+                rv,
                 self.random_number_generator,
             )
-            self.data.edges[away_team, home_team, edge_key]['winner'] = winner
+            if self.matches is not None:
+                self.matches.set_winner([edge_key], [winner])
+            else:
+                self.data.edges[away_team, home_team, edge_key]['winner'] = winner
+
+    def _play_batch(self, games):
+        """Draws the results of the games with a true forecast at once. Games without it are reported and left
+        unplayed."""
+        if len(games) == 0:
+            return
+        if self.matches is not None:
+            rows = np.array([edge_key for _, _, edge_key, _ in games])
+            if 'true_forecast' in self.matches.forecasts:
+                probabilities = self.matches.forecasts.get('true_forecast')[rows]
+                forecasted = ~np.isnan(probabilities).all(axis=1)
+                outcomes = self.matches.forecasts.outcomes['true_forecast']
+            else:
+                forecasted = np.zeros(len(games), dtype=bool)
+        else:
+            forecasts = [d.get('forecasts', {}).get('true_forecast') for _, _, _, d in games]
+            forecasted = np.array([f is not None for f in forecasts], dtype=bool)
+            if forecasted.any():
+                probabilities = np.array([f.probabilities for f in forecasts if f is not None])
+                outcomes = next(f for f in forecasts if f is not None).outcomes
+        if not forecasted.all():
+            unplayed = [(away, home, key) for (away, home, key, _), f in zip(games, forecasted) if not f]
+            print(f"Error: Network needs true forecast. {len(unplayed)} matches left unplayed: "
+                  f"{unplayed[:10]}{' ...' if len(unplayed) > 10 else ''}")
+            if not forecasted.any():
+                return
+        if self.matches is not None:
+            winners = weighted_winners(probabilities[forecasted], self.random_number_generator)
+            self.matches.set_outcomes(rows[forecasted], winners, outcomes)
+        else:
+            winners = weighted_winners(probabilities, self.random_number_generator)
+            played = [game for game, f in zip(games, forecasted) if f]
+            for (away_team, home_team, edge_key, _), winner in zip(played, winners):
+                self.data.edges[away_team, home_team, edge_key]['winner'] = outcomes[winner] if winner >= 0 else None
 
-    def play(self):
-        self.play_sub_network(self.iterate_over_games())
+    def play(self, batch=True):
+        self.play_sub_network(self.iterate_over_games(), batch=batch)
 
     def _add_rating_to_team(self, team_id, rating_values, rating_hyperparameters, rating_name, season=-1):
+        self._add_ratings([team_id], np.reshape(rating_values, (1, -1)), rating_hyperparameters, rating_name, season)
+
+    def _add_ratings(self, teams, rating_values, rating_hyperparameters, rating_name, season=-1):
+        """Stores the ratings of a season of several teams, one row of <rating_values> per team"""
         if season is None:
             season = 0
-        self.data.nodes[team_id].setdefault('ratings', {}).setdefault(rating_name, {})[season] = rating_values
-
-        self.data.nodes[team_id].setdefault(
-            'ratings', {}
-        ).setdefault(
-            'hyper_parameters', {}
-        ).setdefault(
-            rating_name, {}
-        )[season] = rating_hyperparameters[team_id] if team_id in rating_hyperparameters else rating_hyperparameters
+        self.rating_store.set(rating_name, season, teams, rating_values)
+        for team_id in teams:
+            self.rating_store.set_hyper_parameters(
+                rating_name, season, team_id,
+                rating_hyperparameters[team_id] if team_id in rating_hyperparameters else rating_hyperparameters
+            )
+        self._attach_ratings(teams)
+
+    def _attach_ratings(self, teams):
+        """Exposes the stored ratings of each team under the 'ratings' attribute of its node"""
+        for team_id in teams:
+            node = self.node_attributes[team_id]
+            if not isinstance(node.get('ratings'), TeamRatings):
+                node['ratings'] = self.rating_store.team_view(team_id)
+
+    def _rating_layers(self, rating, ratings, rating_name):
+        """Pairs the ratings computed by a rating with the names they are stored under. A parameter sweep returns
+        one layer per parameter combination, named after rating.sweep_names.
+        """
+        if np.ndim(ratings) == 3:
+            return list(zip(rating.sweep_names(rating_name), ratings))
+        return [(rating_name, ratings)]
+
+    def _store_season_ratings(self, rating, ratings, rating_hyperparameters, rating_name, season):
+        """Stores the ratings of a season computed by <rating> for all the nodes, one layer per sweep combination"""
+        for layer_name, layer in self._rating_layers(rating, ratings, rating_name):
+            self._add_ratings(list(self.node_attributes), layer, rating_hyperparameters, layer_name, season=season)
+
+    def _record(self, kind, name, *arguments, season=None):
+        """Keeps the arguments of a rating, forecast, odds, bets or evaluation added to the network. Adding it again
+        under the same name moves it to the end. Ratings and forecasts keep the list of seasons they were added to,
+        None for all of them, so adding them season by season keeps a single entry.
+        """
+        previous = self.derivations.pop((kind, name), None)
+        if kind in ['rating', 'forecast']:
+            seasons = None if season is None else [season]
+            if (seasons is not None) and (previous is not None) and (previous[:-1] == arguments) and previous[-1]:
+                seasons = previous[-1] + [s for s in seasons if s not in previous[-1]]
+            arguments = arguments + (seasons,)
+        self.derivations[(kind, name)] = arguments
+
+    def _rating_layout(self):
+        return list(self.node_attributes), list(self.get_rounds()[1])
+
+    def append_matches(self, matches):
+        """Adds new matches to the network and computes for them the ratings, forecasts, odds, bets and metrics added
+        to the network so far, in the order they were added.
+
+        Ratings are updated from the first round of the new matches on (see BaseRating.update) and fully recomputed
+        when the new matches bring new teams, or rounds placed before the known ones. Stored matches whose ratings
+        change get their forecasts, odds, bets and metrics computed again, so the network ends as a full
+        recomputation would leave it. Bookmaker and bettor errors keep drawing from their generators.
+
+        Args:
+            matches: List of (away, home, attributes) matches.
+
+        Returns:
+            list: (away, home, key) of the new matches.
+        """
+        layout = self._rating_layout()
+        new_matches = self._store_matches(matches)
+        self._update_derivations(new_matches, layout)
+        return new_matches
+
+    def _store_matches(self, matches):
+        """Adds (away, home, attributes) matches to the network storage and returns their (away, home, key)"""
+        matches = list(matches)
+        if self.matches is not None:
+            graph = nx.MultiDiGraph()
+            graph.add_edges_from(matches)
+            new_matches = self._store_graph(graph)
+        else:
+            keys = self.data.add_edges_from(matches)
+            new_matches = [(away, home, key) for (away, home, _), key in zip(matches, keys)]
+        self.n_teams = len(self.node_attributes)
+        self._add_seasons([attributes.get('season', 0) for _, _, attributes in matches])
+        return new_matches
+
+    def _store_graph(self, graph):
+        """Appends the nodes and matches of a graph to the match table of a columnar network"""
+        for node, attributes in graph.nodes(data=True):
+            self._nodes.setdefault(node, {}).update(attributes)
+        rows = self.matches.extend(MatchTable.from_graph(graph, keep_keys=False))
+        return [(self.matches.teams[self.matches.away[row]], self.matches.teams[self.matches.home[row]], int(row))
+                for row in rows]
+
+    def _add_seasons(self, seasons):
+        if len(seasons) > 0:
+            self.seasons = max(self.seasons, max(seasons) + 1)
+
+    def _update_derivations(self, new_matches, layout):
+        """Computes the derivations of the network for <new_matches> and for the stored matches whose ratings change.
+
+        Args:
+            new_matches: (away, home, key) of the new matches.
+            layout: Teams and round values of the network before the new matches.
+        """
+        teams, rounds = self._rating_layout()
+        # Rating arrays are indexed by team and round positions: new rounds after the known ones only widen them
+        full = (teams != layout[0]) or (rounds[:len(layout[1])] != layout[1])
+        widened = len(rounds) > len(layout[1])
+        selection = MatchFilter(new_matches)
+        for (kind, name), arguments in list(self.derivations.items()):
+            if kind == 'rating':
+                changed = self._update_rating(name, *arguments, new_matches=new_matches, full=full, widened=widened)
+                selection = MatchFilter(selection.matches + [m for m in changed if m not in selection.match_set])
+                continue
+            if len(selection.matches) == 0:
+                continue
+            if kind == 'forecast':
+                forecast, base_ranking, seasons = arguments
+                matches = selection.matches
+                if seasons is not None:
+                    schedule = self.get_match_arrays(selection)
+                    matches = [m for m, s in zip(selection.matches, schedule.season) if s in seasons]
+                if not self._add_forecast_batch(forecast, name, base_ranking, edge_filter=MatchFilter(matches)):
+                    for match in matches:
+                        self._add_forecast_to_team(match, forecast, name, base_ranking)
+            elif kind == 'odds':
+                bookmaker, base_forecast = arguments
+                self._add_odds_batch(name, bookmaker, base_forecast, matches=selection.matches)
+            elif kind == 'bets':
+                bookmaker, betting, base_forecast = arguments
+                self._add_bets_batch(name, bookmaker, betting, base_forecast, matches=selection.matches)
+            elif kind == 'evaluation':
+                self.add_evaluation(arguments[0], matches=selection.matches)
+
+    def _season_rating_matrices(self, rating, rating_name, season, teams, width):
+        layers = rating.sweep_names(rating_name) if hasattr(rating, 'sweep_names') else [rating_name]
+        return np.array([self.rating_store.matrix(layer, season, teams, width) for layer in layers])
+
+    def _update_rating(self, rating_name, rating, rating_seasons, new_matches, full, widened=False):
+        """Updates a rating with the new matches, season by season: seasons with new matches, or every season if
+        the rounds were <widened>, are updated with rating.update and the seasons after a changed one are recomputed,
+        as their starting ratings may change. Every season is recomputed if <full>.
+
+        Returns:
+            list: (away, home, key) of the stored matches whose ratings at their round changed.
+        """
+        new_schedule = self.get_match_arrays(MatchFilter(new_matches))
+        changed_matches = []
+        previous_changed = full
+        for season in self.get_seasons():
+            if (rating_seasons is not None) and (season not in rating_seasons):
+                continue
+            in_season = new_schedule.season == season
+            if not (full or previous_changed or widened or in_season.any()):
+                continue
+            season_schedule = self.get_match_arrays(SeasonFilter(season))
+            teams = season_schedule.teams
+            width = self.rating_store.values.shape[3]
+            before = self._season_rating_matrices(rating, rating_name, season, teams, width)
+            if full or previous_changed:
+                ratings, rating_hp = rating.get_all_ratings(self, edge_filter=SeasonFilter(season), season=season)
+            else:
+                ratings, rating_hp = rating.update(self, new_schedule.select(in_season), season, rating_name)
+            self._store_season_ratings(rating, ratings, rating_hp, rating_name, season)
+            after = self._season_rating_matrices(rating, rating_name, season, teams, self.rating_store.values.shape[3])
+            before = np.pad(before, [(0, 0), (0, 0), (0, after.shape[2] - width)], constant_values=np.nan)
+            changed_values = ~((before == after) | (np.isnan(before) & np.isnan(after)))
+            changed = changed_values.any(axis=0)
+            # The next season starts from the last ratings: values only added by widened rounds do not change it
+            last_before, last_after = _last_ratings(before), _last_ratings(after)
+            previous_changed = bool((changed_values & ~np.isnan(before)).any()) or not np.array_equal(
+                last_before, last_after, equal_nan=True
+            )
+            # Forecasts read the ratings at the round of the match. Matches out of the rounds depend on all of them
+            rounds = season_schedule.round
+            in_rounds = (rounds >= 0) & (rounds < changed.shape[1])
+            team_changed = changed.any(axis=1)
+            match_changed = np.where(
+                in_rounds,
+                changed[season_schedule.home, np.where(in_rounds, rounds, 0)]
+                | changed[season_schedule.away, np.where(in_rounds, rounds, 0)],
+                team_changed[season_schedule.home] | team_changed[season_schedule.away]
+            )
+            changed_matches += [
+                (teams[season_schedule.away[i]], teams[season_schedule.home[i]], season_schedule.key[i].item())
+                for i in np.flatnonzero(match_changed)
+            ]
+        return changed_matches
 
     def _add_forecast_to_team(self, match, forecast: BaseForecast, forecast_name, base_ranking):
-        match_data = self.data.edges[match]
+        if self.matches is not None:
+            match_data = self.matches.schedule_attributes(match[2])
+        else:
+            match_data = self.data.edges[match]
         n_rounds, round_values = self.get_rounds()
-        forecast.get_forecast(
+        probabilities = forecast.get_forecast(
             match_data=match_data,
-            home_team=self.data.nodes[match[1]],
-            away_team=self.data.nodes[match[0]],
+            home_team=self.node_attributes[match[1]],
+            away_team=self.node_attributes[match[0]],
             base_ranking=base_ranking,
             round_values=round_values
         )
-        self.data.edges[match].setdefault('forecasts', {})[forecast_name] = forecast
+        if self.matches is not None:
+            self.matches.forecasts.set(forecast_name, probabilities, rows=[match[2]], outcomes=forecast.outcomes)
+            self.matches.touch()
+        else:
+            self.data.edges[match].setdefault('forecasts', {})[forecast_name] = ForecastRow(
+                forecast, np.array(probabilities, dtype=float)
+            )
+
+    def _add_forecast_batch(self, forecast: BaseForecast, forecast_name, base_ranking, season=None, edge_filter=None):
+        """Computes the forecast of every match of <season> (all if None), or of the matches passing <edge_filter>,
+        from one array of home and away ratings. Returns False for forecasts without batch support.
+
+        Matches without a <base_ranking> rating of both teams at their round (e.g. out of the rounds of the network)
+        get no forecast and are reported.
+        """
+        edge_filter = edge_filter or (None if season is None else SeasonFilter(season))
+        schedule = self.get_match_arrays(edge_filter)
+        home_ratings, away_ratings = self.get_match_ratings(base_ranking, schedule)
+        rated = ~(np.isnan(home_ratings) | np.isnan(away_ratings))
+        probabilities = forecast.get_forecasts_batch(home_ratings[rated], away_ratings[rated])
+        if probabilities is None:
+            return False
+        if not rated.all():
+            missing = schedule.select(~rated)
+            missing_matches = [
+                (schedule.teams[a], schedule.teams[h], k)
+                for a, h, k in zip(missing.away, missing.home, missing.key.tolist())
+            ]
+            print(f"Error: no <{base_ranking}> rating at the round of {len(missing_matches)} matches, left without "
+                  f"<{forecast_name}> forecast: {missing_matches[:10]}{' ...' if len(missing_matches) > 10 else ''}")
+            schedule = schedule.select(rated)
+        if self.matches is not None:
+            self.matches.forecasts.set(forecast_name, probabilities, rows=schedule.key, outcomes=forecast.outcomes)
+            self.matches.touch()
+            return True
+        for match_i, (away_i, home_i, edge_key) in enumerate(zip(schedule.away, schedule.home, schedule.key)):
+            self.data.edges[
+                schedule.teams[away_i], schedule.teams[home_i], edge_key
+            ].setdefault('forecasts', {})[forecast_name] = ForecastRow(forecast, probabilities[match_i])
+        return True
+
+    def _add_forecast_columnar(self, forecast: BaseForecast, forecast_name, base_ranking, season=None):
+        for row in self._table_rows(season):
+            away_team, home_team = self.matches.teams[self.matches.away[row]], self.matches.teams[self.matches.home[row]]
+            self._add_forecast_to_team((away_team, home_team, row), forecast, forecast_name, base_ranking)
+
+    def _add_odds_batch(self, bookmaker_name: str, bookmaker: BaseBookmaker, base_forecast: str, matches=None):
+        """Computes the odds of all the matches (or of the (away, home, key) <matches>) at once out of the stored
+        <base_forecast> probabilities"""
+        games, rows = self._selected_games(matches)
+        base_probabilities = self._forecast_matrix(base_forecast, games, rows)
+        if base_probabilities is None:
+            print(f"Missing <{base_forecast}> forecast in network")
+            return
+        odds = bookmaker.get_odds_batch(base_probabilities)
+        if games is None:
+            self.matches.odds.set(bookmaker_name, odds, rows=rows)
+            self.matches.touch()
+            return
+        for (away_team, home_team, edge_key, edge_attributes), match_odds in zip(games, odds):
+            edge_attributes.setdefault('odds', {})[bookmaker_name] = match_odds
+
+    def _add_bets_batch(self, bettor_name: str, bookmaker: str, betting: BaseBetting, base_forecast: str,
+                        matches=None):
+        """Computes the bets of all the matches (or of the (away, home, key) <matches>) at once out of the stored
+        <base_forecast> probabilities and <bookmaker> odds"""
+        games, rows = self._selected_games(matches)
+        bettor_probabilities = self._forecast_matrix(base_forecast, games, rows)
+        if bettor_probabilities is None:
+            print(f"Missing <{base_forecast}< forecast.")
+            return
+        match_odds = self._outcome_matrix('odds', bookmaker, games, rows)
+        if match_odds is None:
+            print(f"Missing <{bookmaker}< odds.")
+            return
+        bets = betting.bet_batch(bettor_probabilities, match_odds)
+        if games is None:
+            self.matches.bets.set(bettor_name, bets, rows=rows)
+            self.matches.touch()
+            return
+        for (away_team, home_team, edge_key, edge_attributes), match_bets in zip(games, bets):
+            edge_attributes.setdefault('bets', {})[bettor_name] = match_bets
 
     def get_teams(
             self,
@@ -193,19 +798,19 @@ class BaseNetwork(ABC):
             round=None):
         if ratings is None:
             ratings = ['ranking']
-            team_nodes = self.data.nodes
+            team_nodes = self.node_attributes
         maximum_number_of_teams = maximum_number_of_teams or self.n_teams
         if season is None:
             season = -1
         season_round = round if round is not None else self.n_rounds
         teams = {}
-        set_of_nodes = [node for node in self.data.nodes if node in list(self.league_teams_labels.values())] \
-            if in_league else [node for node in self.data.nodes]
+        set_of_nodes = [node for node in self.node_attributes if node in list(self.league_teams_labels.values())] \
+            if in_league else [node for node in self.node_attributes]
         for node in set_of_nodes:
             for rating in ratings:
                 try:
                     teams.setdefault(rating, []).append(
-                        self.data.nodes[node].get('ratings', {}).get(rating, {}).get(season, {})[season_round - 1]
+                        self.node_attributes[node].get('ratings', {}).get(rating, {}).get(season, {})[season_round - 1]
                     )
                     teams.setdefault('labels', []).append(node)
                 except KeyError as K:
@@ -234,15 +839,16 @@ class BaseNetwork(ABC):
         serialized_network['bets'] = bets
         serialized_network['metrics'] = metrics
         serialized_network['ratings'] = self._serialize_ratings(network_name)
+        serialized_network['inactive_matches'] = self._serialize_matches(network_name, inactive=True)[0]
         return serialized_network
 
-    def _serialize_matches(self, network_name):
+    def _serialize_matches(self, network_name, inactive=False):
         matches = []
         forecasts = []
         odds = []
         bets = []
         metrics = []
-        for node1, node2, edge_key, edge_attributes in self.data.edges(keys=True, data=True):
+        for node1, node2, edge_key, edge_attributes in (self.inactive_edges() if inactive else self._edges()):
             new_match = {
                 "network_name": network_name,
                 "node1": node1,
@@ -305,7 +911,7 @@ class BaseNetwork(ABC):
 
     def _serialize_ratings(self, network_name):
         all_ratings = []
-        for node_id, node_info in self.data.nodes().items():
+        for node_id, node_info in self.node_attributes.items():
             for rating_name, r in node_info.get('ratings', {}).items():
                 if rating_name != "hyper_parameters":
                     for season, ratings in r.items():
@@ -331,100 +937,357 @@ class BaseNetwork(ABC):
                             all_ratings.append(new_rating)
         return all_ratings
 
-    def deserialize_network(self, rounds, seasons, days, matches, forecasts, ratings, odds, bets, metrics):
+    def deserialize_network(self, rounds, seasons, days, matches, forecasts, ratings, odds, bets, metrics,
+                            inactive_matches=None):
+        """Builds the network out of the rows of the serialized tables. The forecasts, odds, bets and metrics rows
+        may be given as lists or already grouped by match_id (see group_by_match). <inactive_matches> rows go back
+        to the <inactive_matches> table.
+        """
         graph = nx.MultiDiGraph()
         self.n_rounds = rounds
         self.seasons = seasons
         self.days_between_rounds = days
+        child_tables = {}
+        for table_name, table_rows in [('forecasts', forecasts), ('odds', odds), ('bets', bets), ('metrics', metrics)]:
+            start_time = time.time()
+            child_tables[table_name] = group_by_match(table_rows)
+            report_rows(table_name, sum(len(v) for v in child_tables[table_name].values()), start_time)
+        forecast_definition = SimpleForecast(outcomes=['home', 'draw', 'away'])
+        start_time = time.time()
         for m in tqdm(matches, leave=False):
             edge_dict = {key: value for key, value in m.items()}
-            match_forecasts = [f for f in forecasts if f['match_id'] == m['match_id']]
-            for f in match_forecasts:
+            for f in child_tables['forecasts'].get(m['match_id'], []):
                 f_attributes = f['attributes']
-                edge_dict.setdefault('forecasts', {})[f['forecast_name']] = SimpleForecast(
-                    outcomes=['home', 'draw', 'away'],
-                    probs=[f_attributes['probability_home'], f_attributes['probability_draw'], f_attributes['probability_away']]
+                edge_dict.setdefault('forecasts', {})[f['forecast_name']] = ForecastRow(
+                    forecast_definition,
+                    np.array([
+                        f_attributes['probability_home'],
+                        f_attributes['probability_draw'],
+                        f_attributes['probability_away']
+                    ])
                 )
-            for o in [match_odds for match_odds in odds if match_odds['match_id'] == m['match_id']]:
+            for o in child_tables['odds'].get(m['match_id'], []):
                 edge_dict.setdefault('odds', {})[o['bookmaker_name']] = [v for v in o['attributes'].values()]
-            for b in [match_bets for match_bets in bets if match_bets['match_id'] == m['match_id']]:
+            for b in child_tables['bets'].get(m['match_id'], []):
                 edge_dict.setdefault('bets', {})[b['bettor_name']] = [v for v in b['attributes'].values()]
-            for metric in [match_metrics for match_metrics in metrics if match_metrics['match_id'] == m['match_id']]:
+            for metric in child_tables['metrics'].get(m['match_id'], []):
                 edge_dict.setdefault('metrics', {})[metric['metric_name']] = [
                     v for v in metric['attributes'].values()
                 ] if (type(metric["attributes"]) == dict) else metric["attributes"]
             graph.add_edge(m['node1'], m['node2'], **edge_dict)
+        report_rows('matches', len(matches), start_time)
+        start_time = time.time()
+        rating_values = {}
+        rating_hyperparameters = {}
         for r in ratings:
             graph.nodes[r['node_id']]['name'] = r['node_name']
-            ratings_object = graph.nodes[r['node_id']].setdefault(
-                'ratings', {}
-            ).setdefault(r['rating_name'], {})
-            ratings_object.setdefault(
-                r['season'], []
+            rating_values.setdefault((r['rating_name'], r['season']), {}).setdefault(
+                r['node_id'], []
             ).append(r['value'])
-
-            graph.nodes[r['node_id']].setdefault(
-                'ratings', {}
-            ).setdefault(
-                'hyper_parameters', {}
-            ).setdefault(
-                r['rating_name'], {}
-            ).setdefault(
-                r['season'], {"trends": [r['trend']], "starting_points": [r['starting_point']]}
+            rating_hyperparameters.setdefault((r['rating_name'], r['season']), {}).setdefault(
+                r['node_id'], {"trends": [r['trend']], "starting_points": [r['starting_point']]}
             )
         self.data = graph
+        for (rating_name, season), team_values in rating_values.items():
+            for team_id, values in team_values.items():
+                self._add_rating_to_team(
+                    team_id, values, rating_hyperparameters[rating_name, season], rating_name, season=season
+                )
+        report_rows('ratings', len(ratings), start_time)
+        self.inactive_matches = MatchTable()
+        if inactive_matches:
+            self.inactive_matches.append(
+                away=[m['node1'] for m in inactive_matches],
+                home=[m['node2'] for m in inactive_matches],
+                season=np.array([int(m['season']) for m in inactive_matches], dtype=np.int64),
+                round=np.array([int(m['round']) for m in inactive_matches], dtype=np.int64),
+                day=np.array([int(m['day']) for m in inactive_matches], dtype=np.int64),
+                state=np.full(len(inactive_matches), STATE_CODES['inactive'], dtype=np.int8)
+            )
+
+    def to_parquet(self, path, network_name=None):
+        """Writes the network as a directory of typed parquet tables: nodes, per-round ratings and matches with
+        their forecasts, odds, bets and metrics, one matches file per season, and the inactive matches.
+        """
+        from dfg_rating.model.network.network_parquet import write_network
+        table = self.matches if self.matches is not None else MatchTable.from_graph(self.data)
+        write_network(path, {
+            "network_name": network_name,
+            "network_type": self.type,
+            "seasons": self.seasons,
+            "days_between_rounds": self.days_between_rounds,
+            "rounds": self.n_rounds,
+            "teams": self.n_teams
+        }, self.node_attributes, table, self.inactive_matches)
+
+    def from_parquet(self, path):
+        """Loads the network written by to_parquet at <path>. The columnar backend takes the matches table as read,
+        the graph backend builds the graph out of it.
+        """
+        from dfg_rating.model.network.network_parquet import read_network
+        start_time = time.time()
+        info, nodes, ratings, table, inactive = read_network(path)
+        self.n_rounds = info['rounds']
+        self.seasons = info['seasons']
+        self.days_between_rounds = info['days_between_rounds']
+        self.n_teams = info['teams']
+        if self.matches is not None:
+            table.key = np.arange(len(table))
+            self.matches = table
+            self._nodes = nodes
+            self._graph_version = -1
+        else:
+            self.data = table.to_graph(nodes)
+        self.inactive_matches = inactive
+        for rating_name, team_id, season, values, hyper_parameters in ratings:
+            self.rating_store.set(rating_name, season, [team_id], values)
+            if hyper_parameters is not None:
+                self.rating_store.set_hyper_parameters(rating_name, season, team_id, hyper_parameters)
+        self._attach_ratings(dict.fromkeys(team_id for _, team_id, _, _, _ in ratings))
+        report_rows('matches', len(table), start_time)
 
     def get_number_of_teams(self):
-        return len(self.data.nodes)
+        return len(self.node_attributes)
 
     def get_rankings(self):
         rankings_list = []
-        for node in self.data.nodes:
-            for rating_id, rating_value in self.data.nodes[node]['ratings'].items():
+        for node in self.node_attributes:
+            for rating_id, rating_value in self.node_attributes[node]['ratings'].items():
                 if rating_id not in ['hyper_parameters'] + rankings_list:
                     rankings_list.append(rating_id)
         return rankings_list
 
     def get_forecasts(self):
+        if self.matches is not None:
+            return list(self.matches.forecasts.names)
         forecasts_list = []
         for edge in self.data.edges:
             forecasts_list += [f for f in self.data.edges[edge].get('forecasts', {}).keys() if f not in forecasts_list]
         return forecasts_list
 
-    def add_evaluation(self, evaluators_list: List[Tuple[Evaluator, str]]):
-        for away_team, home_team, match_id, match_attributes in self.data.edges(keys=True, data=True):
-            for evaluator, evaluator_name in evaluators_list:
-                correct, metric_value = evaluator.eval(match_attributes)
-                if correct:
-                    self.data.edges[(away_team, home_team, match_id)].setdefault(
-                        'metrics', {}
-                    )[evaluator_name] = metric_value
-                else:
+    def add_evaluation(self, evaluators_list: List[Tuple[Evaluator, str]], matches=None):
+        """Stores the metric of each (evaluator, metric_name) pair in every match, or in the (away, home, key)
+        <matches> only.
+
+        Evaluators with an eval_batch method score all the matches at once out of (n_matches x n_outcomes) forecast
+        and observed results arrays, built once and shared by all the evaluators. The other evaluators, and batch
+        evaluators lacking a forecast in some match, are evaluated match by match in a single pass.
+        """
+        if matches is None:
+            self._record('evaluation', tuple(evaluator_name for _, evaluator_name in evaluators_list), evaluators_list)
+        games, rows = self._selected_games(matches)
+        if games is None:
+            rows = np.arange(len(self.matches)) if rows is None else rows
+        n_matches = len(rows) if games is None else len(games)
+        inputs = {}
+        batch_values = [self._evaluate_batch(evaluator, games, inputs, rows) for evaluator, _ in evaluators_list]
+        scalar_evaluators = [i for i, values in enumerate(batch_values) if values is None]
+        scalar_values = {i: [] for i in scalar_evaluators}
+        if len(scalar_evaluators) > 0:
+            for match_i in range(n_matches):
+                match_attributes = self.matches.edge_attributes(rows[match_i]) if games is None else games[match_i][3]
+                for i in scalar_evaluators:
+                    scalar_values[i].append(evaluators_list[i][0].eval(match_attributes))
+        for i, (evaluator, evaluator_name) in enumerate(evaluators_list):
+            if batch_values[i] is not None:
+                results = [(1, value) for value in batch_values[i]]
+            else:
+                results = scalar_values[i]
+            metric_rows, metric_values = [], []
+            for match_i, (correct, metric_value) in enumerate(results):
+                if not correct:
                     print(f"Incorrect output for metric {evaluator_name}")
+                elif games is None:
+                    metric_rows.append(rows[match_i])
+                    metric_values.append(metric_value)
+                else:
+                    games[match_i][3].setdefault('metrics', {})[evaluator_name] = metric_value
+            if (games is None) and (len(metric_rows) > 0):
+                self.matches.set_metric(evaluator_name, metric_rows, metric_values)
+
+    def _evaluate_batch(self, evaluator, games, inputs, rows=None):
+        """Scores of all the matches by a batch evaluator, None for the matches not played if the evaluator uses their
+        result. None if the evaluator has no eval_batch method or a forecast it needs is missing or does not fit its
+        outcomes.
+
+        Args:
+            evaluator: Evaluator.
+            games: List of (away, home, key, attributes) matches, None in columnar networks.
+            inputs: Cache of the forecast and observed arrays shared by the evaluators.
+            rows: Rows of the evaluated matches in columnar networks, all if None.
+        """
+        if isinstance(evaluator, ProfitabilityEvaluator):
+            if not hasattr(evaluator, 'eval_batch'):
+                return None
+            returns = self._betting_returns_batch(evaluator, games, inputs, rows)
+            return None if returns is None else returns.tolist()
+        if not hasattr(evaluator, 'eval_batch'):
+            return None
+        forecast_names = [evaluator.forecast_name] + (['true_forecast'] if evaluator.uses_true_forecast else [])
+        forecasts = []
+        for forecast_name in forecast_names:
+            if ('forecast', forecast_name) not in inputs:
+                inputs[('forecast', forecast_name)] = self._forecast_matrix(forecast_name, games, rows)
+            probabilities = inputs[('forecast', forecast_name)]
+            if (probabilities is None) or (probabilities.shape[1] != len(evaluator.outcomes)):
+                return None
+            forecasts.append(probabilities)
+        observed = self._observed_matrix(evaluator.outcomes, games, inputs, rows)
+        if not getattr(evaluator, 'uses_result', True):
+            return evaluator.eval_batch(forecasts[0], observed, forecasts[1] if evaluator.uses_true_forecast else None)
+        # Matches not played have no result to score against
+        played = np.array([winner is not None for winner in inputs['winners']], dtype=bool)
+        scores = iter(evaluator.eval_batch(
+            forecasts[0][played], observed[played], forecasts[1][played] if evaluator.uses_true_forecast else None
+        ))
+        return [next(scores) if match_played else None for match_played in played]
+
+    def _selected_games(self, matches=None):
+        """Selection of the (away, home, key) <matches>, all the matches if None, as a (games, rows) pair.
+
+        Games are the (away, home, key, attributes) edges of the matches in graph networks, None in columnar networks,
+        where rows are their table rows, in the order of the edges of <data> for all the matches.
+        """
+        if self.matches is not None:
+            if matches is None:
+                return None, self._table_rows()
+            return None, np.array([key for _, _, key in matches], dtype=np.int64)
+        if matches is None:
+            return list(self.data.edges(keys=True, data=True)), None
+        return [(away, home, key, self.data.edges[away, home, key]) for away, home, key in matches], None
+
+    def _forecast_matrix(self, forecast_name, games, rows=None):
+        """(n_matches x n_outcomes) probabilities of a forecast, None if some match does not have it"""
+        if games is None:
+            if forecast_name not in self.matches.forecasts:
+                return None
+            probabilities = self.matches.forecasts.get(forecast_name)
+            if rows is not None:
+                probabilities = probabilities[rows]
+            return None if np.isnan(probabilities).all(axis=1).any() else probabilities
+        forecasts = [d.get('forecasts', {}).get(forecast_name) for _, _, _, d in games]
+        if (len(forecasts) == 0) or any(f is None for f in forecasts) or (
+                len(set(len(f.probabilities) for f in forecasts)) > 1
+        ):
+            return None
+        return np.array([f.probabilities for f in forecasts], dtype=float)
+
+    def _outcome_matrix(self, entity, name, games, rows=None):
+        """(n_matches x n_outcomes) <entity> ('odds' or 'bets') values of <name>, None if some match does not have
+        them"""
+        if games is None:
+            tensor = getattr(self.matches, entity)
+            if name not in tensor:
+                return None
+            return tensor.get(name) if rows is None else tensor.get(name)[rows]
+        values = [d.get(entity, {}).get(name) for _, _, _, d in games]
+        if (len(values) == 0) or any(v is None for v in values) or (len(set(len(v) for v in values)) > 1):
+            return None
+        return np.array(values, dtype=float)
+
+    def _observed_matrix(self, outcomes, games, inputs, rows=None):
+        """(n_matches x n_outcomes) one-hot results of the matches, all zeros if not played. Cached in <inputs>, along
+        with the result label of each match under 'winners'"""
+        if 'winners' not in inputs:
+            if games is None:
+                winner = self.matches.winner if rows is None else self.matches.winner[rows]
+                inputs['winners'] = np.array(self.matches.results + [None], dtype=object)[winner]
+            else:
+                inputs['winners'] = np.empty(len(games), dtype=object)
+                inputs['winners'][:] = [d.get('winner') for _, _, _, d in games]
+        observed_key = ('observed', tuple(outcomes))
+        if observed_key not in inputs:
+            inputs[observed_key] = np.column_stack(
+                [inputs['winners'] == outcome for outcome in outcomes]
+            ).astype(float)
+        return inputs[observed_key]
+
+    def _betting_returns_batch(self, evaluator: BettingReturnsEvaluator, games, inputs, rows=None):
+        """(n_matches x n_outcomes x 4) returns of all the matches, None if some match lacks the bets, odds or true
+        model forecast"""
+        if ('forecast', evaluator.true_model) not in inputs:
+            inputs[('forecast', evaluator.true_model)] = self._forecast_matrix(evaluator.true_model, games, rows)
+        true_probabilities = inputs[('forecast', evaluator.true_model)]
+        odds = self._outcome_matrix('odds', evaluator.bookmaker_name, games, rows)
+        bets = self._outcome_matrix('bets', evaluator.player_name, games, rows)
+        n_outcomes = len(evaluator.outcomes)
+        if any((m is None) or (m.shape[1] != n_outcomes) for m in [true_probabilities, odds, bets]):
+            return None
+        observed = self._observed_matrix(evaluator.outcomes, games, inputs, rows)
+        return evaluator.eval_batch(bets, odds, true_probabilities, observed)
+
+    def get_betting_returns(self, evaluator: BettingReturnsEvaluator) -> BettingReturns:
+        """Returns of the bets of the <evaluator> bettor at its bookmaker odds in all the matches, ordered by season
+        and day. None if some match lacks the bets, odds or true model forecast."""
+        games, rows = self._selected_games()
+        inputs = {}
+        returns = self._betting_returns_batch(evaluator, games, inputs, rows)
+        if returns is None:
+            print(f"Missing <{evaluator.player_name}> bets, <{evaluator.bookmaker_name}> odds or "
+                  f"<{evaluator.true_model}> forecast in network")
+            return None
+        if games is None:
+            table = self.matches
+            season, rounds, days = table.season[rows], table.round[rows], table.day[rows]
+            home = np.array(table.teams, dtype=object)[table.home[rows]]
+            away = np.array(table.teams, dtype=object)[table.away[rows]]
+            keys = rows
+        else:
+            season = [d.get('season', 0) for _, _, _, d in games]
+            rounds = [d.get('round', -1) for _, _, _, d in games]
+            days = [d.get('day', -1) for _, _, _, d in games]
+            away = [a for a, _, _, _ in games]
+            home = [h for _, h, _, _ in games]
+            keys = [k for _, _, k, _ in games]
+        return BettingReturns(
+            evaluator.player_name, evaluator.bookmaker_name, evaluator.outcomes, season, rounds, days, home, away, keys,
+            inputs['winners'], self._outcome_matrix('bets', evaluator.player_name, games, rows),
+            self._outcome_matrix('odds', evaluator.bookmaker_name, games, rows),
+            inputs[('forecast', evaluator.true_model)], returns
+        )
 
     def export_ratings(self):
         ratings_value_list = {
-            node: self.data.nodes[node].get('ratings', {}) for node in self.data.nodes
+            node: self.node_attributes[node].get('ratings', {}) for node in self.node_attributes
         }
         return ratings_value_list
 
-    def degree(self, filter_active=False):
+    def _match_degrees(self, filter_active):
+        """Number of matches of each node, counted on the match arrays. With <filter_active>, only the active
+        matches, leaving out the nodes without any. Otherwise all the generated matches, inactive ones included.
+        """
+        schedule = self.get_match_arrays()
+        n_teams = len(schedule.teams)
+        selected = schedule.active if filter_active else np.ones(len(schedule.away), dtype=bool)
+        degrees = np.bincount(schedule.away[selected], minlength=n_teams) + np.bincount(
+            schedule.home[selected], minlength=n_teams
+        )
         if filter_active:
-            subgraph = nx.MultiDiGraph(
-                ((source, target, key) for source, target, key, attr in self.data.edges(keys=True, data=True) if attr.get('state', 'active') == 'active')
+            return [(team, d) for team, d in zip(schedule.teams, degrees.tolist()) if d > 0]
+        if len(self.inactive_matches) > 0:
+            team_position = {team: i for i, team in enumerate(schedule.teams)}
+            positions = np.array([team_position[t] for t in self.inactive_matches.teams], dtype=np.int64)
+            degrees += np.bincount(positions[self.inactive_matches.away], minlength=n_teams) + np.bincount(
+                positions[self.inactive_matches.home], minlength=n_teams
             )
-            return subgraph.degree()
-        else:
+        return list(zip(schedule.teams, degrees.tolist()))
+
+    def degree(self, filter_active=False):
+        if len(self.inactive_matches) == 0 and not filter_active:
             return self.data.degree()
+        return self._match_degrees(filter_active)
 
     def density(self, filter_active=False):
         if filter_active:
-            subgraph = nx.MultiDiGraph(
-                ((source, target, key) for source, target, key, attr in self.data.edges(keys=True, data=True) if attr.get('state', 'active') == 'active')
-            )
-            return nx.density(subgraph)
+            degrees = self._match_degrees(True)
+            n_nodes = len(degrees)
+            n_matches = sum(d for _, d in degrees) / 2
         else:
-            return nx.density(self.data)
+            n_nodes = self.data.number_of_nodes()
+            n_matches = self.data.number_of_edges() + len(self.inactive_matches)
+        if n_nodes <= 1:
+            return 0
+        return n_matches / (n_nodes * (n_nodes - 1))
 
     def get_playing_teams(self, season, league=None):
         return {t: t for t in range(self.n_teams)}
@@ -433,14 +1296,15 @@ class BaseNetwork(ABC):
         season_i = indexOf(self.get_seasons(), season)
         only_relegated = kwargs.get("relegated", False)
         season_teams = self.get_playing_teams(season, league)
+        next_season_teams = set(self.get_playing_teams(self.get_seasons()[season_i + 1], league).values())
         teams_playing = season_teams if not only_relegated else {
-            t: t for t in season_teams.values() if t not in self.get_playing_teams(self.get_seasons()[season_i + 1], league).values()
+            t: t for t in season_teams.values() if t not in next_season_teams
         }
         ratings_list = []
         for team_i, team in teams_playing.items():
             current_league = self.get_current_league(self.get_seasons()[season_i + 1], team)
             if current_league is not None:
-                last_season_rating = self.data.nodes[team].get(
+                last_season_rating = self.node_attributes[team].get(
                     'ratings', {}).get(rating_name, {}).get(
                     season, default_rating
                 )[-1]
@@ -458,6 +1322,11 @@ class BaseNetwork(ABC):
         printing_odds = kwargs.get("odds", [])
         printing_bets = kwargs.get("bets", [])
         printing_metrics = kwargs.get("metrics", [])
+        file_name = kwargs.get('filename', 'network.csv')
+        if self.matches is not None:
+            df = self._export_table(printing_forecasts, printing_ratings, printing_odds, printing_bets, printing_metrics)
+            df.to_csv(file_name, index=False)
+            return
         for away_team, home_team, edge_key, edge_attributes in self.data.edges(keys=True, data=True):
             match_dict = {
                 "Home": home_team,
@@ -486,10 +1355,45 @@ class BaseNetwork(ABC):
             for m in printing_metrics:
                 match_dict[f"{m}#metric"] = edge_attributes.get('metrics', {}).get(m, -1)
             network_flat.append(match_dict)
-        file_name = kwargs.get('filename', 'network.csv')
         df = pd.DataFrame(network_flat)
         df.to_csv(file_name, index=False)
 
+    def _export_table(self, printing_forecasts, printing_ratings, printing_odds, printing_bets, printing_metrics):
+        table = self.matches
+        home_labels = np.array(table.teams, dtype=object)[table.home]
+        away_labels = np.array(table.teams, dtype=object)[table.away]
+        columns = {
+            "Home": home_labels,
+            "Away": away_labels,
+            "Season": table.season,
+            "Round": table.round,
+            "Day": table.day,
+            "Result": np.array(table.results + ['none'], dtype=object)[table.winner],
+        }
+        for f in printing_forecasts:
+            if f in table.forecasts:
+                for i, outcome in enumerate(table.forecasts.outcomes[f]):
+                    columns[f"{f}#{outcome}"] = table.forecasts.get(f)[:, i]
+        for r in printing_ratings:
+            for labels, name in [(home_labels, 'Home'), (away_labels, 'Away')]:
+                values = np.full(len(table), np.nan)
+                for row in range(len(table)):
+                    rating_dict = self.node_attributes[labels[row]].get('ratings', {}).get(r)
+                    values[row] = rating_dict.get(table.season[row])[table.round[row]]
+                columns[f"{r}#{name}"] = values
+        for entity, tensor, names in [("odds", table.odds, printing_odds), ("bets", table.bets, printing_bets)]:
+            for name in names:
+                if name in tensor:
+                    for i in range(len(tensor.outcomes[name])):
+                        columns[f"{name}#{entity}#{i}"] = tensor.get(name)[:, i]
+        for m in printing_metrics:
+            metric_values = table.metrics.get(m, np.full(len(table), None, dtype=object))
+            metric_column = np.empty(len(table), dtype=object)
+            for row, value in enumerate(metric_values):
+                metric_column[row] = -1 if value is None else value
+            columns[f"{m}#metric"] = metric_column
+        return pd.DataFrame(columns)
+
     @abstractmethod
     def add_rating(self, rating, rating_name):
         pass
@@ -527,23 +1431,58 @@ class WhiteNetwork(BaseNetwork):
         self.mapping = kwargs.get("mapping", self.DEFAULT_MAPPING)
         correct, report = self.validate()
         if correct:
-            if self.mapping['dayIsTimestamp']:
-                self.table_data[self.mapping['day']] = pd.to_datetime(
-                    self.table_data[self.mapping['day']],
-                    format=self.mapping['ts_format']
-                )
-                self.table_data['Year'] = pd.DatetimeIndex(self.table_data[self.mapping['day']]).year
-                self.table_data.sort_values(by=self.mapping['day'], inplace=True)
+            if isinstance(self.table_data, pd.DataFrame):
+                self.prepare_table(self.table_data)
+                self.table_data.sort_values(by=self.mapping['day'], inplace=True, kind='stable')
+                self.season_values = [s for s in self.table_data[self.mapping['season']].unique()]
+                self.create_data()
             else:
-                self.table_data.sort_values(by=self.mapping['day'], inplace=True)
-            self.season_values = [s for s in self.table_data[self.mapping['season']].unique()]
-            self.create_data()
+                chunks, self.table_data = self.table_data, None
+                self.create_data_from_chunks(chunks)
             print("Network loaded correctly")
         else:
             print("Errors in mapping:")
             for r in report:
                 print(r)
 
+    def prepare_table(self, table: pd.DataFrame):
+        """Parses the timestamps of the day column and adds their Year, in place"""
+        if self.mapping['dayIsTimestamp']:
+            table[self.mapping['day']] = pd.to_datetime(
+                table[self.mapping['day']],
+                format=self.mapping['ts_format']
+            )
+            table['Year'] = pd.DatetimeIndex(table[self.mapping['day']]).year
+        return table
+
+    @staticmethod
+    def mapping_columns(mapping):
+        """Columns read by a mapping and their types: numeric columns of ratings, forecasts, odds and bets are read
+        as floats. The optional 'dtypes' entry of the mapping overrides them.
+
+        Returns:
+            (set, dict): Column names and dtype of the columns.
+        """
+        columns = {mapping['day'], mapping.get('season'), mapping.get('round'), mapping.get('tournament')}
+        dtypes = {}
+        for n in ['node1', 'node2']:
+            for node_property_key, row_column in mapping[n].items():
+                if node_property_key == 'ratings':
+                    columns.update(row_column.values())
+                    dtypes.update({c: 'float64' for c in row_column.values()})
+                else:
+                    columns.add(row_column)
+        for entity in ['forecasts', 'odds', 'bets']:
+            for entity_options in mapping.get(entity, {}).values():
+                columns.update(entity_options.values())
+                dtypes.update({c: 'float64' for c in entity_options.values()})
+        columns.update(v for k, v in mapping.get('winner', {}).items() if k in ['id', 'result'])
+        if mapping['dayIsTimestamp']:
+            dtypes[mapping['day']] = 'str'
+        dtypes.update(mapping.get('dtypes', {}))
+        columns.discard(None)
+        return columns, dtypes
+
     def validate(self):
         correct = True
         messages = []
@@ -581,100 +1520,229 @@ class WhiteNetwork(BaseNetwork):
         return correct, messages
 
     def create_data(self):
-        graph = nx.MultiDiGraph()
-        day = -1
-        daily_ratings = {}
-        self.round_values = []
-        current_season = -1
-        for row_id, row in self.table_data.iterrows():
-            row_season = row[self.mapping['season']]
-            if current_season != row_season:
-                current_season = row_season
-                day = -1
-            if self.mapping['dayIsTimestamp']:
-                if day == -1:
-                    first_date = row[self.mapping['day']]
-                delta = row[self.mapping['day']] - first_date
-                day = delta.days
-            else:
-                day = int(row[self.mapping['day']])
-            # Add edge (create if needed the nodes and attributes)
-            edge_dict = {key: value for key, value in row.items()}
-            edge_dict['day'] = day
+        """Builds the graph column by column: days, rounds and seasons are computed over whole columns, the edges
+        are inserted in bulk and the daily ratings are forward filled in (days x teams) arrays per season.
+        """
+        graph = self._start_ingestion()
+        self._ingest_table(graph, self.table_data)
+        self._finish_ingestion(graph)
+        return True
+
+    def create_data_from_chunks(self, chunks):
+        """Streaming version of create_data over an iterable of DataFrames, e.g. pd.read_csv(..., chunksize=n).
+
+        Chunks must come sorted by day, as no global sort is done. Each chunk is ingested and dropped: only the
+        graph and the daily rating values are kept until the ratings are built at the end.
+        """
+        graph = self._start_ingestion()
+        season_values = {}
+        for chunk in chunks:
+            self.prepare_table(chunk)
+            season_values.update(dict.fromkeys(chunk[self.mapping['season']].unique()))
+            self._ingest_table(graph, chunk)
+        self.season_values = list(season_values)
+        self._finish_ingestion(graph)
+        return True
+
+    def _start_ingestion(self):
+        self._ingestion = {
+            "rows": 0,
+            "season_run": (None, None),
+            "round_values": {},
+            "rating_frames": {}
+        }
+        return nx.MultiDiGraph()
+
+    def _ingest_table(self, graph, table):
+        """Adds the matches of a table to the graph, continuing the days, rounds and ratings of previous tables.
+
+        Returns:
+            list: (node1, node2, key) of the new edges.
+        """
+        days = self._table_days(table)
+        records = table.to_dict('records')
+        node_ids = {n: table[self.mapping[n]['id']].tolist() for n in ['node1', 'node2']}
+        entity_values = {}
+        for entity in ['forecasts', 'bets', 'odds']:
+            for entity_name, entity_options in self.mapping.get(entity, {}).items():
+                columns = list(entity_options.values())
+                if entity == 'forecasts':
+                    definition = SimpleForecast(outcomes=list(entity_options.keys()))
+                    probabilities = table[columns].to_numpy(dtype=float)
+                    entity_values[entity, entity_name] = [ForecastRow(definition, p) for p in probabilities]
+                else:
+                    entity_values[entity, entity_name] = [list(v) for v in zip(*[table[c].tolist() for c in columns])]
+        # The winner is either a fixed side, when its id column is the one of a node, or a translated result column
+        fixed_winner = None
+        winner_mapping = self.mapping.get('winner', {})
+        if 'id' in winner_mapping:
+            for n in ['node1', 'node2']:
+                if winner_mapping.get('id') == self.mapping[n]['id']:
+                    fixed_winner = n
+        result_translation = winner_mapping.get('translation', {})
+        for match_i, edge_dict in enumerate(records):
+            edge_dict['day'] = days[match_i]
             edge_dict['round'] = edge_dict.get(self.mapping['round'], '0') if 'round' in self.mapping else '0'
             edge_dict['season'] = edge_dict.get(self.mapping['season'], '0') if 'season' in self.mapping else '0'
-            if edge_dict['round'] not in self.round_values:
-                self.round_values.append(edge_dict['round'])
-            if 'winner' in self.mapping:
-                winner_mapping = self.mapping.get('winner', {})
-                if 'id' in winner_mapping:
-                    winner_id = winner_mapping.get('id')
-                    for n in ['node1', 'node2']:
-                        node_id = self.mapping[n]['id']
-                        if winner_id == node_id:
-                            edge_dict['winner'] = n
-                elif 'result' in winner_mapping:
-                    pointer_result = winner_mapping.get('result')
-                    result_translation = winner_mapping.get('translation', {})
-                    edge_dict['winner'] = result_translation.get(edge_dict.get(pointer_result, 'ErrorReadingResult'))
-            for entity in ['forecasts', 'bets', 'odds']:
-                for entity_name, entity_options in self.mapping.get(entity, {}).items():
-                    values = [row[v] for v in entity_options.values()]
-                    if entity == 'forecasts':
-                        outcomes = list(entity_options.keys())
-                        edge_dict.setdefault(entity, {})[entity_name] = SimpleForecast(
-                            outcomes=outcomes,
-                            probs=values
-                        )
-                    else:
-                        edge_dict.setdefault(entity, {})[entity_name] = values
-            node1_id = row[self.mapping['node1']['id']]
-            node2_id = row[self.mapping['node2']['id']]
-            if 'tournament' in self.mapping:
-                for n in [node1_id, node2_id]:
-                    tournament_value = edge_dict.get(self.mapping["tournament"], "main")
-                    self.network_info.setdefault(
-                        tournament_value, {}
-                    ).setdefault(
-                        str(edge_dict['season']), {}
-                    ).setdefault(
-                        "teams_playing", {}
-                    )[n] = n
-            graph.add_edge(node1_id, node2_id, **edge_dict)
-            for n in ['node1', 'node2']:
-                for node_property_key, row_column in self.mapping[n].items():
-                    if node_property_key not in ['id', 'ratings']:
-                        graph.nodes[row[self.mapping[n]['id']]][node_property_key] = row[row_column]
-                    elif node_property_key == 'ratings':
-                        for rating_name, rating_column in row_column.items():
-                            daily_ratings.setdefault(
-                                rating_name, {}
-                            ).setdefault(
-                                edge_dict['season'], {}
-                            ).setdefault(
-                                day, {}
-                            )[row[self.mapping[n]['id']]] = row[rating_column]
-
-        for rating_name, rating_info in daily_ratings.items():
-            for season_id, season_info in rating_info.items():
-                for day_number, day_info in season_info.items():
-                    for t in graph.nodes():
-                        if t in day_info:
-                            node_value = day_info[t]
-                        else:
-                            node_value = graph.nodes[t].get('ratings', {}).get(rating_name, {}).get(season_id, [0])[-1]
-                        graph.nodes[t].setdefault(
-                            "ratings", {}
-                        ).setdefault(
-                            rating_name, {}
-                        ).setdefault(
-                            season_id, []
-                        ).append(node_value)
+            if 'id' in winner_mapping:
+                if fixed_winner is not None:
+                    edge_dict['winner'] = fixed_winner
+            elif 'result' in winner_mapping:
+                edge_dict['winner'] = result_translation.get(
+                    edge_dict.get(winner_mapping.get('result'), 'ErrorReadingResult')
+                )
+            for (entity, entity_name), values in entity_values.items():
+                edge_dict.setdefault(entity, {})[entity_name] = values[match_i]
+        self._ingestion['round_values'].update(dict.fromkeys(edge_dict['round'] for edge_dict in records))
+        if 'tournament' in self.mapping:
+            self._add_tournament_teams(records, node_ids)
+        keys = graph.add_edges_from(zip(node_ids['node1'], node_ids['node2'], records))
+        self._add_node_properties(graph, table, node_ids)
+        self._collect_daily_ratings(table, node_ids, [edge_dict['season'] for edge_dict in records], days)
+        self._ingestion['rows'] += len(table)
+        return list(zip(node_ids['node1'], node_ids['node2'], keys))
+
+    def _finish_ingestion(self, graph):
+        """Builds the ratings read from the tables. The ingestion state is kept for the tables of append_matches"""
         self.n_teams = len(graph.nodes)
-        self.round_values = sorted(self.round_values)
+        self.round_values = sorted(self._ingestion['round_values'])
         self.n_rounds = len(self.round_values)
         self.data = graph
-        return True
+        self._add_daily_ratings(list(graph.nodes))
+        self._attach_ratings(list(graph.nodes) if self._ingestion['rating_frames'] else [])
+
+    def append_matches(self, matches):
+        """Adds the matches of a table read with the network mapping, or a list of (away, home, attributes) matches,
+        and computes them as BaseNetwork.append_matches does. The rows of the table must follow the matches of the
+        network in time: days and daily ratings continue from the last table ingested. Columnar networks store the
+        new matches after the known ones, so ratings sensitive to the order of the matches of a round may differ
+        from reading all the tables at once.
+
+        Returns:
+            list: (node1, node2, key) of the new matches.
+        """
+        if not isinstance(matches, pd.DataFrame):
+            return super().append_matches(matches)
+        if getattr(self, '_ingestion', None) is None:
+            print("Tables can only be appended to networks read from tables")
+            return []
+        layout = self._rating_layout()
+        table = self.prepare_table(matches.copy())
+        table.sort_values(by=self.mapping['day'], inplace=True, kind='stable')
+        known_teams = set(self.node_attributes)
+        if self.matches is not None:
+            graph = nx.MultiDiGraph()
+            self._ingest_table(graph, table)
+            new_matches = self._store_graph(graph)
+        else:
+            new_matches = self._ingest_table(self.data, table)
+        self.n_teams = len(self.node_attributes)
+        self.round_values = sorted(self._ingestion['round_values'])
+        self.n_rounds = len(self.round_values)
+        seasons = list(table[self.mapping['season']].unique())
+        self._add_seasons(seasons)
+        nodes = list(self.node_attributes)
+        # New teams get the daily ratings of every season, as they would reading all the tables at once
+        self._add_daily_ratings(nodes, seasons if known_teams.issuperset(nodes) else None)
+        self._attach_ratings(nodes if self._ingestion['rating_frames'] else [])
+        self._update_derivations(new_matches, layout)
+        return new_matches
+
+    def _add_seasons(self, seasons):
+        self.season_values += [s for s in dict.fromkeys(seasons) if s not in self.season_values]
+
+    def _table_days(self, table):
+        """Day of each row: the day column itself, or the days since the first date of its season for timestamps.
+        As rows are sorted by date, the first date is taken again each time the season changes from a row to the next.
+        """
+        day_column = table[self.mapping['day']]
+        if not self.mapping['dayIsTimestamp']:
+            return [int(d) for d in day_column]
+        if len(table) == 0:
+            return []
+        seasons = table[self.mapping['season']]
+        season_runs = (seasons != seasons.shift()).cumsum()
+        first_dates = day_column.groupby(season_runs).transform('first')
+        last_season, last_first_date = self._ingestion['season_run']
+        if (last_first_date is not None) and (seasons.iloc[0] == last_season):
+            # The first season of the table continues the last one of the previous table
+            first_dates[season_runs == 1] = last_first_date
+        self._ingestion['season_run'] = (seasons.iloc[-1], first_dates.iloc[-1])
+        return (day_column - first_dates).dt.days.tolist()
+
+    def _add_tournament_teams(self, records, node_ids):
+        tournaments = [edge_dict.get(self.mapping["tournament"], "main") for edge_dict in records]
+        seasons = [str(edge_dict['season']) for edge_dict in records]
+        for node1_id, node2_id, tournament_value, season in zip(node_ids['node1'], node_ids['node2'], tournaments,
+                                                                seasons):
+            teams_playing = self.network_info.setdefault(
+                tournament_value, {}
+            ).setdefault(
+                season, {}
+            ).setdefault(
+                "teams_playing", {}
+            )
+            teams_playing[node1_id] = node1_id
+            teams_playing[node2_id] = node2_id
+
+    def _side_frame(self, node_ids, side, **columns):
+        """Rows of one side of the matches, ordered as they were read: row by row, node1 before node2"""
+        n = ['node1', 'node2'][side]
+        return pd.DataFrame({
+            'order': (self._ingestion['rows'] + np.arange(len(node_ids[n]))) * 2 + side,
+            'node': node_ids[n],
+            **columns
+        })
+
+    def _add_node_properties(self, graph, table, node_ids):
+        """Sets the node properties of the mapping. The last row where a node plays holds its value."""
+        node_properties = {}
+        for side, n in enumerate(['node1', 'node2']):
+            for node_property_key, row_column in self.mapping[n].items():
+                if node_property_key not in ['id', 'ratings']:
+                    node_properties.setdefault(node_property_key, []).append(
+                        self._side_frame(node_ids, side, value=table[row_column].to_numpy(dtype=object))
+                    )
+        for node_property_key, frames in node_properties.items():
+            values = pd.concat(frames).sort_values('order', kind='stable').drop_duplicates('node', keep='last')
+            for node, value in zip(values['node'], values['value']):
+                graph.nodes[node][node_property_key] = value
+
+    def _collect_daily_ratings(self, table, node_ids, seasons, days):
+        """Keeps the (node, season, day, value) rating rows of a table until all the tables are ingested"""
+        for side, n in enumerate(['node1', 'node2']):
+            for rating_name, rating_column in self.mapping[n].get('ratings', {}).items():
+                self._ingestion['rating_frames'].setdefault(rating_name, []).append(self._side_frame(
+                    node_ids, side, season=pd.Series(seasons, dtype=object), day=days,
+                    value=table[rating_column].to_numpy(dtype=object)
+                ))
+
+    def _add_daily_ratings(self, nodes, seasons=None):
+        """Adds the ratings read from the tables as one value per team and day of each season (of <seasons> only if
+        given).
+
+        A team keeps its last value on the days it does not play, and starts the season at 0.
+        """
+        node_position = {node: i for i, node in enumerate(nodes)}
+        for rating_name, frames in self._ingestion['rating_frames'].items():
+            ratings = pd.concat(frames).sort_values('order', kind='stable')
+            for season_id, season_ratings in ratings.groupby('season', sort=False, dropna=False):
+                if (seasons is not None) and (season_id not in seasons):
+                    continue
+                season_days = pd.unique(season_ratings['day'])
+                day_position = {d: i for i, d in enumerate(season_days)}
+                last_values = season_ratings.drop_duplicates(['day', 'node'], keep='last')
+                rows = np.array([day_position[d] for d in last_values['day']], dtype=np.int64)
+                columns = np.array([node_position[t] for t in last_values['node']], dtype=np.int64)
+                values = np.full([len(season_days), len(nodes)], None, dtype=object)
+                values[rows, columns] = last_values['value'].to_numpy(dtype=object)
+                assigned = np.zeros([len(season_days), len(nodes)], dtype=bool)
+                assigned[rows, columns] = True
+                # Position of the last day each team played, -1 before its first match
+                last_day = np.where(assigned, np.arange(len(season_days))[:, None], -1)
+                np.maximum.accumulate(last_day, axis=0, out=last_day)
+                filled = np.where(last_day >= 0, values[np.maximum(last_day, 0), np.arange(len(nodes))], 0)
+                self.rating_store.set(rating_name, season_id, nodes, filled.T.astype(float))
 
     def get_seasons(self):
         return self.season_values
@@ -683,6 +1751,9 @@ class WhiteNetwork(BaseNetwork):
         return self.n_rounds, self.round_values
 
     def add_rating(self, rating, rating_name, team_id=None, season=None):
+        self._seed_component(rating, 'true_rating' if rating_name == 'true_rating' else 'rating')
+        if team_id is None:
+            self._record('rating', rating_name, rating, season=season)
         if season is not None:
             self.add_season_rating(rating, rating_name, team_id, season)
         else:
@@ -690,11 +1761,7 @@ class WhiteNetwork(BaseNetwork):
                 self.add_season_rating(rating, rating_name, team_id, s)
 
     def add_season_rating(self, rating, rating_name, team_id, season):
-        def edge_filter(e):
-            new_filter = (
-                (e[3]['season'] == season)
-            )
-            return new_filter
+        edge_filter = SeasonFilter(season)
 
         if team_id:
             rating_values, rating_hp = rating.get_ratings(
@@ -703,42 +1770,28 @@ class WhiteNetwork(BaseNetwork):
             self._add_rating_to_team(team_id, rating_values, rating_hp, rating_name, season=season)
         else:
             ratings, rating_hp = rating.get_all_ratings(self, edge_filter, season)
-            for team_i, team in enumerate(self.data.nodes):
-                self._add_rating_to_team(team, ratings[team_i], rating_hp, rating_name, season=season)
+            self._store_season_ratings(rating, ratings, rating_hp, rating_name, season)
 
     def add_forecast(self, forecast: BaseForecast, forecast_name, base_ranking='true_rating', season=None):
+        self._seed_component(forecast, 'forecast_error')
+        self._record('forecast', forecast_name, forecast, base_ranking, season=season)
+        if self._add_forecast_batch(forecast, forecast_name, base_ranking, season):
+            return
+        if self.matches is not None:
+            return self._add_forecast_columnar(forecast, forecast_name, base_ranking, season)
         for match in self.data.edges(keys=True):
             if (season is None) or (self.data.edges[match].get('season', 0) == season):
-                self._add_forecast_to_team(match, deepcopy(forecast), forecast_name, base_ranking)
+                self._add_forecast_to_team(match, forecast, forecast_name, base_ranking)
 
     def add_odds(self, bookmaker_name: str, bookmaker: BaseBookmaker, base_forecast: str):
-        for away_team, home_team, edge_key, edge_attributes in self.data.edges(keys=True, data=True):
-            if base_forecast not in edge_attributes['forecasts']:
-                print(f"Missing <{base_forecast}> forecast in network")
-            match_base_forecast = edge_attributes['forecasts'][base_forecast]
-            base_probabilities = match_base_forecast.get_forecast(
-                match_data=edge_attributes,
-                home_team=self.data.nodes[home_team],
-                away_team=self.data.nodes[away_team],
-                round_values=self.get_rounds()[1]
-            )
-            self.data.edges[
-                away_team, home_team, edge_key
-            ].setdefault(
-                'odds', {}
-            )[bookmaker_name] = bookmaker.get_odds(base_probabilities)
+        self._seed_component(bookmaker, 'bookmaker_error')
+        self._record('odds', bookmaker_name, bookmaker, base_forecast)
+        self._add_odds_batch(bookmaker_name, bookmaker, base_forecast)
 
     def add_bets(self, bettor_name: str, bookmaker: str, betting: BaseBetting, base_forecast: str):
-        for away_team, home_team, edge_key, edge_attributes in self.data.edges(keys=True, data=True):
-            if base_forecast not in edge_attributes['forecasts']:
-                print(f"Missing <{base_forecast}< forecast.")
-            bettor_forecast = edge_attributes['forecasts'][base_forecast]
-            match_odds = edge_attributes.get('odds', {})[bookmaker]
-            self.data.edges[
-                away_team, home_team, edge_key
-            ].setdefault(
-                'bets', {}
-            )[bettor_name] = betting.bet(bettor_forecast.probabilities, match_odds)
+        self._seed_component(betting, 'bettor_error')
+        self._record('bets', bettor_name, bookmaker, betting, base_forecast)
+        self._add_bets_batch(bettor_name, bookmaker, betting, base_forecast)
 
     def get_playing_teams(self, season, league=None):
         default = {t: t+1 for t in range(self.n_teams)}
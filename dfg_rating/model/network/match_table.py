@@ -0,0 +1,494 @@
+import numpy as np
+import networkx as nx
+
+from dfg_rating.model.forecast.base_forecast import SimpleForecast
+
+NO_WINNER = -1
+STATE_CODES = {'inactive': 0, 'active': 1}
+STATE_LABELS = {code: label for label, code in STATE_CODES.items()}
+
+
+def _scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _as_column(values, length):
+    column = np.asarray(values)
+    if column.ndim == 0:
+        column = np.full(length, column.item())
+    if column.dtype.kind not in 'biuf':
+        column = column.astype(object)
+    return column
+
+
+def _concat(column, values, length):
+    values = _as_column(values, length)
+    if len(column) == 0:
+        return values
+    if (column.dtype.kind == 'O') != (values.dtype.kind == 'O'):
+        return np.concatenate([column.astype(object), values.astype(object)])
+    return np.concatenate([column, values])
+
+
+class ReadOnlyAttributes(dict):
+    """Attributes dictionary of a match of a materialized columnar network. Writes would not reach the match table, so
+    they raise instead of being lost."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "Match attributes of a columnar network graph are read-only, update them with the network methods"
+        )
+
+    __setitem__ = __delitem__ = __ior__ = setdefault = update = pop = popitem = clear = _read_only
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+
+class OutcomeTensor:
+    """Stacked per-outcome values of a family of match attributes (forecasts, odds or bets).
+
+    Values are kept in a single (n_entries x n_matches x n_outcomes) array. Entries with less outcomes than the widest
+    entry and matches without a value are padded with NaN.
+
+    Attributes:
+        names (list): Entry names in layer order.
+        outcomes (dict): Outcome labels of each entry.
+        values (np.ndarray): The stacked tensor.
+    """
+
+    def __init__(self, n_matches=0):
+        self.names = []
+        self.index = {}
+        self.outcomes = {}
+        self.values = np.empty((0, n_matches, 0))
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def n_matches(self):
+        return self.values.shape[1]
+
+    def _add_entry(self, name, width, outcomes=None):
+        if width > self.values.shape[2]:
+            padding = np.full(
+                (self.values.shape[0], self.values.shape[1], width - self.values.shape[2]), np.nan
+            )
+            self.values = np.concatenate([self.values, padding], axis=2)
+        if name not in self.index:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.values = np.concatenate(
+                [self.values, np.full((1, self.values.shape[1], self.values.shape[2]), np.nan)], axis=0
+            )
+        if outcomes is not None:
+            self.outcomes[name] = list(outcomes)
+        self.outcomes.setdefault(name, [i for i in range(width)])
+
+    def set(self, name, matrix, rows=None, outcomes=None):
+        """Writes a (n_rows x n_outcomes) matrix of values for the entry <name>.
+
+        Args:
+            name: Entry name (forecast, bookmaker or bettor name).
+            matrix: Values to write. A single row is broadcast to all the selected matches.
+            rows: Match indexes to write. All matches if None.
+            outcomes: Outcome labels of the entry.
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        width = matrix.shape[-1]
+        self._add_entry(name, width, outcomes)
+        layer = self.values[self.index[name]]
+        if rows is None:
+            layer[:, :width] = matrix
+        else:
+            layer[rows, :width] = matrix
+
+    def get(self, name):
+        """Returns the (n_matches x n_outcomes) view of the entry <name>"""
+        return self.values[self.index[name], :, :len(self.outcomes[name])]
+
+    def row(self, name, match_index):
+        if name not in self.index:
+            return None
+        values = self.values[self.index[name], match_index, :len(self.outcomes[name])]
+        if np.isnan(values).all():
+            return None
+        return values
+
+    def resize(self, n_matches):
+        extra = n_matches - self.values.shape[1]
+        if extra > 0:
+            self.values = np.concatenate(
+                [self.values, np.full((self.values.shape[0], extra, self.values.shape[2]), np.nan)], axis=1
+            )
+
+
+class MatchTable:
+    """Columnar storage of the matches of a network.
+
+    Each match is a row index shared by all the columns. Teams are stored as indexes into the <teams> list of node
+    labels and results as indexes into the <results> list of outcome labels.
+
+    Attributes:
+        away (np.ndarray): Away team (source node) index of each match.
+        home (np.ndarray): Home team (target node) index of each match.
+        season (np.ndarray): Season of each match.
+        round (np.ndarray): Round of each match.
+        day (np.ndarray): Day of each match.
+        state (np.ndarray): State code of each match (see STATE_CODES).
+        winner (np.ndarray): Result code of each match, NO_WINNER if it has not been played.
+        key (np.ndarray): Edge key of each match in the graph representation.
+        forecasts (OutcomeTensor): Forecast probabilities.
+        odds (OutcomeTensor): Bookmakers odds.
+        bets (OutcomeTensor): Bettors stakes.
+        metrics (dict): Evaluation values per metric name.
+        extra (dict): Any other edge attribute per attribute name.
+    """
+
+    def __init__(self, results=None):
+        self.teams = []
+        self.team_index = {}
+        self.results = list(results) if results is not None else ['home', 'draw', 'away']
+        self.away = np.empty(0, dtype=np.int64)
+        self.home = np.empty(0, dtype=np.int64)
+        self.season = np.empty(0, dtype=np.int64)
+        self.round = np.empty(0, dtype=np.int64)
+        self.day = np.empty(0, dtype=np.int64)
+        self.state = np.empty(0, dtype=np.int8)
+        self.winner = np.empty(0, dtype=np.int8)
+        self.key = np.empty(0, dtype=np.int64)
+        self.forecasts = OutcomeTensor()
+        self.odds = OutcomeTensor()
+        self.bets = OutcomeTensor()
+        self.metrics = {}
+        self.extra = {}
+        self.version = 0
+
+    def __len__(self):
+        return len(self.away)
+
+    def touch(self):
+        """Flags a modification of the table so cached representations are rebuilt"""
+        self.version += 1
+
+    def team_codes(self, labels):
+        codes = np.empty(len(labels), dtype=np.int64)
+        for i, label in enumerate(labels):
+            code = self.team_index.get(label)
+            if code is None:
+                code = len(self.teams)
+                self.team_index[label] = code
+                self.teams.append(label)
+            codes[i] = code
+        return codes
+
+    def result_codes(self, labels):
+        codes = np.empty(len(labels), dtype=np.int8)
+        for i, label in enumerate(labels):
+            if label is None:
+                codes[i] = NO_WINNER
+                continue
+            if label not in self.results:
+                self.results.append(label)
+            codes[i] = self.results.index(label)
+        return codes
+
+    def append(self, away, home, season, round, day, state=None, winner=None, keys=None, **extra):
+        """Appends a block of matches to the table.
+
+        Args:
+            away: Away team labels.
+            home: Home team labels.
+            season: Season of each match (or a single value for all of them).
+            round: Round of each match (or a single value for all of them).
+            day: Day of each match (or a single value for all of them).
+            state: State labels or codes. Active by default.
+            winner: Result labels. Not played by default.
+            keys: Edge keys of the matches. Row indexes by default.
+            **extra: Extra columns.
+
+        Returns:
+            np.ndarray: Row indexes of the new matches.
+        """
+        n_new = len(away)
+        first_row = len(self)
+        rows = np.arange(first_row, first_row + n_new)
+        self.away = np.concatenate([self.away, self.team_codes(list(away))])
+        self.home = np.concatenate([self.home, self.team_codes(list(home))])
+        self.season = _concat(self.season, season, n_new)
+        self.round = _concat(self.round, round, n_new)
+        self.day = _concat(self.day, day, n_new)
+        if state is None:
+            state_codes = np.full(n_new, STATE_CODES['active'], dtype=np.int8)
+        else:
+            state_codes = np.asarray(
+                [STATE_CODES.get(s, s) for s in state] if not isinstance(state, np.ndarray) else state,
+                dtype=np.int8
+            )
+        self.state = np.concatenate([self.state, state_codes])
+        winner_codes = np.full(n_new, NO_WINNER, dtype=np.int8) if winner is None else self.result_codes(winner)
+        self.winner = np.concatenate([self.winner, winner_codes])
+        self.key = np.concatenate([self.key, rows if keys is None else np.asarray(keys, dtype=np.int64)])
+        for tensor in [self.forecasts, self.odds, self.bets]:
+            tensor.resize(len(self))
+        for name, column in self.metrics.items():
+            self.metrics[name] = np.concatenate([column, np.full(n_new, None, dtype=object)])
+        for name in set(self.extra) | set(extra):
+            column = self.extra.get(name, np.full(first_row, None, dtype=object))
+            values = extra.get(name, np.full(n_new, None, dtype=object))
+            self.extra[name] = np.concatenate([column, np.asarray(values, dtype=object)])
+        self.touch()
+        return rows
+
+    def extend(self, table):
+        """Appends the matches of another table with their forecasts, odds, bets and metrics. Keys are row indexes.
+
+        Returns:
+            np.ndarray: Row indexes of the new matches.
+        """
+        rows = self.append(
+            table.labels(table.away), table.labels(table.home), table.season, table.round, table.day,
+            state=table.state, winner=[table.winner_label(row) for row in range(len(table))], **table.extra
+        )
+        for tensor, other in [(self.forecasts, table.forecasts), (self.odds, table.odds), (self.bets, table.bets)]:
+            for name in other.names:
+                tensor.set(name, other.get(name), rows=rows, outcomes=other.outcomes[name])
+        for name, column in table.metrics.items():
+            self.set_metric(name, rows, column)
+        return rows
+
+    def labels(self, codes):
+        return [self.teams[c] for c in codes]
+
+    def set_winner(self, rows, labels):
+        self.winner[rows] = self.result_codes(labels)
+        self.touch()
+
+    def set_outcomes(self, rows, outcome_indexes, outcomes):
+        """Writes results given as indexes into the <outcomes> labels list, -1 meaning not played"""
+        codes = np.append(self.result_codes(outcomes), NO_WINNER)
+        self.winner[rows] = codes[outcome_indexes]
+        self.touch()
+
+    def winner_label(self, row):
+        code = self.winner[row]
+        return None if code == NO_WINNER else self.results[code]
+
+    def set_metric(self, name, rows, values):
+        column = self.metrics.get(name)
+        if column is None:
+            column = self.metrics[name] = np.full(len(self), None, dtype=object)
+        if np.isscalar(rows):
+            column[rows] = values
+        else:
+            for row, value in zip(rows, values):
+                column[row] = value
+        self.touch()
+
+    def edge_order(self, nodes=None):
+        """Row indexes in the order the edges of to_graph(<nodes>) are iterated: by away team in node order, then by
+        home team in order of their first match, then by key"""
+        labels = list(dict.fromkeys(list(nodes if nodes is not None else {}) + self.teams))
+        node_position = {label: i for i, label in enumerate(labels)}
+        positions = np.array([node_position[team] for team in self.teams], dtype=np.int64)
+        away = positions[self.away]
+        _, first_row, pair = np.unique(
+            away * len(labels) + positions[self.home], return_index=True, return_inverse=True
+        )
+        return np.lexsort((self.key, first_row[pair.reshape(-1)], away))
+
+    def rows(self, season=None, active_only=False):
+        """Returns the row indexes of the matches of a season (all seasons if None)"""
+        mask = np.ones(len(self), dtype=bool)
+        if season is not None:
+            mask &= self.season == season
+        if active_only:
+            mask &= self.state == STATE_CODES['active']
+        return np.flatnonzero(mask)
+
+    def set_state(self, rows, states):
+        self.state[rows] = states
+        self.touch()
+
+    def schedule_attributes(self, row):
+        """Builds the attributes dictionary of a match without its forecasts, odds, bets and metrics"""
+        attributes = {}
+        for name, column in self.extra.items():
+            if column[row] is not None:
+                attributes[name] = column[row]
+        attributes['season'] = _scalar(self.season[row])
+        attributes['round'] = _scalar(self.round[row])
+        attributes['day'] = _scalar(self.day[row])
+        attributes['state'] = STATE_LABELS[self.state[row]]
+        return attributes
+
+    def edge_attributes(self, row):
+        """Builds the networkx-like attributes dictionary of a match"""
+        attributes = self.schedule_attributes(row)
+        if self.winner[row] != NO_WINNER:
+            attributes['winner'] = self.results[self.winner[row]]
+        for entity, tensor in [('forecasts', self.forecasts), ('odds', self.odds), ('bets', self.bets)]:
+            for name in tensor.names:
+                values = tensor.row(name, row)
+                if values is not None:
+                    entity_dict = attributes.setdefault(entity, {})
+                    if entity == 'forecasts':
+                        entity_dict[name] = SimpleForecast(outcomes=tensor.outcomes[name], probs=values)
+                    else:
+                        entity_dict[name] = values
+        for name, column in self.metrics.items():
+            if column[row] is not None:
+                attributes.setdefault('metrics', {})[name] = column[row]
+        return attributes
+
+    def edge(self, row):
+        return self.teams[self.away[row]], self.teams[self.home[row]], int(self.key[row]), self.edge_attributes(row)
+
+    def edges(self, rows=None):
+        rows = range(len(self)) if rows is None else rows
+        return [self.edge(row) for row in rows]
+
+    @classmethod
+    def from_graph(cls, graph: nx.MultiDiGraph, results=None, keep_keys=True):
+        """Builds a table out of a networkx multigraph in a single pass over its edges.
+
+        Edge keys are kept in the <key> column unless <keep_keys> is False, in which case row indexes are used.
+        """
+        table = cls(results)
+        table.team_codes(list(graph.nodes))
+        columns = {c: [] for c in ['away', 'home', 'season', 'round', 'day', 'state', 'winner', 'keys']}
+        entities = {'forecasts': {}, 'odds': {}, 'bets': {}}
+        outcomes = {}
+        metrics = {}
+        extra = {}
+        reserved = ['season', 'round', 'day', 'state', 'winner', 'forecasts', 'odds', 'bets', 'metrics']
+        for row, (away, home, key, attributes) in enumerate(graph.edges(keys=True, data=True)):
+            columns['away'].append(away)
+            columns['home'].append(home)
+            columns['season'].append(attributes.get('season', 0))
+            columns['round'].append(attributes.get('round', -1))
+            columns['day'].append(attributes.get('day', -1))
+            columns['state'].append(attributes.get('state', 'active'))
+            columns['winner'].append(attributes.get('winner', None))
+            columns['keys'].append(key)
+            for f_name, f in attributes.get('forecasts', {}).items():
+                entities['forecasts'].setdefault(f_name, {})[row] = f.probabilities
+                outcomes[f_name] = f.outcomes
+            for entity in ['odds', 'bets']:
+                for name, values in attributes.get(entity, {}).items():
+                    entities[entity].setdefault(name, {})[row] = values
+            for name, value in attributes.get('metrics', {}).items():
+                metrics.setdefault(name, {})[row] = value
+            for name, value in attributes.items():
+                if name not in reserved:
+                    extra.setdefault(name, {})[row] = value
+        n_matches = len(columns['away'])
+        table.append(
+            columns['away'], columns['home'], columns['season'], columns['round'], columns['day'],
+            state=columns['state'], winner=columns['winner'], keys=columns['keys'] if keep_keys else None,
+            **{name: [values.get(row) for row in range(n_matches)] for name, values in extra.items()}
+        )
+        for entity, tensor in [('forecasts', table.forecasts), ('odds', table.odds), ('bets', table.bets)]:
+            for name, values in entities[entity].items():
+                rows = np.fromiter(values.keys(), dtype=np.int64)
+                tensor.set(name, np.array([values[r] for r in rows], dtype=float), rows, outcomes.get(name))
+        for name, values in metrics.items():
+            table.set_metric(name, list(values.keys()), list(values.values()))
+        return table
+
+    @classmethod
+    def from_arrays(cls, teams, away, home, season, round, day, state, winner, key, results=None):
+        """Builds a table out of already encoded columns: <away> and <home> are indexes into <teams> and <winner>
+        codes are indexes into <results>.
+        """
+        table = cls(results)
+        table.teams = list(teams)
+        table.team_index = {label: code for code, label in enumerate(table.teams)}
+        table.away = np.asarray(away, dtype=np.int64)
+        table.home = np.asarray(home, dtype=np.int64)
+        table.season = _as_column(season, len(table.away))
+        table.round = _as_column(round, len(table.away))
+        table.day = _as_column(day, len(table.away))
+        table.state = np.asarray(state, dtype=np.int8)
+        table.winner = np.asarray(winner, dtype=np.int8)
+        table.key = np.asarray(key, dtype=np.int64)
+        for tensor in [table.forecasts, table.odds, table.bets]:
+            tensor.resize(len(table))
+        table.touch()
+        return table
+
+    def to_graph(self, nodes=None, read_only=False):
+        """Materializes the table as a networkx multigraph.
+
+        Node attribute dictionaries in <nodes> are shared with the graph, so node updates through the graph are kept.
+        A <read_only> graph is frozen and its edge attributes are ReadOnlyAttributes, so updates that would not reach
+        the table raise.
+        """
+        graph = nx.MultiDiGraph()
+        nodes = nodes if nodes is not None else {}
+        for label, attributes in nodes.items():
+            graph.add_node(label)
+            graph._node[label] = attributes
+        graph.add_nodes_from(self.teams)
+        edges = [
+            (self.teams[self.away[row]], self.teams[self.home[row]], int(self.key[row])) for row in range(len(self))
+        ]
+        if not read_only:
+            graph.add_edges_from(
+                (away, home, key, self.edge_attributes(row)) for row, (away, home, key) in enumerate(edges)
+            )
+            return graph
+        graph.add_edges_from(edges)
+        for row, (away, home, key) in enumerate(edges):
+            # The key dictionary is shared by the successors and predecessors adjacency
+            graph._adj[away][home][key] = ReadOnlyAttributes({
+                name: ReadOnlyAttributes(value) if isinstance(value, dict) else value
+                for name, value in self.edge_attributes(row).items()
+            })
+        return nx.freeze(graph)
+
+
+class MatchArrays:
+    """Schedule and results of a set of matches as aligned arrays.
+
+    Teams are positions in the <teams> list (node order of the network) and rounds are positions in the round values
+    of the network, -1 for rounds out of them.
+
+    Attributes:
+        teams (list): Node labels.
+        away (np.ndarray): Away team position of each match.
+        home (np.ndarray): Home team position of each match.
+        round (np.ndarray): Round position of each match.
+        day (np.ndarray): Day of each match.
+        active (np.ndarray): True for active matches.
+        winner (np.ndarray): Result label of each match, None if it has not been played.
+        extra (dict): Requested extra attributes of each match.
+        season (np.ndarray): Season of each match.
+        key (np.ndarray): Edge key of each match, its row in columnar networks.
+    """
+
+    def __init__(self, teams, away, home, round, day, active, winner, extra=None, season=None, key=None):
+        self.teams = teams
+        self.away = np.asarray(away, dtype=np.int64)
+        self.home = np.asarray(home, dtype=np.int64)
+        self.round = np.asarray(round, dtype=np.int64)
+        self.day = np.asarray(day)
+        self.active = np.asarray(active, dtype=bool)
+        self.winner = np.asarray(winner, dtype=object)
+        self.extra = extra if extra is not None else {}
+        self.season = np.asarray(season) if season is not None else np.zeros(len(self.away), dtype=np.int64)
+        self.key = np.asarray(key) if key is not None else np.arange(len(self.away))
+
+    def __len__(self):
+        return len(self.away)
+
+    def select(self, mask):
+        return MatchArrays(
+            self.teams, self.away[mask], self.home[mask], self.round[mask], self.day[mask], self.active[mask],
+            self.winner[mask], {name: values[mask] for name, values in self.extra.items()}, self.season[mask],
+            self.key[mask]
+        )
@@ -1,5 +1,3 @@
-import random
-
 from dfg_rating.model.network.simple_network import RoundRobinNetwork
 from dfg_rating.model.rating.base_rating import BaseRating
 from dfg_rating.model.rating.ranking_rating import LeagueRating
@@ -34,6 +32,7 @@ class LeagueNetwork(RoundRobinNetwork):
             self.create_data()
 
     def create_data(self):
+        schedule = self.generator('schedule')
         for season in range(self.seasons):
             # Create the new season matches
             print("Season", season)
@@ -45,11 +44,13 @@ class LeagueNetwork(RoundRobinNetwork):
             self.play_sub_network(season_games)
             # Add league ranking to the teams with this new season
             self.add_rating(self.ranking_rating, 'ranking', season=season)
-            promoted_items = random.sample(range(self.out_teams), self.league_promotion)
+            promoted_items = schedule.choice(self.out_teams, self.league_promotion, replace=False)
             self.promoted_teams = [self.out_teams_labels[promoted_items[i]] for i in range(self.league_promotion)]
             relegation_candidates = self.get_teams(ascending=True, maximum_number_of_teams=6, season=season)
             # print(f"Relegation candidates {relegation_candidates}")
-            relegation_teams = random.sample(list(relegation_candidates.keys()), self.league_promotion)
+            relegation_teams = schedule.choice(
+                list(relegation_candidates.keys()), self.league_promotion, replace=False
+            ).tolist()
             # print(f"Relegation teams {relegation_teams}")
             for i in range(len(self.promoted_teams)):
                 for k, v in self.league_teams_labels.items():
@@ -59,8 +60,8 @@ class LeagueNetwork(RoundRobinNetwork):
                         self.out_teams_labels.append(v)
 
     def all_teams_have_rating(self, rating_key):
-        return all(rating_key in self.data.nodes[n].get('ratings', {}) for n in self.data.nodes)
+        return all(rating_key in self.node_attributes[n].get('ratings', {}) for n in self.node_attributes)
 
-    def play(self):
+    def play(self, batch=True):
         print("Multiple seasons is played when creating data")
         pass
@@ -0,0 +1,279 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dfg_rating.model.network.match_table import MatchTable
+
+NETWORK_FILE = 'network.json'
+NODES_FILE = 'nodes.parquet'
+RATINGS_FILE = 'ratings.parquet'
+MATCHES_DIRECTORY = 'matches'
+INACTIVE_MATCHES_FILE = 'inactive_matches.parquet'
+ENTITIES = ['forecasts', 'odds', 'bets']
+COMPRESSION = 'zstd'
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def _arrow_column(values):
+    """Typed arrow array of a list of values. Values not sharing a type are kept as JSON text.
+
+    Returns:
+        Tuple[pa.Array, bool]: The array and whether it holds JSON text.
+    """
+    try:
+        return pa.array(values), False
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return pa.array(
+            [None if v is None else json.dumps(v, default=_json_default) for v in values], type=pa.string()
+        ), True
+
+
+def _python_values(column, is_json):
+    if is_json:
+        return [None if v is None else json.loads(v) for v in column.to_pylist()]
+    if pa.types.is_timestamp(column.type):
+        return [None if v is None else pd.Timestamp(v) for v in column.to_pylist()]
+    return column.to_pylist()
+
+
+def _object_column(values):
+    column = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        column[i] = value
+    return column
+
+
+def _numpy_column(column, is_json):
+    """Numeric columns as numpy arrays (zero-copy when possible), any other column as an object array"""
+    if (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)) and column.null_count == 0:
+        return column.to_numpy()
+    return _object_column(_python_values(column, is_json))
+
+
+def _write_table(columns, json_columns, path):
+    table = pa.table({name: array for name, (array, is_json) in columns.items()})
+    json_columns.extend(name for name, (array, is_json) in columns.items() if is_json)
+    pq.write_table(table, path, compression=COMPRESSION)
+    return table
+
+
+def _match_columns(table: MatchTable, positions):
+    """Arrow columns of the matches of a table, with teams as the node <positions> of the table teams.
+
+    Returns:
+        Tuple[dict, dict]: (array, is_json) pair of each column and outcome labels of each forecast, odds and bets
+        entry by entity.
+    """
+    match_columns = {
+        'row': (pa.array(np.arange(len(table), dtype=np.int64)), False),
+        'away': (pa.array(positions[table.away]), False),
+        'home': (pa.array(positions[table.home]), False),
+        'season': _arrow_column(table.season.tolist()),
+        'round': _arrow_column(table.round.tolist()),
+        'day': _arrow_column(table.day.tolist()),
+        'state': (pa.array(table.state), False),
+        'winner': (pa.array(table.winner), False),
+        'key': (pa.array(table.key), False)
+    }
+    outcomes = {}
+    for entity, tensor in zip(ENTITIES, [table.forecasts, table.odds, table.bets]):
+        for name in tensor.names:
+            outcomes.setdefault(entity, {})[name] = tensor.outcomes[name]
+            values = tensor.get(name)
+            for i in range(values.shape[1]):
+                match_columns[f"{entity}#{name}#{i}"] = (pa.array(values[:, i]), False)
+    for name, column in table.metrics.items():
+        match_columns[f"metrics#{name}"] = _arrow_column(column.tolist())
+    for name, column in table.extra.items():
+        match_columns[f"extra#{name}"] = _arrow_column(column.tolist())
+    return match_columns, outcomes
+
+
+def write_network(path, info, nodes, table: MatchTable, inactive: MatchTable = None):
+    """Writes a network as a directory of typed columnar tables.
+
+    <path>/network.json holds the network parameters, outcome labels and team results labels.
+    <path>/nodes.parquet holds one row per node with its attributes, ratings apart.
+    <path>/ratings.parquet holds one row per rating, node and season with the list of values of each round.
+    <path>/matches/ holds one parquet file per season with one row per match. Teams are node positions, results
+    are indexes into the results labels and forecasts, odds and bets are one float column per outcome.
+    <path>/inactive_matches.parquet holds the matches kept apart as inactive, with the same columns.
+
+    Args:
+        path: Directory to write to.
+        info: Network level parameters.
+        nodes: Mapping of node labels to node attributes.
+        table: Matches of the network.
+        inactive: Matches kept apart as inactive, if any.
+    """
+    os.makedirs(os.path.join(path, MATCHES_DIRECTORY), exist_ok=True)
+    json_columns = {}
+    inactive = inactive if inactive is not None else MatchTable()
+    labels = list(dict.fromkeys(list(nodes) + table.teams + inactive.teams))
+    node_position = {label: i for i, label in enumerate(labels)}
+    # Nodes
+    node_columns = {'node': _arrow_column(labels)}
+    attribute_names = {}
+    for label in labels:
+        attribute_names.update(dict.fromkeys(a for a in nodes.get(label, {}) if a != 'ratings'))
+    for attribute in attribute_names:
+        node_columns[f"attribute#{attribute}"] = _arrow_column(
+            [nodes.get(label, {}).get(attribute) for label in labels]
+        )
+    _write_table(node_columns, json_columns.setdefault(NODES_FILE, []), os.path.join(path, NODES_FILE))
+    # Ratings
+    rating_rows = {'rating_name': [], 'node': [], 'season': [], 'values': [], 'hyper_parameters': []}
+    for label in labels:
+        node_ratings = nodes.get(label, {}).get('ratings', {})
+        for rating_name, rating_seasons in node_ratings.items():
+            if rating_name == 'hyper_parameters':
+                continue
+            for season, values in rating_seasons.items():
+                hyper_parameters = node_ratings.get('hyper_parameters', {}).get(rating_name, {}).get(season)
+                rating_rows['rating_name'].append(rating_name)
+                rating_rows['node'].append(node_position[label])
+                rating_rows['season'].append(season)
+                rating_rows['values'].append(np.asarray(values, dtype=float))
+                rating_rows['hyper_parameters'].append(
+                    None if hyper_parameters is None else json.dumps(hyper_parameters, default=_json_default)
+                )
+    lengths = np.array([len(v) for v in rating_rows['values']], dtype=np.int32)
+    rating_columns = {
+        'rating_name': (pa.array(rating_rows['rating_name'], type=pa.string()).dictionary_encode(), False),
+        'node': (pa.array(rating_rows['node'], type=pa.int32()), False),
+        'season': _arrow_column(rating_rows['season']),
+        'values': (pa.ListArray.from_arrays(
+            pa.array(np.concatenate([[0], np.cumsum(lengths)]).astype(np.int32)),
+            pa.array(np.concatenate(rating_rows['values'] or [np.empty(0)]), type=pa.float64())
+        ), False),
+        'hyper_parameters': (pa.array(rating_rows['hyper_parameters'], type=pa.string()), False)
+    }
+    _write_table(rating_columns, json_columns.setdefault(RATINGS_FILE, []), os.path.join(path, RATINGS_FILE))
+    # Matches
+    positions = np.array([node_position[t] for t in table.teams], dtype=np.int32)
+    match_columns, outcomes = _match_columns(table, positions)
+    matches = pa.table({name: array for name, (array, is_json) in match_columns.items()})
+    json_columns[MATCHES_DIRECTORY] = [name for name, (array, is_json) in match_columns.items() if is_json]
+    seasons = list(dict.fromkeys(table.season.tolist()))
+    season_index = {season: i for i, season in enumerate(seasons)}
+    season_codes = np.array([season_index[s] for s in table.season.tolist()], dtype=np.int64)
+    for old_file in os.listdir(os.path.join(path, MATCHES_DIRECTORY)):
+        if old_file.endswith('.parquet'):
+            os.remove(os.path.join(path, MATCHES_DIRECTORY, old_file))
+    for season_i in range(len(seasons)):
+        pq.write_table(
+            matches.take(pa.array(np.flatnonzero(season_codes == season_i))),
+            os.path.join(path, MATCHES_DIRECTORY, f"season_{season_i:04d}.parquet"),
+            compression=COMPRESSION
+        )
+    if len(seasons) == 0:
+        pq.write_table(matches, os.path.join(path, MATCHES_DIRECTORY, "season_0000.parquet"), compression=COMPRESSION)
+    # Inactive matches
+    inactive_positions = np.array([node_position[t] for t in inactive.teams], dtype=np.int32)
+    inactive_columns, inactive_outcomes = _match_columns(inactive, inactive_positions)
+    _write_table(
+        inactive_columns, json_columns.setdefault(INACTIVE_MATCHES_FILE, []), os.path.join(path, INACTIVE_MATCHES_FILE)
+    )
+    with open(os.path.join(path, NETWORK_FILE), 'w') as network_file:
+        json.dump({
+            **info,
+            "results": table.results,
+            "outcomes": outcomes,
+            "inactive_results": inactive.results,
+            "inactive_outcomes": inactive_outcomes,
+            "json_columns": json_columns
+        }, network_file, default=_json_default)
+
+
+def read_network_info(path):
+    with open(os.path.join(path, NETWORK_FILE)) as network_file:
+        return json.load(network_file)
+
+
+def read_network(path):
+    """Reads a network written by write_network. Files are memory mapped and numeric match columns are taken from
+    the arrow buffers without conversion.
+
+    Returns:
+        Tuple[dict, dict, list, MatchTable, MatchTable]: Network parameters, node attributes, (rating_name, node,
+        season, values, hyper_parameters) rating rows, matches and inactive matches.
+    """
+    info = read_network_info(path)
+    json_columns = info['json_columns']
+    # Nodes
+    node_table = pq.read_table(os.path.join(path, NODES_FILE), memory_map=True)
+    labels = _python_values(node_table.column('node'), 'node' in json_columns[NODES_FILE])
+    nodes = {label: {} for label in labels}
+    for name in node_table.column_names:
+        if name.startswith('attribute#'):
+            values = _python_values(node_table.column(name), name in json_columns[NODES_FILE])
+            for label, value in zip(labels, values):
+                if value is not None:
+                    nodes[label][name[len('attribute#'):]] = value
+    # Ratings
+    rating_table = pq.read_table(os.path.join(path, RATINGS_FILE), memory_map=True)
+    values = rating_table.column('values').combine_chunks()
+    flat_values = values.flatten().to_numpy(zero_copy_only=False)
+    offsets = values.offsets.to_numpy()
+    seasons = _python_values(rating_table.column('season'), 'season' in json_columns[RATINGS_FILE])
+    ratings = [
+        (
+            rating_name, labels[node], season, flat_values[start:end],
+            None if hyper_parameters is None else json.loads(hyper_parameters)
+        ) for rating_name, node, season, start, end, hyper_parameters in zip(
+            rating_table.column('rating_name').to_pylist(), rating_table.column('node').to_numpy(), seasons,
+            offsets[:-1], offsets[1:], rating_table.column('hyper_parameters').to_pylist()
+        )
+    ]
+    # Matches
+    matches = pq.read_table(os.path.join(path, MATCHES_DIRECTORY), memory_map=True)
+    table = _read_matches(matches, labels, info['results'], info['outcomes'], json_columns[MATCHES_DIRECTORY])
+    inactive_path = os.path.join(path, INACTIVE_MATCHES_FILE)
+    if os.path.exists(inactive_path):
+        inactive = _read_matches(
+            pq.read_table(inactive_path, memory_map=True), labels, info['inactive_results'],
+            info['inactive_outcomes'], json_columns[INACTIVE_MATCHES_FILE]
+        )
+    else:
+        inactive = MatchTable()
+    return info, nodes, ratings, table, inactive
+
+
+def _read_matches(matches, labels, results, outcomes, match_json):
+    """Match table out of the arrow table of matches written by write_network"""
+    rows = matches.column('row').to_numpy()
+    if np.any(np.diff(rows) < 0):
+        matches = matches.take(pa.array(np.argsort(rows, kind='stable')))
+    columns = {name: _numpy_column(matches.column(name), name in match_json) for name in ['season', 'round', 'day']}
+    table = MatchTable.from_arrays(
+        labels,
+        matches.column('away').to_numpy(), matches.column('home').to_numpy(),
+        columns['season'], columns['round'], columns['day'],
+        matches.column('state').to_numpy(), matches.column('winner').to_numpy(), matches.column('key').to_numpy(),
+        results=results
+    )
+    for entity, tensor in zip(ENTITIES, [table.forecasts, table.odds, table.bets]):
+        for name, entity_outcomes in outcomes.get(entity, {}).items():
+            tensor.set(
+                name,
+                np.column_stack([
+                    matches.column(f"{entity}#{name}#{i}").to_numpy() for i in range(len(entity_outcomes))
+                ]),
+                outcomes=entity_outcomes
+            )
+    for name in matches.column_names:
+        for prefix, target in [('metrics#', table.metrics), ('extra#', table.extra)]:
+            if name.startswith(prefix):
+                target[name[len(prefix):]] = _object_column(_python_values(matches.column(name), name in match_json))
+    return table
@@ -1,11 +1,27 @@
-import random
-import networkx as nx
 import numpy as np
-from networkx import DiGraph
 
 from dfg_rating.model.network.simple_network import RoundRobinNetwork
 
 
+def chung_lu_pairs(weights, random_number_generator):
+    """Samples an undirected graph with expected degrees <weights> without self-loops (Chung-Lu model).
+
+    Each pair (u, v) is linked independently with probability min(w_u * w_v / sum(w), 1), as in
+    nx.expected_degree_graph, with all the pairs drawn in a single call.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Positions u < v of the linked pairs.
+    """
+    weights = np.asarray(weights, dtype=float)
+    total = weights.sum()
+    u, v = np.triu_indices(len(weights), k=1)
+    if total == 0:
+        return u[:0], v[:0]
+    probabilities = np.minimum(weights[u] * weights[v] / total, 1)
+    linked = random_number_generator.random(len(u)) < probabilities
+    return u[linked], v[linked]
+
+
 class RandomNetwork(RoundRobinNetwork):
     """
     Chooses each of the possible [n(n-1)]/2 edges with probability p.
@@ -15,13 +31,8 @@ class RandomNetwork(RoundRobinNetwork):
         self.edge_probability = kwargs.get("edge_probability", 1)
         super().__init__(**kwargs)
 
-    def fill_graph(self, team_labels=None, season=0):
-        super().fill_graph(team_labels, season)
-        for u in range(self.n_teams):
-            for v in range(self.n_teams):
-                if u != v:
-                    self.data.edges[u, v, 0][
-                        'state'] = 'active' if random.random() < self.edge_probability else 'inactive'
+    def match_states(self, away, home, rounds):
+        return self.generator('schedule').random(len(away)) < self.edge_probability
 
 
 class RandomRoundsNetwork(RoundRobinNetwork):
@@ -30,17 +41,10 @@ class RandomRoundsNetwork(RoundRobinNetwork):
         self.absolute_rounds = kwargs.get("absolute_rounds", 1)
         super().__init__(**kwargs)
 
-    def fill_graph(self, team_labels=None, season=0):
-        super().fill_graph(team_labels, season)
-        selected_rounds = np.random.choice(self.n_rounds * 2, self.absolute_rounds, replace=False)
-        # print("selected rounds: ", selected_rounds)
-        for u in range(self.n_teams):
-            for v in range(self.n_teams):
-                if u != v:
-                    edge_round = self.data.edges[u, v, season]['round']
-                    self.data.edges[u, v, season][
-                        'state'] = 'active' if edge_round in selected_rounds else 'inactive'
+    def match_states(self, away, home, rounds):
+        selected_rounds = self.generator('schedule').choice(self.n_rounds * 2, self.absolute_rounds, replace=False)
         print("Activation of rounds finished")
+        return np.isin(rounds, selected_rounds)
 
 
 class ConfigurationModelNetwork(RoundRobinNetwork):
@@ -49,34 +53,34 @@ class ConfigurationModelNetwork(RoundRobinNetwork):
     without self-loops.
     """
 
-    def __init__(self, random_number_generator = np.random.default_rng(), **kwargs):
+    def __init__(self, **kwargs):
         self.expected_matches = kwargs.get("expected_matches")
         self.variance_matches = kwargs.get("variance_matches", 0)
-        self.random_number_generator = random_number_generator
         super().__init__(**kwargs)
 
-    def fill_graph(self, team_labels=None, season=0):
-        super().fill_graph(team_labels, season)
+    def match_states(self, away, home, rounds):
         degree_sequence = self.create_degree_sequence(self.expected_matches, self.variance_matches)
         print("Seq", degree_sequence)
-        directed_conf_model = nx.expected_degree_graph(degree_sequence, selfloops=False)
-        for match in self.data.edges(keys=True):
-            if directed_conf_model.has_edge(match[0], match[1]):
-                self.data.edges[match]["state"] = "active"
-            else:
-                self.data.edges[match]["state"] = "inactive"
+        u, v = chung_lu_pairs(degree_sequence, self.generator('schedule'))
+        # Both legs of a linked pair are played
+        adjacency = np.zeros([self.n_teams, self.n_teams], dtype=bool)
+        adjacency[u, v] = True
+        adjacency[v, u] = True
+        return adjacency[away, home]
 
     def create_degree_sequence(self, expected, variance, total_sum=None):
-        sequence = self.random_number_generator.integers(
+        schedule = self.generator('schedule')
+        sequence = schedule.integers(
             low=(expected - variance) if expected >= variance else 0,
             high=expected + variance,
             size=self.n_teams
         ) if variance > 0 else np.array([expected] * self.n_teams)
         if total_sum is not None:
-            while sequence.sum() != total_sum:
-                diff = total_sum - sequence.sum()
-                random_index = np.random.randint(low=0, high=len(sequence))
-                sequence[random_index] += 1 if diff > 0 else -1
+            # Spreads the difference one unit at a time over uniformly chosen teams, all at once
+            diff = total_sum - sequence.sum()
+            sequence = sequence + np.sign(diff) * schedule.multinomial(
+                abs(diff), np.full(len(sequence), 1 / len(sequence))
+            )
         return sequence
 
 
@@ -88,13 +92,7 @@ class ClusteredNetwork(RoundRobinNetwork):
         self.out_probability = kwargs.get("out_probability", 0.5)
         super().__init__(**kwargs)
 
-    def fill_graph(self, team_labels=None, season=0):
-        super().fill_graph(team_labels, season)
-        for u in range(self.n_teams):
-            for v in range(self.n_teams):
-                if u != v:
-                    u_cluster = u % self.number_of_clusters
-                    v_cluster = v % self.number_of_clusters
-                    edge_probability = self.in_probability if u_cluster == v_cluster else self.out_probability
-                    self.data.edges[u, v, 0][
-                        'state'] = 'active' if random.random() < edge_probability else 'inactive'
+    def match_states(self, away, home, rounds):
+        same_cluster = (away % self.number_of_clusters) == (home % self.number_of_clusters)
+        edge_probability = np.where(same_cluster, self.in_probability, self.out_probability)
+        return self.generator('schedule').random(len(away)) < edge_probability
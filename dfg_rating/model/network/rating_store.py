@@ -0,0 +1,180 @@
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class RatingStore:
+    """Ratings of the teams of a network in a single (n_ratings x n_seasons x n_teams x n_rounds) array.
+
+    Ratings, seasons and teams are indexed by their position in the <names>, <seasons> and <teams> lists, so a value
+    is looked up in O(1) by (rating, season, team, round). Each (rating, season, team) entry keeps its number of
+    values in <lengths>, -1 when the team has no rating for that season. The array grows by doubling its capacity and
+    is kept in a np.memmap file when a <path> is given.
+
+    The nodes of the network expose the ratings of their team as a read-only {rating_name: {season: values}} view
+    (see TeamRatings), with the hyper parameters under 'hyper_parameters'. Views resolve their keys through the
+    <entries> index, so they cost a dictionary lookup and an array slice.
+
+    Attributes:
+        path (str): File backing the values array, in memory if None.
+        names (list): Rating names.
+        seasons (list): Season labels.
+        teams (list): Team labels.
+        values (np.ndarray): Rating values, NaN padded.
+        lengths (np.ndarray): Number of values of each (rating, season, team) entry.
+        entries (dict): Number of values per team, rating name and season.
+        hyper_parameters (dict): Hyper parameters per team, rating name and season.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.names, self.name_index = [], {}
+        self.seasons, self.season_index = [], {}
+        self.teams, self.team_index = [], {}
+        self.values = np.empty((0, 0, 0, 0))
+        self.lengths = np.empty((0, 0, 0), dtype=np.int32)
+        self.entries = {}
+        self.hyper_parameters = {}
+
+    def __contains__(self, rating_name):
+        return rating_name in self.name_index
+
+    @staticmethod
+    def _code(labels, index, label):
+        code = index.get(label)
+        if code is None:
+            code = len(labels)
+            index[label] = code
+            labels.append(label)
+        return code
+
+    def _reserve(self, width):
+        """Grows the arrays to hold the current names, seasons and teams and <width> values per entry"""
+        needed = (len(self.names), len(self.seasons), len(self.teams), width)
+        capacity = self.values.shape
+        if all(n <= c for n, c in zip(needed, capacity)):
+            return
+        shape = tuple(max(n, 2 * c) if n > c else c for n, c in zip(needed[:3], capacity[:3])) + (
+            max(width, capacity[3]),
+        )
+        if self.path is None:
+            values = np.full(shape, np.nan)
+        else:
+            grow_path = f"{self.path}.grow"
+            values = np.memmap(grow_path, dtype=np.float64, mode='w+', shape=shape)
+            values[:] = np.nan
+        values[:capacity[0], :capacity[1], :capacity[2], :capacity[3]] = self.values
+        lengths = np.full(shape[:3], -1, dtype=np.int32)
+        lengths[:capacity[0], :capacity[1], :capacity[2]] = self.lengths
+        if self.path is not None:
+            values.flush()
+            os.replace(grow_path, self.path)
+        self.values = values
+        self.lengths = lengths
+
+    def set(self, rating_name, season, teams, values):
+        """Writes the ratings of a season for a list of teams.
+
+        Args:
+            rating_name: Rating name.
+            season: Season label.
+            teams: Team labels.
+            values: (n_teams x n_values) values, a single row for a single team.
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[None, :]
+        r = self._code(self.names, self.name_index, rating_name)
+        s = self._code(self.seasons, self.season_index, season)
+        t = np.array([self._code(self.teams, self.team_index, team) for team in teams], dtype=np.int64)
+        width = values.shape[1]
+        self._reserve(width)
+        self.values[r, s, t, :width] = values
+        self.values[r, s, t, width:] = np.nan
+        self.lengths[r, s, t] = width
+        for team in teams:
+            self.entries.setdefault(team, {}).setdefault(rating_name, {})[season] = width
+
+    def set_hyper_parameters(self, rating_name, season, team, hyper_parameters):
+        self.hyper_parameters.setdefault(team, {}).setdefault(rating_name, {})[season] = hyper_parameters
+
+    def get(self, rating_name, season, team):
+        """Read-only view of the ratings of a team in a season"""
+        length = self.entries[team][rating_name][season]
+        values = self.values[self.name_index[rating_name], self.season_index[season], self.team_index[team], :length]
+        values.flags.writeable = False
+        return values
+
+    def value(self, rating_name, season, team, round_index):
+        length = self.entries[team][rating_name][season]
+        if not -length <= round_index < length:
+            raise IndexError(round_index)
+        round_index = round_index % length
+        return self.values[self.name_index[rating_name], self.season_index[season], self.team_index[team], round_index]
+
+    def matrix(self, rating_name, season, teams, width):
+        """(len(teams) x width) ratings of a season, NaN for the teams or rounds without rating"""
+        matrix = np.full([len(teams), width], np.nan)
+        if (rating_name not in self.name_index) or (season not in self.season_index):
+            return matrix
+        r = self.name_index[rating_name]
+        s = self.season_index[season]
+        positions = np.array([self.team_index.get(team, -1) for team in teams], dtype=np.int64)
+        known = positions >= 0
+        copied = min(width, self.values.shape[3])
+        matrix[known, :copied] = self.values[r, s, positions[known], :copied]
+        absent = np.zeros(len(teams), dtype=bool)
+        absent[known] = self.lengths[r, s, positions[known]] < 0
+        matrix[absent] = np.nan
+        return matrix
+
+    def team_view(self, team):
+        return TeamRatings(self, team)
+
+
+class TeamRatings(Mapping):
+    """Read-only {rating_name: {season: values}} view of the ratings of a team in a RatingStore"""
+
+    def __init__(self, store: RatingStore, team):
+        self.store = store
+        self.team = team
+
+    def __getitem__(self, rating_name):
+        if rating_name == 'hyper_parameters':
+            return self.store.hyper_parameters[self.team]
+        if rating_name not in self.store.entries.get(self.team, {}):
+            raise KeyError(rating_name)
+        return TeamSeasonRatings(self.store, rating_name, self.team)
+
+    def __iter__(self):
+        yield from self.store.entries.get(self.team, {})
+        if self.team in self.store.hyper_parameters:
+            yield 'hyper_parameters'
+
+    def __len__(self):
+        return len(self.store.entries.get(self.team, {})) + (self.team in self.store.hyper_parameters)
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class TeamSeasonRatings(Mapping):
+    """Read-only {season: values} view of one rating of a team in a RatingStore"""
+
+    def __init__(self, store: RatingStore, rating_name, team):
+        self.store = store
+        self.rating_name = rating_name
+        self.team = team
+
+    def __getitem__(self, season):
+        return self.store.get(self.rating_name, season, self.team)
+
+    def __iter__(self):
+        return iter(self.store.entries[self.team][self.rating_name])
+
+    def __len__(self):
+        return len(self.store.entries[self.team][self.rating_name])
+
+    def __repr__(self):
+        return repr(dict(self.items()))
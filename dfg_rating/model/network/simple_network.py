@@ -1,16 +1,48 @@
 import math
 import numpy as np
-from copy import deepcopy
 
 import networkx as nx
 
 from dfg_rating.model.betting.betting import BaseBetting
 from dfg_rating.model.bookmaker.base_bookmaker import BaseBookmaker
 from dfg_rating.model.forecast.base_forecast import BaseForecast
-from dfg_rating.model.network.base_network import BaseNetwork, get_seasons
+from dfg_rating.model.network.base_network import BaseNetwork, SeasonFilter, get_seasons
 from dfg_rating.model.rating.base_rating import BaseRating
 
 
+def berger_schedule(number_of_teams, number_of_rounds, games_per_round, days_between_rounds):
+    """Double round-robin schedule of the Berger tables (circle method) as arrays.
+
+    Team 0 is fixed and the other teams, with a bye (-1) when their number is odd, rotate one position per round
+    around the circle teams[1:games_per_round] + reversed(teams[games_per_round:]). Each game of the first half of the
+    season is followed by its return game, <number_of_rounds> rounds later with the home team swapped.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Away team, home team, round and day of each match.
+    """
+    teams = np.arange(number_of_teams + number_of_teams % 2)
+    teams[number_of_teams:] = -1
+    circle = np.concatenate([teams[1:games_per_round], teams[games_per_round:][::-1]])
+    n_games = min(games_per_round, len(teams) - games_per_round)
+    season_rounds = np.arange(number_of_rounds)
+    # Position of the circle at each round (rows) and slot (columns) after rotating it <round> times
+    rotated = circle[(np.arange(len(circle))[None, :] - season_rounds[:, None]) % len(circle)]
+    slice_a = np.column_stack([np.full(number_of_rounds, teams[0]), rotated[:, :games_per_round - 1]])[:, :n_games]
+    slice_b = rotated[:, games_per_round - 1:][:, ::-1][:, :n_games]
+    even = (season_rounds % 2 == 0)[:, None]
+    first_away = np.where(even, slice_a, slice_b)
+    first_home = np.where(even, slice_b, slice_a)
+    first_day = np.broadcast_to(1 + season_rounds[:, None] * days_between_rounds, first_away.shape)
+    first_round = np.broadcast_to(season_rounds[:, None], first_away.shape)
+    played = (slice_a != -1) & (slice_b != -1)
+    # Each game followed by its return game
+    away = np.stack([first_away, first_home], axis=-1)[played]
+    home = np.stack([first_home, first_away], axis=-1)[played]
+    rounds = np.stack([first_round, first_round + number_of_rounds], axis=-1)[played]
+    days = np.stack([first_day, first_day + number_of_rounds * days_between_rounds], axis=-1)[played]
+    return away.reshape(-1), home.reshape(-1), rounds.reshape(-1), days.reshape(-1)
+
+
 class RoundRobinNetwork(BaseNetwork):
     """Class that defines a Network modeling a Round-Robin tournamnet (all-play-all tournament).
     A competition in which each contestant meets all other contestants in turn)
@@ -34,7 +66,11 @@ class RoundRobinNetwork(BaseNetwork):
                 """
         if team_labels is None:
             team_labels = {}
-        if self.data is None:
+        if self.matches is not None:
+            graph = None
+            for t in range(self.n_teams):
+                self._nodes.setdefault(t, {})
+        elif self.data is None:
             graph = nx.MultiDiGraph()
             graph.add_nodes_from([t for t in range(self.n_teams)])
         else:
@@ -47,49 +83,20 @@ class RoundRobinNetwork(BaseNetwork):
             number_of_rounds = number_of_teams - 1 + number_of_teams % 2
 
         n_games_per_round = self.params.get('games_per_round', int(math.ceil(number_of_teams / 2)))
-        teams_list = [t for t in range(0, number_of_teams)]
-        if number_of_teams % 2 != 0:
-            teams_list.append(-1)
-        slice_a = teams_list[0:n_games_per_round]
-        slice_b = teams_list[n_games_per_round:]
-        fixed = teams_list[0]
-        day = 1
-        for season_round in range(0, number_of_rounds):
-            for game in range(0, n_games_per_round):
-                if (slice_a[game] != -1) and (slice_b[game] != -1):
-                    if season_round % 2 == 0:
-                        graph.add_edge(
-                            team_labels.get(slice_a[game], slice_a[game]),
-                            team_labels.get(slice_b[game], slice_b[game]),
-                            season=season, round=season_round, day=day
-                        )
-                        graph.add_edge(
-                            team_labels.get(slice_b[game], slice_b[game]),
-                            team_labels.get(slice_a[game], slice_a[game]),
-                            season=season, round=season_round + number_of_rounds,
-                            day=day + (number_of_rounds * self.days_between_rounds)
-                        )
-                    else:
-                        graph.add_edge(
-                            team_labels.get(slice_b[game], slice_b[game]),
-                            team_labels.get(slice_a[game], slice_a[game]),
-                            season=season, round=season_round, day=day
-                        )
-                        graph.add_edge(
-                            team_labels.get(slice_a[game], slice_a[game]),
-                            team_labels.get(slice_b[game], slice_b[game]),
-                            season=season, round=season_round + number_of_rounds,
-                            day=day + (number_of_rounds * self.days_between_rounds)
-                        )
-
-            day += self.days_between_rounds
-            rotate = slice_a[-1]
-            slice_a = [fixed, slice_b[0]] + slice_a[1:-1]
-            slice_b = slice_b[1:] + [rotate]
+        away, home, rounds, days = berger_schedule(
+            number_of_teams, number_of_rounds, n_games_per_round, self.days_between_rounds
+        )
+        labels = np.array([team_labels.get(t, t) for t in range(number_of_teams)])
+        away, home = labels[away], labels[home]
+        self._append_matches(graph, away, home, season, rounds, days, self.match_states(away, home, rounds))
         self.network_info.setdefault(str(season), {})["teams_playing"] = {k: v for k, v in team_labels.items()}
-        if self.data is None:
+        if self.matches is None and self.data is None:
             self.data = graph
 
+    def match_states(self, away, home, rounds):
+        """Active mask of a season of scheduled matches, None when all of them are active"""
+        return None
+
     def create_data(self):
         self.fill_graph()
         self.add_rating(self.true_rating, 'true_rating', season=0)
@@ -98,6 +105,9 @@ class RoundRobinNetwork(BaseNetwork):
 
     def add_rating(self, rating: BaseRating, rating_name, team_id=None, season=None):
         print(season)
+        self._seed_component(rating, 'true_rating' if rating_name == 'true_rating' else 'rating')
+        if team_id is None:
+            self._record('rating', rating_name, rating, season=season)
         if season is not None:
             self.add_season_rating(rating, rating_name, team_id, season)
         else:
@@ -105,8 +115,7 @@ class RoundRobinNetwork(BaseNetwork):
                 self.add_season_rating(rating, rating_name, team_id, s)
 
     def add_season_rating(self, rating, rating_name, team_id, season):
-        def edge_filter(e):
-            return e[3]['season'] == season
+        edge_filter = SeasonFilter(season)
 
         if team_id:
             rating_values, rating_hp = rating.get_ratings(
@@ -116,42 +125,33 @@ class RoundRobinNetwork(BaseNetwork):
         else:
             print(self)
             ratings, rating_hp = rating.get_all_ratings(self, edge_filter=edge_filter, season=season)
-            for team in self.data.nodes:
-                self._add_rating_to_team(int(team), ratings[int(team)], rating_hp, rating_name, season=season)
+            self._store_season_ratings(rating, ratings, rating_hp, rating_name, season)
+
+    def _store_season_ratings(self, rating, ratings, rating_hyperparameters, rating_name, season):
+        teams = [int(team) for team in self.node_attributes]
+        for layer_name, layer in self._rating_layers(rating, ratings, rating_name):
+            self._add_ratings(teams, np.asarray(layer)[teams], rating_hyperparameters, layer_name, season=season)
 
     def add_forecast(self, forecast: BaseForecast, forecast_name, base_ranking='true_rating', season=None):
+        self._seed_component(forecast, 'forecast_error')
+        self._record('forecast', forecast_name, forecast, base_ranking, season=season)
+        if self._add_forecast_batch(forecast, forecast_name, base_ranking, season):
+            return
+        if self.matches is not None:
+            return self._add_forecast_columnar(forecast, forecast_name, base_ranking, season)
         for match in self.data.edges(keys=True):
             if (season is None) or (self.data.edges[match].get('season', 0) == season):
-                self._add_forecast_to_team(match, deepcopy(forecast), forecast_name, base_ranking)
+                self._add_forecast_to_team(match, forecast, forecast_name, base_ranking)
 
     def add_odds(self, bookmaker_name: str, bookmaker: BaseBookmaker, base_forecast: str):
-        for away_team, home_team, edge_key, edge_attributes in self.data.edges(keys=True, data=True):
-            if base_forecast not in edge_attributes['forecasts']:
-                print(f"Missing <{base_forecast}> forecast in network")
-            match_base_forecast = edge_attributes['forecasts'][base_forecast]
-            base_probabilities = match_base_forecast.get_forecast(
-                match_data=edge_attributes,
-                home_team=self.data.nodes[home_team],
-                away_team=self.data.nodes[away_team],
-                round_values=self.get_rounds()[1]
-            )
-            self.data.edges[
-                away_team, home_team, edge_key
-            ].setdefault(
-                'odds', {}
-            )[bookmaker_name] = bookmaker.get_odds(base_probabilities)
+        self._seed_component(bookmaker, 'bookmaker_error')
+        self._record('odds', bookmaker_name, bookmaker, base_forecast)
+        self._add_odds_batch(bookmaker_name, bookmaker, base_forecast)
 
     def add_bets(self, bettor_name: str, bookmaker: str, betting: BaseBetting, base_forecast: str):
-        for away_team, home_team, edge_key, edge_attributes in self.data.edges(keys=True, data=True):
-            if base_forecast not in edge_attributes['forecasts']:
-                print(f"Missing <{base_forecast}< forecast.")
-            bettor_forecast = edge_attributes['forecasts'][base_forecast]
-            match_odds = edge_attributes.get('odds', {})[bookmaker]
-            self.data.edges[
-                away_team, home_team, edge_key
-            ].setdefault(
-                'bets', {}
-            )[bettor_name] = betting.bet(bettor_forecast.probabilities, match_odds)
+        self._seed_component(betting, 'bettor_error')
+        self._record('bets', bettor_name, bookmaker, betting, base_forecast)
+        self._add_bets_batch(bettor_name, bookmaker, betting, base_forecast)
 
     def get_playing_teams(self, season, league=None):
         default = super().get_playing_teams(season)
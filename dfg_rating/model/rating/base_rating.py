@@ -1,7 +1,7 @@
 import numpy as np
 from abc import ABC, abstractmethod
 
-from dfg_rating.model.network.base_network import BaseNetwork, TeamId
+from dfg_rating.model.network.base_network import BaseNetwork, TeamId, SeasonFilter
 
 
 def get_rounds(games):
@@ -27,6 +27,15 @@ def get_rounds_per_season(games):
     return rounds
 
 
+def forward_fill(values):
+    """Fills the NaN entries of a (n_teams x n_positions) array with the last valid value of their row.
+    """
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    return values[np.arange(values.shape[0])[:, None], index]
+
+
 class BaseRating(ABC):
     """Abstract class defining the interface of Rating object.
 
@@ -52,6 +61,12 @@ class BaseRating(ABC):
         """
         pass
 
+    def update(self, n: BaseNetwork, new_matches, season, rating_name=None):
+        """Computes the ratings of a season after <new_matches> (MatchArrays) were appended to it. The ratings stored
+        under <rating_name> may be used as a starting point. The whole season is computed again by default.
+        """
+        return self.get_all_ratings(n, edge_filter=SeasonFilter(season), season=season)
+
     @abstractmethod
     def get_ratings(self, n: BaseNetwork, t: [TeamId], edge_filter=None):
         """Computes the temporal rating of a given set of teams in a given network. Return the rating values and
@@ -72,24 +87,39 @@ class RatingError(ABC):
     def apply(self, r: float) -> float:
         pass
 
+    def apply_batch(self, ratings: np.ndarray) -> np.ndarray:
+        return np.array([self.apply(r) for r in ratings], dtype=float)
+
 
 class RatingNullError(RatingError):
 
     def apply(self, r: float) -> float:
         return r
 
+    def apply_batch(self, ratings: np.ndarray) -> np.ndarray:
+        return np.asarray(ratings, dtype=float)
+
 
 class RatingFunctionError(RatingError):
 
-    def __init__(self, error, random_number_generator = np.random.default_rng(), **kwargs):
+    def __init__(self, error, random_number_generator=None, **kwargs):
+        self.own_generator = random_number_generator is not None
+        self.error = error
+        self.error_arguments = kwargs
+        self.set_random_number_generator(
+            random_number_generator if random_number_generator is not None else np.random.default_rng()
+        )
+
+    def set_random_number_generator(self, random_number_generator):
         self.random_number_generator = random_number_generator
         try:
-            self.error_method = getattr(random_number_generator, error)
+            self.error_method = getattr(random_number_generator, self.error)
         except AttributeError:
             print("Error method not available")
-            return
-        self.error_arguments = kwargs
 
     def apply(self, r: float) -> float:
         return r + self.error_method(**self.error_arguments)
 
+    def apply_batch(self, ratings: np.ndarray) -> np.ndarray:
+        return ratings + self.error_method(size=len(ratings), **self.error_arguments)
+
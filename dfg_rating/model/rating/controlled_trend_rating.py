@@ -1,21 +1,33 @@
-import itertools
-from operator import indexOf
-import time
 import numpy as np
 from tqdm import tqdm
 
-from dfg_rating.model.network.base_network import BaseNetwork, TeamId, base_edge_filter, get_seasons
-from dfg_rating.model.rating.base_rating import BaseRating, get_rounds, get_rounds_per_season
+from dfg_rating.model.network.base_network import BaseNetwork, TeamId, base_edge_filter, get_seasons, SeasonFilter
+from dfg_rating.model.rating.base_rating import BaseRating, get_rounds_per_season
+
+
+# Distributions closed under the sum of independent draws: the sum of k draws is a draw with <argument> times k
+AGGREGATED_ARGUMENTS = {
+    'normal': ('loc', 0.0),
+    'poisson': ('lam', 1.0),
+    'gamma': ('shape', None),
+    'binomial': ('n', None),
+}
 
 
 class ControlledRandomFunction:
 
-    def __init__(self, random_number_generator = np.random.default_rng(), **kwargs):
+    def __init__(self, random_number_generator=None, **kwargs):
+        self.own_generator = random_number_generator is not None
+        self.distribution = kwargs.pop('distribution')
+        self.distribution_arguments = kwargs
+        self.set_random_number_generator(
+            random_number_generator if random_number_generator is not None else np.random.default_rng()
+        )
+
+    def set_random_number_generator(self, random_number_generator):
         self.random_number_generator = random_number_generator
         try:
-            self.distribution_method = getattr(self.random_number_generator, kwargs['distribution'])
-            kwargs.pop('distribution', None)
-            self.distribution_arguments = kwargs
+            self.distribution_method = getattr(self.random_number_generator, self.distribution)
         except AttributeError as attr:
             print("Distribution method not available")
             raise attr
@@ -27,23 +39,72 @@ class ControlledRandomFunction:
         else:
             return self.distribution_method(**self.distribution_arguments)
 
+    def get_sums(self, counts):
+        """Sum of <counts[i]> independent draws for each i.
+
+        Sums of normal, poisson, gamma and binomial draws are drawn directly from their closed form, so the cost does
+        not depend on the counts, but the values differ from adding up get() draws of the same generator. Other
+        distributions draw sum(counts) values and add them up.
+        """
+        counts = np.asarray(counts, dtype=np.int64)
+        arguments = {k: v for k, v in self.distribution_arguments.items() if k != 'size'}
+        if self.distribution in AGGREGATED_ARGUMENTS:
+            argument, default = AGGREGATED_ARGUMENTS[self.distribution]
+            arguments[argument] = counts * np.asarray(arguments.get(argument, default))
+            if self.distribution == 'normal':
+                arguments['scale'] = np.sqrt(counts) * np.asarray(arguments.get('scale', 1.0))
+            return self.distribution_method(size=len(counts), **arguments).astype(float)
+        sums = np.zeros(len(counts))
+        total = int(counts.sum())
+        if total > 0:
+            draws = self.distribution_method(size=total, **arguments)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            drawn = counts > 0
+            sums[drawn] = np.add.reduceat(draws, starts[drawn])
+        return sums
+
 
 class ControlledTrendRating(BaseRating):
+    """Simulated rating following a random trend per team plus daily random deltas.
+
+    Attributes:
+        aggregated_deltas (bool): Draws the sum of the daily deltas between two matches of a team in closed form (see
+            ControlledRandomFunction.get_sums), in one draw per match instead of one per day. The ratings follow the
+            same distribution, but a seeded simulation gives other values than with daily draws. False by default.
+        delta_chunk_size (int): Maximum number of daily deltas drawn at once without <aggregated_deltas>.
+    """
 
     def __init__(self, **kwargs):
         super().__init__('controlled-trend', **kwargs)
-        self.random_number_generator: ControlledRandomFunction = kwargs['random_number_generator']
         self.starting_point: ControlledRandomFunction = kwargs['starting_point']
         self.delta: ControlledRandomFunction = kwargs['delta']
         self.trend: ControlledRandomFunction = kwargs['trend']
         self.trend_length: ControlledRandomFunction = kwargs.get('trend_length', 'season')
         self.season_delta: ControlledRandomFunction = kwargs['season_delta']
+        self.aggregated_deltas = kwargs.get('aggregated_deltas', False)
+        self.delta_chunk_size = kwargs.get('delta_chunk_size', 1000000)
+        self.own_generator = all(f.own_generator for f in self._random_functions())
         self.props = {}
         self.rating_name = kwargs.get('rating_name', 'true_rating')
 
+    def _random_functions(self):
+        return [self.starting_point, self.delta, self.trend, self.season_delta]
+
+    def set_random_number_generator(self, random_number_generator):
+        """Makes the random functions created without their own generator draw from <random_number_generator>"""
+        for function in self._random_functions():
+            if not function.own_generator:
+                function.set_random_number_generator(random_number_generator)
 
     def get_all_ratings(self, n: BaseNetwork, edge_filter=None, season=0):
-        print(season, "current_season")
+        """Generates the ratings of a season out of the schedule arrays of the network.
+
+        The rating of a team changes at each of its matches by its trend times the days since its previous match plus
+        one delta draw per day, and each round is then scaled to the rating mean. Matches are taken round by round, in
+        the order of their away team, with the away team first, and the daily deltas of all of them are drawn at once.
+        The draws follow the same sequence as drawing match by match, so seeded simulations are reproducible, unless
+        <aggregated_deltas> draws the sums of the deltas in closed form. The rounds are normalized all at once.
+        """
         edge_filter = edge_filter or base_edge_filter
         self.teams = [t for t in range(n.n_teams)]
         n_teams = len(self.teams)
@@ -51,119 +112,113 @@ class ControlledTrendRating(BaseRating):
         self.rounds_per_season = n_rounds
         ratings = np.zeros([n_teams, (n_rounds + 2)])
         relative_season = 0
-        self.agg = {}
         self.init_season_ratings(season, n, ratings)
         ratings[:, 0] *= self.rating_mean / np.ndarray.mean(ratings[:, 0])
-        games_by_round = {}
-        for k, g in itertools.groupby(
-                filter(edge_filter, n.data.edges(keys=True, data=True)), lambda x: x[3]['round']
-        ):
-            games_by_round.setdefault(k, []).append(next(g))
-
-        for r in range(self.rounds_per_season):
-            r_value = round_values[r]
-            teams_playing = []
-            current_position = (relative_season * (self.rounds_per_season + 2)) + (r + 1)
-            for away_team, home_team, match_key, match_data in games_by_round.get(r, []):
-                teams_playing += [away_team, home_team]
-                ratings[indexOf(self.teams, away_team), current_position] = ratings[
-                                                                                indexOf(self.teams,
-                                                                                        away_team), current_position - 1
-                                                                            ] + self.new_rating_value(away_team,
-                                                                                                      match_data)
-                self.agg[away_team]['last_day'] = match_data['day']
-                ratings[indexOf(self.teams, home_team), current_position] = ratings[
-                                                                                indexOf(self.teams,
-                                                                                        home_team), current_position - 1
-                                                                            ] + self.new_rating_value(home_team,
-                                                                                                      match_data)
-                self.agg[home_team]['last_day'] = match_data['day']
-            # Dealing with teams not playing
-            for team_i, team in enumerate(self.teams):
-                if team not in teams_playing:
-                    ratings[team_i, current_position] = ratings[team_i, current_position - 1]
-            ratings[:, current_position] *= self.rating_mean / np.ndarray.mean(ratings[:, current_position])
+        schedule = n.get_match_arrays(edge_filter)
+        in_season = (schedule.round >= 0) & (schedule.round < self.rounds_per_season)
+        labels = np.array([int(team) for team in schedule.teams], dtype=np.int64)
+        order = np.flatnonzero(in_season)[
+            np.lexsort((schedule.away[in_season], schedule.round[in_season]))
+        ]
+        # One entry per team and match in playing order, the away team first
+        team_rows = np.column_stack([labels[schedule.away[order]], labels[schedule.home[order]]]).reshape(-1)
+        match_rounds = np.repeat(schedule.round[order], 2)
+        match_days = np.repeat(schedule.day[order].astype(np.int64), 2)
+        by_team = np.argsort(team_rows, kind='stable')
+        first_match = np.ones(len(team_rows), dtype=bool)
+        first_match[1:] = team_rows[by_team][1:] != team_rows[by_team][:-1]
+        gaps = np.empty(len(team_rows), dtype=np.int64)
+        gaps[by_team] = match_days[by_team] - np.where(first_match, 0, np.roll(match_days[by_team], 1))
+        changes = self.trend_values[team_rows] * gaps + (
+            self.delta.get_sums(gaps) if self.aggregated_deltas else self.delta_sums(gaps)
+        )
+        round_changes = np.zeros([n_teams, self.rounds_per_season])
+        np.add.at(round_changes, (team_rows, match_rounds), changes)
+        # Each round is scaled back to the rating mean: r_k = s_k * (r_k-1 + c_k), with s_k = mean / (mean + mean(c_k))
+        # as r_k-1 has the rating mean, so r_k = S_k * (r_0 + sum of c_j / S_j-1 up to k), S_k = s_1 * ... * s_k
+        scales = np.cumprod(self.rating_mean / (self.rating_mean + round_changes.mean(axis=0)))
+        previous_scales = np.concatenate([[1.0], scales[:-1]])
+        start = relative_season * (self.rounds_per_season + 2)
+        ratings[:, start + 1:start + self.rounds_per_season + 1] = scales * (
+            ratings[:, start, None] + np.cumsum(round_changes / previous_scales, axis=1)
+        )
         self.end_season_ratings(relative_season, n, ratings)
 
         return ratings, self.props
 
+    def delta_sums(self, gaps):
+        """Sum of <gaps[i]> daily delta draws for each i, drawn in order.
+
+        The draws of consecutive matches are taken in chunks of at most delta_chunk_size values (or the days of a
+        single match), which give the same sequence as a single call, so memory does not grow with the day gaps.
+        """
+        ends = np.cumsum(gaps)
+        sums = np.zeros(len(gaps))
+        first = 0
+        while first < len(gaps):
+            chunk_end = ends[first] - gaps[first] + self.delta_chunk_size
+            last = max(first + 1, int(np.searchsorted(ends, chunk_end, side='right')))
+            sums[first:last] = self._chunk_delta_sums(gaps[first:last])
+            first = last
+        return sums
+
+    def _chunk_delta_sums(self, gaps):
+        draws = self.delta.get(int(gaps.sum()), as_list=False)
+        starts = np.cumsum(gaps) - gaps
+        sums = np.zeros(len(gaps))
+        # Summing rows of equal length keeps the rounding of summing each match on its own
+        for gap in np.unique(gaps[gaps > 0]):
+            with_gap = np.flatnonzero(gaps == gap)
+            sums[with_gap] = draws[starts[with_gap, None] + np.arange(gap)].sum(axis=1)
+        return sums
+
+    def update(self, n: BaseNetwork, new_matches, season, rating_name=None):
+        """The simulated ratings of a season are drawn once: new matches keep them, a new season draws its ratings"""
+        rating_name = rating_name or self.rating_name
+        n_rounds, round_values = n.get_rounds()
+        teams = [t for t in range(n.n_teams)]
+        stored = n.rating_store.matrix(rating_name, season, teams, n_rounds + 2)
+        if np.isnan(stored).any():
+            return self.get_all_ratings(n, edge_filter=SeasonFilter(season), season=season)
+        return stored, self.props
+
     def init_season_ratings(self, season, n, ratings):
         init_position = 0
+        self.trend_values = np.empty(len(self.teams))
+        previous_playing_teams = set(n.get_playing_teams(season - 1).values()) if season > 0 else set()
         for team_i, team in enumerate(self.teams):
-            self.agg.setdefault(
-                team, {}
-            )['trend'] = self.trend.get()[0]
-            self.props.setdefault(
-                team, {}
-            ).setdefault(
-                'trends', []
-            ).append(self.agg[team]['trend'])
-            team_starting = self.init_ratings(team, season, n)
-            self.props.setdefault(
-                team, {}
-            ).setdefault(
-                'starting_points', []
-            ).append(team_starting)
-            ratings[team_i, init_position] = team_starting
-
-    def init_ratings(self, team, current_season, n) -> float:
+            self.trend_values[team_i] = self.trend.get()[0]
+            starting_point = self.init_ratings(team, season, n, previous_playing_teams)
+            self.props.setdefault(team, {}).setdefault('trends', []).append(self.trend_values[team_i])
+            self.props.setdefault(team, {}).setdefault('starting_points', []).append(starting_point)
+            ratings[team_i, init_position] = starting_point
+
+    def init_ratings(self, team, current_season, n, previous_playing_teams) -> float:
         if current_season == 0:
-            print("first season")
             """First season on the simulation, new starting point"""
-            starting_point = self.starting_point.get()[0]
+            return self.starting_point.get()[0]
+        """First season in the ratings computation but not in the network. Reading previous season"""
+        default_rating = self.starting_point.get()
+        if team not in previous_playing_teams:
+            last_season_rating = n.get_mean_rating(
+                self.rating_name, current_season - 1, None, default_rating, relegated=True
+            )
         else:
-            """First season in the ratings computation but not in the network. Reading previous season"""
-            previous_playing_teams = n.get_playing_teams(current_season - 1)
-            default_rating = self.starting_point.get()
-            if team not in previous_playing_teams.values():
-                mean_rating = n.get_mean_rating(self.rating_name, current_season - 1, default_rating, relegated=True)
-                starting_point = self.apply_season_change(
-                    last_season_rating=mean_rating
-                )
-            else:
-                starting_point = self.apply_season_change(
-                    last_season_rating=
-                    n.data.nodes[team].get('ratings', {}).get(self.rating_name, {}).get(
-                        current_season - 1, self.starting_point.get()
-                    )[-1]
-                )
-        return starting_point
+            last_season_rating = n.node_attributes[team].get('ratings', {}).get(self.rating_name, {}).get(
+                current_season - 1, self.starting_point.get()
+            )[-1]
+        return self.apply_season_change(last_season_rating=last_season_rating)
 
     def end_season_ratings(self, season, network, ratings):
         end_position = (season + 1) * (self.rounds_per_season + 2) - 1
-        for team_i, team in enumerate(self.teams):
-            ratings[team_i, end_position] = ratings[team_i, end_position - 1]
+        ratings[:, end_position] = ratings[:, end_position - 1]
 
     def apply_season_change(self, last_season_rating):
         additive_value = self.season_delta.get()[0]
-        #print("last_season_rating", last_season_rating, "additive", additive_value)
         return last_season_rating + additive_value
 
-    def new_rating_value(self, team, match_data):
-        delta_days = match_data['day'] - self.agg[team].get('last_day', 0)
-        self.agg[team]['last_day'] = match_data['day']
-        total_delta = self.delta.get(delta_days, as_list=False).sum()
-        round_ranking = self.agg[team]['trend'] * delta_days
-        return round_ranking + total_delta
-
     def get_ratings(self, n: BaseNetwork, t: [TeamId], edge_filter=None):
-        edge_filter = edge_filter or base_edge_filter
-        home_games = list(n.data.in_edges(t, keys=True, data=True))
-        away_games = list(n.data.out_edges(t, keys=True, data=True))
-        n_rounds = len(get_rounds(home_games + away_games))
-        ratings = np.zeros([len(t), n_rounds + 1])
-        ratings[:, 0] = self.starting_point.get(len(t))
-        agg = {}
-        current_season = 0
-        for away_team, home_team, match_key, match_data in sorted(filter(edge_filter, home_games + away_games),
-                                                                  key=lambda x: x[3]['day']):
-            if match_data.get('season', 0) != current_season:
-                current_season = match_data['season']
-                agg = {}
-            if home_team in t:
-                i_home_team = indexOf(t, home_team)
-                ratings[i_home_team][match_data['round'] + 1] = self.new_rating_value(agg, home_team, match_data)
-            if away_team in t:
-                i_away_team = indexOf(t, away_team)
-                ratings[i_away_team][match_data['round'] + 1] = self.new_rating_value(agg, away_team, match_data)
-        return ratings, self.props
+        """Ratings of the teams <t>, taken out of the ratings of all the teams in the season of <edge_filter>"""
+        season = edge_filter.season if isinstance(edge_filter, SeasonFilter) else 0
+        ratings, props = self.get_all_ratings(n, edge_filter=edge_filter, season=season)
+        return ratings[[int(team) for team in t]], props
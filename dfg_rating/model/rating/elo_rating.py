@@ -5,17 +5,36 @@ from operator import indexOf
 import numpy as np
 from tqdm import tqdm
 
-from dfg_rating.model.network.base_network import BaseNetwork, TeamId, base_edge_filter, get_seasons
-from dfg_rating.model.rating.base_rating import BaseRating, get_rounds, get_rounds_per_season
+from dfg_rating.model.network.base_network import BaseNetwork, TeamId, base_edge_filter, get_seasons, SeasonFilter
+from dfg_rating.model.network.match_table import MatchArrays
+from dfg_rating.model.rating.base_rating import BaseRating, get_rounds, get_rounds_per_season, forward_fill
 
 
 class ELORating(BaseRating):
+    """ELO rating computed round by round over the schedule of a season.
+
+    The schedule is read once as (round, home, away, result) arrays and each round is applied as a vector update,
+    given that a team plays at most once per round.
+
+    Any of param_k, param_c, param_d and param_w may be a list of values. The rating then sweeps every combination
+    of the parameters in the same pass over the schedule and get_all_ratings returns a
+    (n_params x n_teams x n_rounds + 2) tensor, one layer per combination in the order of sweep_names.
+
+    Attributes:
+        settings (dict): Parameters c, d, k and w of the rating, as given.
+        sweep (bool): Whether any of the parameters holds several values.
+        parameters (dict): Parameter values of each combination, as (n_params,) float arrays.
+    """
+    match_attributes = []
+    sweep_parameters = ['k', 'c', 'd', 'w']
 
     def __init__(self, **kwargs):
         super().__init__('elo', **kwargs)
         self.elo_trained = kwargs.get("trained", False)
         self.props = {}
+        self._mean_ratings = {}
         self.rating_name = kwargs.get('rating_name', 'elo_rating')
+        self.sweep = False
         if self.elo_trained:
             self.settings = {
                 "c": kwargs.get("param_c", 10.0),
@@ -23,8 +42,30 @@ class ELORating(BaseRating):
                 "k": kwargs.get("param_k", 14.0),
                 "w": kwargs.get("param_w", 80)
             }
+            self.sweep = any(np.ndim(self.settings[p]) > 0 for p in self.sweep_parameters)
+            self.combinations = list(itertools.product(
+                *[np.atleast_1d(self.settings[p]).tolist() for p in self.sweep_parameters]
+            ))
+            self.parameters = {
+                p: np.array([c[p_i] for c in self.combinations], dtype=float)
+                for p_i, p in enumerate(self.sweep_parameters)
+            }
 
-    def init_ratings(self, team, season, n, league=None):
+    def sweep_names(self, rating_name=None):
+        """Name of each layer of the rating. The rating name is formatted with the parameters of the layer, e.g.
+        'elo_rating_{k}'. Without placeholders, the values of the swept parameters are appended to it.
+        """
+        rating_name = rating_name or self.rating_name
+        if not self.sweep:
+            return [rating_name]
+        if '{' not in rating_name:
+            rating_name += ''.join(
+                f"_{{{p}}}" for p in self.sweep_parameters if np.ndim(self.settings[p]) > 0
+            )
+        return [rating_name.format(**dict(zip(self.sweep_parameters, c))) for c in self.combinations]
+
+    def init_ratings(self, team, season, n, league=None, rating_name=None):
+        rating_name = rating_name or self.rating_name
         seasons_available = n.get_seasons()
         season_i = indexOf(seasons_available, season)
         if season_i == 0:
@@ -34,19 +75,24 @@ class ELORating(BaseRating):
             """First season in the ratings computation but not in the network. Reading previous season"""
             previous_playing_teams = n.get_playing_teams(seasons_available[season_i - 1], league)
             if team not in previous_playing_teams.values():
-                starting_point = n.get_mean_rating(self.rating_name, seasons_available[season_i - 1], league, [self.rating_mean], relegated=True)
+                if league not in self._mean_ratings:
+                    self._mean_ratings[league] = n.get_mean_rating(
+                        rating_name, seasons_available[season_i - 1], league, [self.rating_mean], relegated=True
+                    )
+                starting_point = self._mean_ratings[league]
             else:
-                starting_point = n.data.nodes[team].get('ratings', {}).get(self.rating_name, {}).get(
+                starting_point = n.node_attributes[team].get('ratings', {}).get(rating_name, {}).get(
                     seasons_available[season_i - 1], [self.rating_mean]
                 )[-1]
         return starting_point
 
-    def init_season_ratings(self, season, n, ratings):
+    def init_season_ratings(self, season, n, ratings, rating_name=None):
         init_position = 0
+        self._mean_ratings = {}
         # n.update_leagues_information()
-        for team_i, team in enumerate(n.data.nodes):
+        for team_i, team in enumerate(n.node_attributes):
             current_league = n.get_current_league(season, team)
-            ratings[team_i, init_position] = self.init_ratings(team, season, n, current_league)
+            ratings[team_i, init_position] = self.init_ratings(team, season, n, current_league, rating_name)
 
     def compute_expected_values(self, home_value, away_value):
         expected_home = 1.0 / (
@@ -60,6 +106,18 @@ class ELORating(BaseRating):
     def update_elo(self, current, score, expected, match_data):
         return current + (self.settings['k'] * (score - expected))
 
+    def sweep_expected_values(self, home_value, away_value):
+        """Expected scores of (n_params x n_games) home and away ratings, one row per parameter combination."""
+        c, d, w = (self.parameters[p][:, None] for p in ['c', 'd', 'w'])
+        expected_home = 1.0 / (1.0 + (c ** ((away_value - home_value - w) / d)))
+        return expected_home, 1 - expected_home
+
+    def compute_home_scores(self, results):
+        return np.where(results == 'home', 1.0, np.where(results == 'draw', 0.5, 0.0))
+
+    def k_factors(self, schedule: MatchArrays):
+        return np.repeat(self.parameters['k'][:, None], len(schedule), axis=1)
+
     def end_season_ratings(self, network, ratings):
         end_position = (self.rounds_per_season + 2) - 1
         for team_i, team in enumerate(self.teams):
@@ -67,65 +125,93 @@ class ELORating(BaseRating):
 
     def get_all_ratings(self, n: BaseNetwork, edge_filter=None, season=0, **params):
         edge_filter = edge_filter or base_edge_filter
-        self.teams = list(n.data.nodes)
+        self.teams = list(n.node_attributes)
         n_teams = len(self.teams)
         n_rounds, round_values = n.get_rounds()
         self.rounds_per_season = n_rounds
-        ratings = np.zeros([n_teams, (n_rounds + 2)])
-        self.init_season_ratings(season, n, ratings)
-        players_dict = {team: team_i for team_i, team in enumerate(self.teams)}
-        games_by_round = {}
-        for k, g in itertools.groupby(
-                filter(edge_filter, n.data.edges(keys=True, data=True)), lambda x: x[3]['round']
-        ):
-            games_by_round.setdefault(k, []).append(next(g))
-        for r in range(self.rounds_per_season):
-            r_value = round_values[r]
-            teams_playing = set(())
-            for away_team, home_team, match_key, match_data in games_by_round.get(r_value, {}):
-                if match_data.get('state', 'active') == 'active':
-                    home_team_i = players_dict.get(home_team, home_team)
-                    away_team_i = players_dict.get(away_team, away_team)
-                    teams_playing.update([away_team, home_team])
-                    current_round = match_data['round']
-                    current_position = r + 1
-                    home_expected, away_expected = self.compute_expected_values(
-                        ratings[home_team_i, current_position - 1],
-                        ratings[away_team_i, current_position - 1]
-                    )
-                    home_score, away_score = self.compute_scores(match_data['winner'])
-                    ratings[away_team_i, current_position] = self.update_elo(
-                        ratings[away_team_i, current_position - 1],
-                        away_score,
-                        away_expected,
-                        match_data
-                    )
-                    ratings[home_team_i, current_position] = self.update_elo(
-                        ratings[home_team_i, current_position - 1],
-                        home_score,
-                        home_expected,
-                        match_data
-                    )
-            # Dealing with teams not playing
-            if len(teams_playing) != len(self.teams):
-                for team in self.teams:
-                    if team not in teams_playing:
-                        team_i = players_dict.get(team, team)
-                        rating_pointer = r + 1
-                        ratings[team_i, rating_pointer] = ratings[team_i, rating_pointer - 1]
-        self.end_season_ratings(n, ratings)
-        return ratings, self.props
+        layers = self.sweep_names()
+        ratings = np.zeros([len(layers), n_teams, (n_rounds + 2)])
+        for layer_i, layer_name in enumerate(layers):
+            self.init_season_ratings(season, n, ratings[layer_i], layer_name)
+        schedule = n.get_match_arrays(edge_filter, extra=self.match_attributes)
+        schedule = schedule.select(schedule.active & (schedule.round >= 0) & (schedule.round < n_rounds))
+        ratings = self.compute_ratings(schedule, ratings[:, :, 0], n_rounds)
+        return (ratings if self.sweep else ratings[0]), self.props
+
+    def update(self, n: BaseNetwork, new_matches: MatchArrays, season, rating_name=None):
+        """Resumes the ratings of a season stored under <rating_name> from the first round of <new_matches>, or from
+        the first round added to the network since they were stored: the ratings before that round do not depend on
+        them. The season is computed again if there are no stored ratings.
+        """
+        self.teams = list(n.node_attributes)
+        n_rounds, round_values = n.get_rounds()
+        self.rounds_per_season = n_rounds
+        playing = new_matches.active & (new_matches.round >= 0) & (new_matches.round < n_rounds)
+        first_round = int(new_matches.round[playing].min()) if playing.any() else n_rounds
+        stored = np.array([
+            n.rating_store.matrix(layer, season, self.teams, n_rounds + 2) for layer in self.sweep_names(rating_name)
+        ])
+        # Stored ratings end with a copy of their last round, the rating before the first round added since
+        stored_columns = np.isnan(stored).any(axis=(0, 1))
+        first_round = min(first_round, (int(np.argmax(stored_columns)) if stored_columns.any() else n_rounds + 2) - 2)
+        if first_round < 0:
+            return self.get_all_ratings(n, edge_filter=SeasonFilter(season), season=season)
+        schedule = n.get_match_arrays(SeasonFilter(season), extra=self.match_attributes)
+        schedule = schedule.select(schedule.active & (schedule.round >= first_round) & (schedule.round < n_rounds))
+        ratings = self.compute_ratings(schedule, stored[:, :, first_round], n_rounds, first_round)
+        ratings[:, :, :first_round] = stored[:, :, :first_round]
+        return (ratings if self.sweep else ratings[0]), self.props
+
+    def compute_ratings(self, schedule: MatchArrays, starting_ratings, n_rounds, first_round=0):
+        """Computes the (n_params x n_teams x n_rounds + 2) ELO ratings of a season schedule.
+
+        Only the teams playing a round are updated. Idle teams keep their last rating with a forward fill.
+        Starting ratings of shape (n_teams,) are shared by every parameter combination. They are the ratings before
+        <first_round>, and the columns of the previous rounds are left as NaN.
+        """
+        n_params = len(self.combinations)
+        order = np.argsort(schedule.round, kind='stable')
+        home_teams = schedule.home[order]
+        away_teams = schedule.away[order]
+        home_scores = self.compute_home_scores(schedule.winner[order])
+        k_factors = self.k_factors(schedule)[:, order]
+        round_bounds = np.searchsorted(schedule.round[order], np.arange(n_rounds + 1))
+        current = np.array(np.broadcast_to(starting_ratings, (n_params, np.shape(starting_ratings)[-1])), dtype=float)
+        values = np.full([n_params, current.shape[1], n_rounds + 2], np.nan)
+        values[:, :, first_round] = current
+        for r in range(first_round, n_rounds):
+            games = slice(round_bounds[r], round_bounds[r + 1])
+            home_i, away_i = home_teams[games], away_teams[games]
+            home_expected, away_expected = self.sweep_expected_values(current[:, home_i], current[:, away_i])
+            new_home = current[:, home_i] + k_factors[:, games] * (home_scores[games] - home_expected)
+            new_away = current[:, away_i] + k_factors[:, games] * ((1 - home_scores[games]) - away_expected)
+            # Interleaved so a team playing twice in a round keeps the result of its last match, as match by match
+            updated_teams = np.stack([away_i, home_i], axis=1).reshape(-1)
+            updated_values = np.stack([new_away, new_home], axis=2).reshape(n_params, -1)
+            current[:, updated_teams] = updated_values
+            values[:, updated_teams, r + 1] = updated_values
+        ratings = forward_fill(values.reshape(-1, n_rounds + 2)).reshape(values.shape)
+        ratings[:, :, -1] = ratings[:, :, -2]
+        return ratings
 
     def get_ratings(self, n: BaseNetwork, t: [TeamId], edge_filter=None):
         pass
 
 
 class SplitELORating(ELORating):
+    match_attributes = ['split_k_group']
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if self.elo_trained:
             self.settings["split_k"] = kwargs.get("param_split_k", {})
 
+    def k_factors(self, schedule: MatchArrays):
+        group_k = [self.settings.get('split_k', {}).get(group, None) for group in schedule.extra['split_k_group']]
+        has_group = np.array([k is not None for k in group_k], dtype=bool)
+        group_k = np.array([np.nan if k is None else k for k in group_k], dtype=float)
+        return np.where(has_group, group_k, self.parameters['k'][:, None])
+
     def update_elo(self, current, score, expected, match_data):
         if 'split_k_group' in match_data:
             k_factor = self.settings.get('split_k', {}).get(match_data['split_k_group'], None)
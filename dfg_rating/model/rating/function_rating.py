@@ -13,17 +13,23 @@ class FunctionRating(BaseRating):
         distribution (str): Function name
     """
 
-    def __init__(self, random_number_generator = np.random.default_rng(), **args):
+    def __init__(self, random_number_generator=None, **args):
         super().__init__('random-function')
+        self.own_generator = random_number_generator is not None
+        self.distribution = args.pop('distribution')
+        self.arguments = args
+        self.set_random_number_generator(
+            random_number_generator if random_number_generator is not None else np.random.default_rng()
+        )
+
+    def set_random_number_generator(self, random_number_generator):
         self.random_number_generator = random_number_generator
         try:
-            self.distribution_method = getattr(self.random_number_generator, args['distribution'])
-            args.pop('distribution', None)
+            self.distribution_method = getattr(self.random_number_generator, self.distribution)
         except AttributeError as attr:
             self.distribution_method = None
-        self.arguments = args
 
-    def get_all_ratings(self, n: BaseNetwork, edge_filter=None):
+    def get_all_ratings(self, n: BaseNetwork, edge_filter=None, season=None):
         edge_filter = edge_filter or base_edge_filter
         n_teams = len(n.data)
         games = filter(edge_filter, n.data.edges(keys=True, data=True))
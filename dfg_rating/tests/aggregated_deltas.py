@@ -0,0 +1,71 @@
+import numpy as np
+
+from dfg_rating.model.network.random_network import RandomNetwork
+from dfg_rating.model.rating.controlled_trend_rating import ControlledTrendRating, ControlledRandomFunction
+
+# Closed-form sums against sums of daily draws
+n_samples = 200000
+functions = [
+    ({'distribution': 'normal', 'loc': 0.2, 'scale': 0.5}, 'normal'),
+    ({'distribution': 'poisson', 'lam': 1.5}, 'poisson'),
+    ({'distribution': 'gamma', 'shape': 2.0, 'scale': 0.5}, 'gamma'),
+    ({'distribution': 'binomial', 'n': 4, 'p': 0.3}, 'binomial'),
+    ({'distribution': 'uniform', 'low': -1.0, 'high': 1.0}, 'uniform'),
+]
+for count in [1, 3, 7]:
+    counts = np.full(n_samples, count)
+    for arguments, name in functions:
+        function = ControlledRandomFunction(random_number_generator=np.random.default_rng(1), **arguments)
+        aggregated = function.get_sums(counts)
+        daily = function.get(n_samples * count, as_list=False).reshape(n_samples, count).sum(axis=1)
+        mean_error = abs(aggregated.mean() - daily.mean()) / max(daily.std(), 1e-12)
+        std_error = abs(aggregated.std() - daily.std()) / max(daily.std(), 1e-12)
+        print(f"{name}, sums of {count}: mean {aggregated.mean():.4f} against {daily.mean():.4f}, "
+              f"std {aggregated.std():.4f} against {daily.std():.4f}")
+        assert mean_error < 0.02 and std_error < 0.02
+
+# Zero days between matches add nothing
+function = ControlledRandomFunction(
+    distribution='normal', loc=1, scale=1, random_number_generator=np.random.default_rng(1)
+)
+assert np.all(function.get_sums(np.zeros(10, dtype=np.int64)) == 0)
+
+
+# Ratings with aggregated deltas, opt-in, follow the ratings with daily deltas in distribution
+def season_changes(aggregated_deltas, seed):
+    network = RandomNetwork(teams=12, days_between_rounds=3, seed=seed, edge_probability=0.6)
+    rating = ControlledTrendRating(
+        starting_point=ControlledRandomFunction(distribution='normal', loc=1000, scale=150),
+        delta=ControlledRandomFunction(distribution='normal', loc=0, scale=5),
+        trend=ControlledRandomFunction(distribution='normal', loc=0, scale=.2),
+        season_delta=ControlledRandomFunction(distribution='normal', loc=0, scale=30),
+        aggregated_deltas=aggregated_deltas
+    )
+    network.add_rating(rating, 'controlled_rating', season=0)
+    ratings = np.array([network.node_attributes[t]['ratings']['controlled_rating'][0] for t in range(12)])
+    return np.diff(ratings, axis=1).ravel()
+
+
+daily_changes = np.concatenate([season_changes(False, seed) for seed in range(30)])
+aggregated_changes = np.concatenate([season_changes(True, seed) for seed in range(30)])
+print(f"Rating changes: std {aggregated_changes.std():.4f} aggregated against {daily_changes.std():.4f} daily")
+assert abs(aggregated_changes.std() - daily_changes.std()) / daily_changes.std() < 0.1
+
+# Daily deltas drawn in chunks follow the sequence of a single call
+def chunked_rating(chunk_size):
+    return ControlledTrendRating(
+        starting_point=ControlledRandomFunction(distribution='normal', loc=1000, scale=150),
+        delta=ControlledRandomFunction(
+            distribution='normal', loc=0, scale=1, random_number_generator=np.random.default_rng(6)
+        ),
+        trend=ControlledRandomFunction(distribution='normal', loc=0, scale=.2),
+        season_delta=ControlledRandomFunction(distribution='normal', loc=0, scale=30),
+        delta_chunk_size=chunk_size
+    )
+
+
+gaps = np.random.default_rng(5).integers(0, 40, size=500)
+single_call = chunked_rating(int(gaps.sum())).delta_sums(gaps)
+for chunk_size in [1, 25, 1000]:
+    assert np.array_equal(chunked_rating(chunk_size).delta_sums(gaps), single_call)
+print(f"Delta sums of {gaps.sum()} days equal in chunks of 1, 25 and 1000 draws")
@@ -0,0 +1,82 @@
+import numpy as np
+
+from dfg_rating.model.betting.betting import KellyBetting
+from dfg_rating.model.bookmaker.base_bookmaker import SimpleBookmaker, BookmakerMargin
+from dfg_rating.model.evaluators.accuracy import RankProbabilityScore, Likelihood
+from dfg_rating.model.evaluators.profitability import BettingReturnsEvaluator
+from dfg_rating.model.forecast.forecast_error import ForecastNullError
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+outcomes = ['home', 'draw', 'away']
+
+
+def new_network(backend):
+    return LeagueNetwork(
+        teams=10, seasons=3, league_teams=10, league_promotion=0, days_between_rounds=3, seed=7, backend=backend
+    )
+
+
+def derive(network):
+    network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating')
+    network.add_forecast(
+        LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006),
+        'elo_forecast', 'elo_rating'
+    )
+    network.add_odds('bookmaker', SimpleBookmaker(error=ForecastNullError(), margin=BookmakerMargin(0.05)),
+                     'true_forecast')
+    network.add_bets('bettor', 'bookmaker', KellyBetting(1000), 'elo_forecast')
+    network.add_evaluation([
+        (RankProbabilityScore(outcomes=outcomes, forecast_name='elo_forecast'), 'RPS'),
+        (Likelihood(outcomes=outcomes, forecast_name='elo_forecast'), 'Likelihood'),
+        (BettingReturnsEvaluator(
+            outcomes=outcomes, player_name='bettor', true_model='true_forecast', bookmaker_name='bookmaker'
+        ), 'returns')
+    ])
+
+
+def snapshot(network):
+    matches = {
+        (a, h, d['season'], d['round']): (
+            np.asarray(d['forecasts']['elo_forecast'].probabilities).tolist(),
+            np.asarray(d['odds']['bookmaker']).tolist(), np.asarray(d['bets']['bettor']).tolist(),
+            d['metrics']['RPS'], d['metrics']['Likelihood'], np.asarray(d['metrics']['returns']).tolist()
+        ) for a, h, k, d in network.iterate_over_games()
+    }
+    ratings = {
+        team: {season: np.asarray(attributes['ratings']['elo_rating'][season]).tolist()
+               for season in network.get_seasons()}
+        for team, attributes in network.node_attributes.items()
+    }
+    return matches, ratings
+
+
+schedule_attributes = ['season', 'round', 'day', 'winner', 'state']
+
+for backend in ['graph', 'columnar']:
+    full_network = new_network(backend)
+    derive(full_network)
+    full_matches, full_ratings = snapshot(full_network)
+    for cut_season, cut_round in [(2, 12), (1, 15), (0, 17), (1, 3)]:
+        network = new_network(backend)
+        graph = network.data.copy() if network.matches is not None else network.data
+        later = [
+            (a, h, k) for a, h, k, d in graph.edges(keys=True, data=True)
+            if (d['season'], d['round']) >= (cut_season, cut_round)
+        ]
+        removed = [
+            (a, h, {name: value for name, value in graph.edges[a, h, k].items() if name in schedule_attributes})
+            for a, h, k in later
+        ]
+        graph.remove_edges_from(later)
+        if network.matches is not None:
+            network.data = graph
+        derive(network)
+        # Appended in two blocks
+        network.append_matches(removed[:len(removed) // 2])
+        network.append_matches(removed[len(removed) // 2:])
+        matches, ratings = snapshot(network)
+        print(f"{backend}: {len(removed)} matches appended from season {cut_season} round {cut_round}")
+        assert matches == full_matches, "Appended matches differ from the full computation"
+        assert ratings == full_ratings, "Ratings differ from the full computation"
@@ -0,0 +1,44 @@
+import math
+
+import numpy as np
+
+from dfg_rating.model.network.simple_network import berger_schedule
+
+
+def rotated_schedule(number_of_teams, number_of_rounds, games_per_round, days_between_rounds):
+    """Match by match Berger tables, rotating the two slices of the circle after each round"""
+    teams_list = list(range(number_of_teams)) + ([-1] if number_of_teams % 2 != 0 else [])
+    slice_a = teams_list[0:games_per_round]
+    slice_b = teams_list[games_per_round:]
+    fixed = teams_list[0]
+    day = 1
+    matches = []
+    for season_round in range(number_of_rounds):
+        for game in range(games_per_round):
+            if (slice_a[game] != -1) and (slice_b[game] != -1):
+                first, second = (slice_a[game], slice_b[game]) if season_round % 2 == 0 else \
+                    (slice_b[game], slice_a[game])
+                matches.append((first, second, season_round, day))
+                matches.append((
+                    second, first, season_round + number_of_rounds, day + number_of_rounds * days_between_rounds
+                ))
+        day += days_between_rounds
+        rotate = slice_a[-1]
+        slice_a = [fixed, slice_b[0]] + slice_a[1:-1]
+        slice_b = slice_b[1:] + [rotate]
+    return matches
+
+
+for number_of_teams in [2, 4, 5, 10, 11, 20]:
+    number_of_rounds = number_of_teams - 1 + number_of_teams % 2
+    for games_per_round in sorted({int(math.ceil(number_of_teams / 2)), max(1, number_of_teams // 2 - 1)}):
+        away, home, rounds, days = berger_schedule(number_of_teams, number_of_rounds, games_per_round, 3)
+        matches = list(zip(away.tolist(), home.tolist(), rounds.tolist(), days.tolist()))
+        assert matches == rotated_schedule(number_of_teams, number_of_rounds, games_per_round, 3)
+        if games_per_round == int(math.ceil(number_of_teams / 2)):
+            # Every team meets every other team once at home and once away, at most once per round
+            assert len(set(zip(away.tolist(), home.tolist()))) == number_of_teams * (number_of_teams - 1) == len(away)
+            for r in np.unique(rounds):
+                playing = np.concatenate([away[rounds == r], home[rounds == r]])
+                assert len(np.unique(playing)) == len(playing)
+        print(f"{number_of_teams} teams, {games_per_round} games per round: {len(matches)} matches")
@@ -0,0 +1,44 @@
+import numpy as np
+
+from dfg_rating.model.betting.betting import FixedBetting, ThresholdBetting, KellyBetting
+from dfg_rating.model.forecast.forecast_error import ForecastNullError, ForecastFactorError, ForecastSimulatedError
+
+n_matches = 50
+generator = np.random.default_rng(5)
+# Two bettor forecasts stacked against the odds of three bookmakers
+forecasts = generator.dirichlet([4, 3, 3], size=(2, 1, n_matches))
+odds = 1 / generator.dirichlet([4, 3, 3], size=(3, n_matches)) * 0.95
+
+errors = [
+    (lambda: ForecastNullError(), 'null'),
+    (lambda: ForecastFactorError(error=0.1), 'factor'),
+    (lambda: ForecastFactorError(error=0.1, scope='positive'), 'positive factor'),
+    (lambda: ForecastSimulatedError(error='normal', loc=0, scale=0.2), 'simulated'),
+]
+bettings = [
+    (lambda error: FixedBetting(1000, error), 'fixed'),
+    (lambda error: ThresholdBetting(1000, error, threshold=0.05), 'threshold'),
+    (lambda error: KellyBetting(1000, error), 'kelly'),
+]
+
+for new_betting, betting_name in bettings:
+    for new_error, error_name in errors:
+        batch_betting = new_betting(new_error())
+        batch_betting.error.set_random_number_generator(np.random.default_rng(11))
+        batch_bets = batch_betting.bet_batch(forecasts, odds)
+
+        pair_betting = new_betting(new_error())
+        pair_betting.error.set_random_number_generator(np.random.default_rng(11))
+        stacked_forecasts, stacked_odds = np.broadcast_arrays(forecasts, odds)
+        pair_bets = np.zeros(batch_bets.shape)
+        for index in np.ndindex(*batch_bets.shape[:-1]):
+            pair_bets[index] = pair_betting.bet(stacked_forecasts[index], stacked_odds[index])
+
+        difference = np.max(np.abs(batch_bets - pair_bets))
+        print(f"{betting_name} betting, {error_name} error: {np.count_nonzero(pair_bets)} bets, "
+              f"max batch-pair difference {difference}")
+        assert batch_bets.shape == (2, 3, n_matches, 3)
+        assert difference < 1e-9
+        if error_name != 'null':
+            # Each bookmaker gets its own error draw
+            assert not np.array_equal(batch_bets[:, 0], batch_bets[:, 1])
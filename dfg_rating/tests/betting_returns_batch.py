@@ -0,0 +1,69 @@
+import numpy as np
+
+from dfg_rating.logic.controller import Controller
+from dfg_rating.model.betting.betting import KellyBetting
+from dfg_rating.model.bookmaker.base_bookmaker import SimpleBookmaker, BookmakerMargin
+from dfg_rating.model.evaluators.profitability import BettingReturnsEvaluator
+from dfg_rating.model.forecast.forecast_error import ForecastSimulatedError
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+outcomes = ['home', 'draw', 'away']
+from_season = 1
+
+for backend in ['graph', 'columnar']:
+    network = LeagueNetwork(
+        teams=10, seasons=3, league_teams=10, league_promotion=0, days_between_rounds=3, seed=4, backend=backend
+    )
+    network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating')
+    network.add_forecast(
+        LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006),
+        'elo_forecast', 'elo_rating'
+    )
+    network.add_odds(
+        'bookmaker',
+        SimpleBookmaker(error=ForecastSimulatedError(error='normal', loc=0, scale=0.1), margin=BookmakerMargin(0.05)),
+        'true_forecast'
+    )
+    network.add_bets('bettor', 'bookmaker', KellyBetting(1000), 'elo_forecast')
+    evaluator = BettingReturnsEvaluator(
+        outcomes=outcomes, player_name='bettor', true_model='true_forecast', bookmaker_name='bookmaker'
+    )
+    network.add_evaluation([(evaluator, 'returns')])
+
+    # Stored batch returns against the match by match evaluation
+    differences = []
+    for a, h, k, d in network.iterate_over_games():
+        correct, expected = evaluator.eval(d)
+        differences.append(np.max(np.abs(np.asarray(d['metrics']['returns']) - np.asarray(expected))))
+    print(f"{backend}: {len(differences)} matches, max batch-scalar returns difference {np.max(differences)}")
+    assert np.max(differences) < 1e-9
+
+    # Bankroll paths against the accumulation of the returns of the placed bets, matches ordered by season and day
+    returns = network.get_betting_returns(evaluator)
+    games = sorted(network.iterate_over_games(), key=lambda g: (g[3]['season'], g[3]['day']))
+    actual, multiplied, expected, staked = [], [], [], []
+    for a, h, k, d in games:
+        if d['season'] < from_season:
+            continue
+        match_returns = evaluator.eval(d)[1]
+        for outcome_index, bet in enumerate(d['bets']['bettor']):
+            if bet > 0:
+                actual.append((actual[-1] if actual else 0) + match_returns[outcome_index][0])
+                multiplied.append((multiplied[-1] if multiplied else 1) * match_returns[outcome_index][1])
+                expected.append((expected[-1] if expected else 0) + match_returns[outcome_index][2])
+                staked.append((staked[-1] if staked else 0) + bet)
+    assert len(returns) == len(games)
+    assert np.allclose(returns.path('actual', from_season=from_season), actual)
+    assert np.allclose(returns.path('multiplied', from_season=from_season), multiplied)
+    assert np.allclose(returns.path('expected', from_season=from_season), expected)
+    assert np.allclose(returns.staked(from_season), staked)
+    print(f"{backend}: {len(actual)} placed bets from season {from_season}, final actual returns {actual[-1]}")
+
+    # Profitability study rows, pairs with missing bets left out
+    mc = Controller()
+    mc.networks['league'] = network
+    rows = mc.profitability_study('league', evaluator, ['bookmaker', 'bookmaker'], ['bettor', 'missing_bettor'])
+    assert len(rows) == len(games) and all(row['Bettor'] == 'bettor' for row in rows)
+    print(f"{backend}: {len(rows)} profitability rows, the missing bettor left out")
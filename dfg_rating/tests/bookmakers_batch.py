@@ -0,0 +1,42 @@
+import numpy as np
+
+from dfg_rating.model.bookmaker.base_bookmaker import SimpleBookmaker, BookmakerMargin
+from dfg_rating.model.forecast.forecast_error import ForecastNullError, ForecastFactorError, ForecastSimulatedError
+from dfg_rating.model.network.simple_network import RoundRobinNetwork
+
+errors = [
+    (lambda: ForecastNullError(), 'null'),
+    (lambda: ForecastFactorError(error=0.1), 'factor'),
+    (lambda: ForecastFactorError(error=0.1, scope='negative'), 'negative factor'),
+    (lambda: ForecastSimulatedError(error='normal', loc=0, scale=0.2), 'simulated'),
+]
+
+network = RoundRobinNetwork(teams=12, days_between_rounds=3, seed=7)
+true_probabilities = np.array([d['forecasts']['true_forecast'].probabilities for a, h, k, d in
+                               network.iterate_over_games()])
+
+for new_error, error_name in errors:
+    for margin in [0.0, 0.05]:
+        batch_bookmaker = SimpleBookmaker(error=new_error(), margin=BookmakerMargin(margin))
+        batch_bookmaker.error.set_random_number_generator(np.random.default_rng(11))
+        batch_odds = batch_bookmaker.get_odds_batch(true_probabilities)
+
+        match_bookmaker = SimpleBookmaker(error=new_error(), margin=BookmakerMargin(margin))
+        match_bookmaker.error.set_random_number_generator(np.random.default_rng(11))
+        match_odds = np.array([match_bookmaker.get_odds(row) for row in true_probabilities])
+
+        difference = np.max(np.abs(batch_odds - match_odds))
+        print(f"{error_name} error, {margin} margin: {len(batch_odds)} matches, max batch-scalar difference "
+              f"{difference}")
+        assert batch_odds.shape == true_probabilities.shape
+        assert difference < 1e-9
+
+# Stored odds are arrays in both backends
+for backend in ['graph', 'columnar']:
+    network = RoundRobinNetwork(teams=12, days_between_rounds=3, seed=7, backend=backend)
+    network.add_odds('bookmaker', SimpleBookmaker(error=ForecastNullError(), margin=BookmakerMargin(0.05)),
+                     'true_forecast')
+    stored_odds = np.array([d['odds']['bookmaker'] for a, h, k, d in network.iterate_over_games()])
+    expected_odds = BookmakerMargin(0.05).apply(true_probabilities)
+    assert np.allclose(stored_odds, expected_odds)
+    print(f"{backend}: {len(stored_odds)} stored odds")
@@ -0,0 +1,76 @@
+import numpy as np
+
+from dfg_rating.model.betting.betting import KellyBetting
+from dfg_rating.model.bookmaker.base_bookmaker import SimpleBookmaker, BookmakerMargin
+from dfg_rating.model.evaluators.accuracy import RankProbabilityScore, Likelihood
+from dfg_rating.model.evaluators.profitability import BettingReturnsEvaluator
+from dfg_rating.model.forecast.forecast_error import ForecastSimulatedError
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+outcomes = ['home', 'draw', 'away']
+
+
+def build(backend):
+    network = LeagueNetwork(
+        teams=10, seasons=3, league_teams=10, league_promotion=0, days_between_rounds=3, seed=7, backend=backend
+    )
+    network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating')
+    network.add_forecast(
+        LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006),
+        'elo_forecast', 'elo_rating'
+    )
+    network.add_odds(
+        'bookmaker',
+        SimpleBookmaker(error=ForecastSimulatedError(error='normal', loc=0, scale=0.1), margin=BookmakerMargin(0.05)),
+        'true_forecast'
+    )
+    network.add_bets('bettor', 'bookmaker', KellyBetting(1000), 'elo_forecast')
+    network.add_evaluation([
+        (RankProbabilityScore(outcomes=outcomes, forecast_name='elo_forecast'), 'RPS'),
+        (Likelihood(outcomes=outcomes, forecast_name='elo_forecast'), 'Likelihood'),
+        (BettingReturnsEvaluator(
+            outcomes=outcomes, player_name='bettor', true_model='true_forecast', bookmaker_name='bookmaker'
+        ), 'returns')
+    ])
+    return network
+
+
+def matches(network):
+    return [
+        (
+            a, h, d['season'], d['round'], d['day'], d.get('winner'),
+            {name: np.asarray(f.probabilities).tolist() for name, f in d.get('forecasts', {}).items()},
+            {name: np.asarray(o).tolist() for name, o in d.get('odds', {}).items()},
+            {name: np.asarray(b).tolist() for name, b in d.get('bets', {}).items()},
+            {name: np.asarray(m).tolist() for name, m in d.get('metrics', {}).items()}
+        ) for a, h, k, d in network.iterate_over_games()
+    ]
+
+
+graph_network = build('graph')
+columnar_network = build('columnar')
+
+graph_matches, columnar_matches = matches(graph_network), matches(columnar_network)
+print(f"{len(graph_matches)} graph matches, {len(columnar_matches)} columnar matches")
+assert graph_matches == columnar_matches
+
+for team, attributes in graph_network.node_attributes.items():
+    for rating_name in ['true_rating', 'elo_rating']:
+        for season in graph_network.get_seasons():
+            assert np.array_equal(
+                attributes['ratings'][rating_name][season],
+                columnar_network.node_attributes[team]['ratings'][rating_name][season]
+            ), f"{rating_name} of team {team} in season {season} differs"
+print(f"Ratings of {len(graph_network.node_attributes)} teams are equal")
+
+# Both backends hand out the same types and the graph of the columnar backend is read-only
+a, h, k, d = columnar_network.iterate_over_games()[0]
+assert isinstance(d['odds']['bookmaker'], np.ndarray)
+assert isinstance(graph_network.iterate_over_games()[0][3]['odds']['bookmaker'], np.ndarray)
+try:
+    columnar_network.data.edges[a, h, k]['winner'] = 'home'
+    raise AssertionError("Columnar match attributes are writable")
+except TypeError:
+    print("Columnar match attributes are read-only")
@@ -0,0 +1,15 @@
+import time
+
+from dfg_rating.model.network.simple_network import RoundRobinNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+for backend in ['graph', 'columnar']:
+    start_time = time.time()
+    network = RoundRobinNetwork(
+        teams=40,
+        days_between_rounds=3,
+        backend=backend
+    )
+    network.add_rating(ELORating(trained=True), 'elo_rating', season=0)
+    network.export(ratings=['true_rating', 'elo_rating'], filename=f'network_{backend}.csv')
+    print(f"{backend} backend: {len(network.data.edges)} matches in {time.time() - start_time} seconds")
@@ -0,0 +1,33 @@
+import numpy as np
+
+from dfg_rating.model.network.random_network import ConfigurationModelNetwork, chung_lu_pairs
+
+# Mean degrees of the sampled graphs against the expected degrees of the Chung-Lu model
+weights = np.array([1, 2, 3, 4, 5, 6, 8, 10, 12, 15], dtype=float)
+probabilities = np.minimum(np.outer(weights, weights) / weights.sum(), 1)
+np.fill_diagonal(probabilities, 0)
+expected_degrees = probabilities.sum(axis=1)
+generator = np.random.default_rng(3)
+n_samples = 4000
+degrees = np.zeros(len(weights))
+for _ in range(n_samples):
+    u, v = chung_lu_pairs(weights, generator)
+    assert np.all(u < v)
+    degrees += np.bincount(np.concatenate([u, v]), minlength=len(weights))
+degrees /= n_samples
+print(f"Mean degrees {np.round(degrees, 2)}")
+print(f"Expected degrees {np.round(expected_degrees, 2)}")
+assert np.allclose(degrees, expected_degrees, atol=0.1)
+
+# Both legs of a linked pair are played, the others are inactive
+for backend in ['graph', 'columnar']:
+    network = ConfigurationModelNetwork(
+        teams=16, days_between_rounds=3, seed=5, expected_matches=6, variance_matches=2, backend=backend
+    )
+    active = {(a, h) for a, h, k, d in network.iterate_over_games()}
+    inactive = {(a, h) for a, h, k, d in network.inactive_edges()}
+    assert all((h, a) in active for a, h in active)
+    assert not active & inactive
+    assert len(active) + len(inactive) == 16 * 15
+    degrees = np.bincount([a for a, h in active], minlength=16)
+    print(f"{backend}: {len(active) // 2} linked pairs, degrees {degrees.tolist()}")
@@ -0,0 +1,66 @@
+import numpy as np
+
+from dfg_rating.model.network.base_network import SeasonFilter
+from dfg_rating.model.network.random_network import RandomNetwork
+from dfg_rating.model.rating.controlled_trend_rating import ControlledTrendRating, ControlledRandomFunction
+
+
+def new_rating():
+    return ControlledTrendRating(
+        starting_point=ControlledRandomFunction(
+            distribution='normal', loc=1000, scale=150, random_number_generator=np.random.default_rng(1)
+        ),
+        delta=ControlledRandomFunction(
+            distribution='normal', loc=0, scale=.5, random_number_generator=np.random.default_rng(2)
+        ),
+        trend=ControlledRandomFunction(
+            distribution='normal', loc=0, scale=.2, random_number_generator=np.random.default_rng(3)
+        ),
+        season_delta=ControlledRandomFunction(
+            distribution='normal', loc=0, scale=30, random_number_generator=np.random.default_rng(4)
+        )
+    )
+
+
+for backend in ['graph', 'columnar']:
+    # Teams left out of some rounds, so the days between two matches of a team vary
+    network = RandomNetwork(teams=12, days_between_rounds=3, seed=7, edge_probability=0.6, backend=backend)
+    rating = new_rating()
+    network.add_rating(rating, 'controlled_rating', season=0)
+    n_rounds, round_values = network.get_rounds()
+    teams = list(range(network.n_teams))
+    stored = np.array([network.node_attributes[t]['ratings']['controlled_rating'][0] for t in teams])
+
+    # Match by match reference: rounds in order, matches by away team, the away team first, and the daily deltas
+    # between two matches of a team drawn one day after another
+    deltas = np.random.default_rng(2)
+    trends = np.array([rating.props[t]['trends'][0] for t in teams])
+    games = sorted(
+        [(d['round'], a, h, d['day']) for a, h, k, d in network.iterate_over_games() if 0 <= d['round'] < n_rounds],
+        key=lambda g: (g[0], g[1])
+    )
+    last_day = np.zeros(len(teams), dtype=np.int64)
+    expected = np.zeros([len(teams), n_rounds + 2])
+    expected[:, 0] = stored[:, 0]
+    for r in range(n_rounds):
+        changes = np.zeros(len(teams))
+        for game_round, away, home, day in games:
+            if game_round != r:
+                continue
+            for team in [away, home]:
+                gap = day - last_day[team]
+                changes[team] += trends[team] * gap + deltas.normal(loc=0, scale=.5, size=gap).sum()
+                last_day[team] = day
+        expected[:, r + 1] = expected[:, r] + changes
+        expected[:, r + 1] *= rating.rating_mean / np.mean(expected[:, r + 1])
+    expected[:, -1] = expected[:, -2]
+
+    difference = np.max(np.abs(stored - expected))
+    print(f"{backend}: {len(games)} matches, max vectorized-reference difference {difference}")
+    assert difference < 1e-9
+
+    # Ratings of a few teams are the rows of the ratings of all the teams
+    subset = [2, 5, 7]
+    subset_ratings, props = new_rating().get_ratings(network, subset, SeasonFilter(0))
+    assert np.array_equal(subset_ratings, stored[subset])
+    print(f"{backend}: get_ratings of teams {subset} equal to their rows")
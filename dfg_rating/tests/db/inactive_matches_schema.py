@@ -0,0 +1,38 @@
+from dfg_rating.db.postgres import PostgreSQLDriver
+from dfg_rating.logic.controller import Controller
+from dfg_rating.model.network.random_network import RandomNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+network_name = "inactive_schema_network"
+
+# A database created before inactive matches were stored has no inactive_matches table
+driver = PostgreSQLDriver(config_file='test_database.ini')
+driver.connect()
+driver.execute_query(query="DELETE FROM networks WHERE network_name = %s", params=(network_name,), commit=True)
+driver.execute_query(query="DROP TABLE IF EXISTS inactive_matches", commit=True)
+tables = [row['table_name'] for row in driver.execute_query(file_name="../data/sql/setup/get_tables_list.sql")]
+assert 'inactive_matches' not in tables and 'matches' in tables
+driver.close()
+
+network = RandomNetwork(teams=10, days_between_rounds=3, seed=3, edge_probability=0.5)
+network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating')
+mc = Controller()
+mc.db = PostgreSQLDriver(config_file='test_database.ini')
+mc.networks[network_name] = network
+print(mc.save_network(network_name))
+mc.close()
+
+mc = Controller()
+mc.db = PostgreSQLDriver(config_file='test_database.ini')
+print(mc.load_network_from_sql(network_name))
+loaded = mc.networks[network_name]
+assert len(network.inactive_edges()) > 0
+assert sorted(loaded.inactive_edges()) == sorted(
+    (str(a), str(h), k, d) for a, h, k, d in network.inactive_edges()
+), "Inactive matches lost on the old schema"
+assert sorted((a, h, d['winner']) for a, h, k, d in loaded.iterate_over_games()) == sorted(
+    (str(a), str(h), d['winner']) for a, h, k, d in network.iterate_over_games()
+)
+print(f"{len(loaded.inactive_edges())} inactive and {len(loaded.iterate_over_games())} active matches restored")
+mc.db.execute_query(query="DELETE FROM networks WHERE network_name = %s", params=(network_name,), commit=True)
+mc.close()
@@ -0,0 +1,100 @@
+import gc
+
+import numpy as np
+import psycopg2
+
+from dfg_rating.db.postgres import PostgreSQLDriver
+from dfg_rating.logic.controller import Controller
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.network.simple_network import RoundRobinNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+network_names = ["prepared_round_robin", "prepared_league"]
+
+
+def matches(network):
+    return sorted(
+        (str(a), str(h), int(d['season']), int(d['round']), int(d['day']), d.get('winner'))
+        for a, h, k, d in network.iterate_over_games()
+    )
+
+
+def ratings(network):
+    return {
+        (str(team), rating_name, int(season)): np.asarray(values).tolist()
+        for team, attributes in network.node_attributes.items()
+        for rating_name, seasons in attributes['ratings'].items() if rating_name != 'hyper_parameters'
+        for season, values in seasons.items()
+    }
+
+
+def delete_networks(driver):
+    driver.execute_query(
+        query="DELETE FROM networks WHERE network_name = ANY(%s)", params=(network_names,), commit=True
+    )
+
+
+networks = {
+    "prepared_round_robin": RoundRobinNetwork(teams=10, days_between_rounds=3, seed=7),
+    "prepared_league": LeagueNetwork(
+        teams=8, seasons=2, league_teams=8, league_promotion=0, days_between_rounds=3, seed=7
+    )
+}
+mc = Controller()
+mc.db = PostgreSQLDriver(config_file='test_database.ini')
+mc.db.connect()
+delete_networks(mc.db)
+for name, network in networks.items():
+    network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating')
+    mc.networks[name] = network
+    mc.save_network(name)
+mc.close()
+
+# One prepared ANY($1) query per table against one query per network
+single = Controller()
+single.db = PostgreSQLDriver(config_file='test_database.ini')
+for name in network_names:
+    single.load_network_from_sql(name)
+many = Controller()
+many.db = PostgreSQLDriver(config_file='test_database.ini')
+print(many.load_networks_from_sql(network_names))
+everything = Controller()
+everything.db = PostgreSQLDriver(config_file='test_database.ini')
+print(everything.load_all_database())
+for name in network_names:
+    assert matches(many.networks[name]) == matches(single.networks[name]) == matches(everything.networks[name])
+    assert ratings(many.networks[name]) == ratings(single.networks[name]) == ratings(everything.networks[name])
+    assert matches(many.networks[name]) == sorted(
+        (str(a), str(h), int(d['season']), int(d['round']), int(d['day']), d.get('winner'))
+        for a, h, k, d in networks[name].iterate_over_games()
+    )
+    print(f"{name}: {len(matches(many.networks[name]))} matches loaded alike one by one and at once")
+
+# Pooled connections closed above min_connections leave no prepared statements behind
+driver = PostgreSQLDriver(config_file='test_database.ini', min_connections=1, max_connections=4)
+driver.connect()
+query = "SELECT n.network_name FROM public.networks n WHERE n.network_name = ANY($1)"
+borrowed = [driver.pool.getconn() for _ in range(3)]
+for connection in borrowed:
+    driver.pool.putconn(connection)
+del borrowed, connection
+for _ in range(3):
+    assert len(driver.execute_prepared("churn", query, (network_names,))) == 2
+gc.collect()
+assert all(not connection.closed for connection in driver.prepared_statements.keys())
+
+# A statement the server no longer knows is prepared again
+driver.execute_query(query="DEALLOCATE ALL", commit=True)
+assert len(driver.execute_prepared("churn", query, (network_names,))) == 2
+print("Prepared statements tracked on the pooled connections and prepared again after DEALLOCATE")
+
+# Errors are raised, not returned as empty results
+try:
+    driver.execute_prepared("broken", "SELECT * FROM public.missing_table")
+    raise AssertionError("No error raised")
+except psycopg2.errors.UndefinedTable:
+    print("Missing table error raised")
+assert len(driver.execute_prepared("churn", query, (network_names,))) == 2
+
+delete_networks(driver)
+driver.close()
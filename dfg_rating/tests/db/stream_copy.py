@@ -0,0 +1,107 @@
+import numpy as np
+
+from dfg_rating.db.postgres import PostgreSQLDriver
+from dfg_rating.logic.controller import Controller, SERIALIZED_TABLES
+from dfg_rating.model.betting.betting import FixedBetting
+from dfg_rating.model.bookmaker.base_bookmaker import SimpleBookmaker, BookmakerMargin
+from dfg_rating.model.evaluators.accuracy import RankProbabilityScore
+from dfg_rating.model.forecast.forecast_error import ForecastNullError
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.simple_network import RoundRobinNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+network_name = "stream_copy_network"
+outcomes = ['home', 'draw', 'away']
+
+
+def matches(network):
+    return sorted(
+        (
+            str(a), str(h), int(d['season']), int(d['day']), d.get('winner'),
+            {name: np.round(f.probabilities, 6).tolist() for name, f in d.get('forecasts', {}).items()},
+            {name: np.round(o, 6).tolist() for name, o in d.get('odds', {}).items()},
+            {name: np.round(b, 6).tolist() for name, b in d.get('bets', {}).items()},
+            {name: round(float(m), 6) for name, m in d.get('metrics', {}).items()}
+        ) for a, h, k, d in network.iterate_over_games()
+    )
+
+
+def ratings(network):
+    return {
+        (str(team), rating_name): np.asarray(attributes['ratings'][rating_name][0]).tolist()
+        for team, attributes in network.node_attributes.items() for rating_name in ['true_rating', 'elo_rating']
+    }
+
+
+def count(driver, table_name):
+    return driver.execute_query(
+        query=f"SELECT count(*) FROM public.{table_name} t WHERE t.network_name = %s", params=(network_name,)
+    )[0][0]
+
+
+network = RoundRobinNetwork(teams=12, days_between_rounds=3, seed=7)
+network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating')
+network.add_forecast(
+    LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006),
+    'elo_forecast', 'elo_rating'
+)
+network.add_odds('bookmaker', SimpleBookmaker(error=ForecastNullError(), margin=BookmakerMargin(0.05)), 'true_forecast')
+network.add_bets('bettor', 'bookmaker', FixedBetting(1000), 'elo_forecast')
+network.add_evaluation([(RankProbabilityScore(outcomes=outcomes, forecast_name='elo_forecast'), 'RPS')])
+serialized = network.serialize_network(network_name)
+
+# Small chunks so that streaming and copying take several round trips
+mc = Controller()
+mc.db = PostgreSQLDriver(config_file='test_database.ini', itersize=7, copy_size=50)
+mc.db.connect()
+mc.db.execute_query(query="DELETE FROM networks WHERE network_name = %s", params=(network_name,), commit=True)
+mc.networks[network_name] = network
+mc.save_network(network_name)
+counts = {table_name: count(mc.db, table_name) for table_name in serialized}
+assert counts == {table_name: len(rows) for table_name, rows in serialized.items()}, counts
+print(f"Copied {counts}")
+
+# Saving again skips the existing keys, new rows of a partly copied table go in
+mc.save_network(network_name)
+assert {table_name: count(mc.db, table_name) for table_name in serialized} == counts
+first_match = mc.db.execute_query(
+    query="SELECT * FROM public.matches t WHERE t.network_name = %s AND t.match_id = %s",
+    params=(network_name, serialized['matches'][0]['match_id'])
+)[0]
+mc.db.execute_query(
+    query="DELETE FROM public.metrics t WHERE t.network_name = %s AND t.match_id = %s",
+    params=(network_name, serialized['metrics'][0]['match_id']), commit=True
+)
+changed_matches = [dict(serialized['matches'][0], winner='draw' if first_match['winner'] != 'draw' else 'home')]
+mc.db.copy_many('matches', serialized['matches'][0].keys(), changed_matches + serialized['matches'][1:])
+mc.db.copy_many('metrics', serialized['metrics'][0].keys(), serialized['metrics'])
+assert {table_name: count(mc.db, table_name) for table_name in serialized} == counts
+assert mc.db.execute_query(
+    query="SELECT * FROM public.matches t WHERE t.network_name = %s AND t.match_id = %s",
+    params=(network_name, serialized['matches'][0]['match_id'])
+)[0] == first_match
+print("Duplicated keys skipped by the ON CONFLICT staging table")
+
+# Streamed loading against loading whole tables with fetchall
+mc.load_network_from_sql(network_name, "streamed")
+db_network = mc.db.execute_query(
+    query="SELECT * FROM public.networks n WHERE n.network_name = %s", params=(network_name,)
+)[0]
+fetched = RoundRobinNetwork(create=False, play=False)
+fetched.deserialize_network(
+    rounds=db_network['rounds'], seasons=db_network['seasons'], days=db_network['days_between_rounds'],
+    **{
+        table_name: mc.db.execute_query(
+            query=f"SELECT * FROM public.{table_name} t WHERE t.network_name = %s", params=(network_name,)
+        ) for table_name in SERIALIZED_TABLES
+    }
+)
+streamed = mc.networks["streamed"]
+assert matches(streamed) == matches(fetched) == matches(network)
+assert ratings(streamed) == ratings(fetched)
+# Rating values are stored as REAL
+assert all(np.allclose(ratings(streamed)[key], values, rtol=1e-6) for key, values in ratings(network).items())
+print(f"Streamed and fetched networks equal: {len(matches(streamed))} matches")
+
+mc.db.execute_query(query="DELETE FROM networks WHERE network_name = %s", params=(network_name,), commit=True)
+mc.close()
@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+
+from dfg_rating.model.network.base_network import group_by_match
+from dfg_rating.model.betting.betting import FixedBetting
+from dfg_rating.model.bookmaker.base_bookmaker import SimpleBookmaker, BookmakerMargin
+from dfg_rating.model.evaluators.accuracy import RankProbabilityScore
+from dfg_rating.model.forecast.forecast_error import ForecastNullError
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.simple_network import RoundRobinNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+outcomes = ['home', 'draw', 'away']
+
+
+def matches(network):
+    return sorted(
+        (
+            str(a), str(h), int(d['season']), int(d['day']), d.get('winner'),
+            {name: np.round(f.probabilities, 12).tolist() for name, f in d.get('forecasts', {}).items()},
+            {name: np.round(o, 12).tolist() for name, o in d.get('odds', {}).items()},
+            {name: np.round(b, 12).tolist() for name, b in d.get('bets', {}).items()},
+            {name: round(float(m), 12) for name, m in d.get('metrics', {}).items()}
+        ) for a, h, k, d in network.iterate_over_games()
+    )
+
+
+network = RoundRobinNetwork(teams=12, days_between_rounds=3, seed=7)
+network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating')
+network.add_forecast(
+    LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006),
+    'elo_forecast', 'elo_rating'
+)
+network.add_odds('bookmaker', SimpleBookmaker(error=ForecastNullError(), margin=BookmakerMargin(0.05)), 'true_forecast')
+network.add_bets('bettor', 'bookmaker', FixedBetting(1000), 'elo_forecast')
+network.add_evaluation([(RankProbabilityScore(outcomes=outcomes, forecast_name='elo_forecast'), 'RPS')])
+
+serialized = network.serialize_network('round_robin')
+# Attributes as read from the JSONB columns of the database
+for table_name in ['forecasts', 'odds', 'bets', 'metrics']:
+    for row in serialized[table_name]:
+        row['attributes'] = json.loads(row['attributes'])
+
+# Child tables passed as lists of rows, then already grouped by match
+for grouped in [False, True]:
+    tables = {
+        table_name: group_by_match(serialized[table_name]) if grouped else serialized[table_name]
+        for table_name in ['forecasts', 'odds', 'bets', 'metrics']
+    }
+    loaded = RoundRobinNetwork(create=False, play=False)
+    loaded.deserialize_network(
+        rounds=network.n_rounds, seasons=network.seasons, days=network.days_between_rounds,
+        matches=serialized['matches'], ratings=serialized['ratings'], **tables
+    )
+    assert matches(loaded) == matches(network), "Deserialized matches differ"
+    for team, attributes in network.node_attributes.items():
+        for rating_name in ['true_rating', 'elo_rating']:
+            assert np.allclose(loaded.node_attributes[team]['ratings'][rating_name][0],
+                               attributes['ratings'][rating_name][0])
+    print(f"{'Grouped' if grouped else 'Listed'} child tables: {len(serialized['matches'])} matches and "
+          f"{len(serialized['ratings'])} rating rows restored")
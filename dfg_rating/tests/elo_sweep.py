@@ -0,0 +1,30 @@
+import numpy as np
+
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+ks = [10, 20, 30]
+cs = [8.0, 10.0]
+
+for backend in ['graph', 'columnar']:
+    network = LeagueNetwork(
+        teams=10, seasons=3, league_teams=10, league_promotion=0, days_between_rounds=3, seed=7, backend=backend
+    )
+    # Ratings of later seasons start from the ratings stored under <rating_name>
+    sweep = ELORating(trained=True, param_k=ks, param_c=cs, rating_name='elo_rating_{k}_{c}')
+    network.add_rating(sweep, 'elo_rating_{k}_{c}')
+    names = sweep.sweep_names()
+    assert len(names) == len(ks) * len(cs)
+    for k in ks:
+        for c in cs:
+            single_name = f"single_elo_rating_{k}_{c}"
+            network.add_rating(ELORating(trained=True, param_k=k, param_c=c, rating_name=single_name), single_name)
+    differences = []
+    for name in names:
+        for team, attributes in network.node_attributes.items():
+            for season in network.get_seasons():
+                swept = np.asarray(attributes['ratings'][name][season])
+                single = np.asarray(attributes['ratings'][f"single_{name}"][season])
+                differences.append(np.max(np.abs(swept - single)))
+    print(f"{backend}: {len(names)} swept ratings {names}, max sweep-single difference {np.max(differences)}")
+    assert np.max(differences) < 1e-9
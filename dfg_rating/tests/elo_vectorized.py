@@ -0,0 +1,35 @@
+import numpy as np
+
+from dfg_rating.model.network.random_network import RandomNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+for backend in ['graph', 'columnar']:
+    # Teams left out of some rounds keep their rating
+    network = RandomNetwork(teams=14, days_between_rounds=3, seed=7, edge_probability=0.6, backend=backend)
+    rating = ELORating(trained=True, param_k=20, param_c=10, param_d=400, param_w=80)
+    network.add_rating(rating, 'elo_rating', season=0)
+    n_rounds, round_values = network.get_rounds()
+    teams = list(network.node_attributes)
+    stored = np.array([network.node_attributes[t]['ratings']['elo_rating'][0] for t in teams])
+
+    # Match by match reference with the scalar ELO functions
+    current = {team: rating.rating_mean for team in teams}
+    expected = np.zeros([len(teams), n_rounds + 2])
+    expected[:, 0] = rating.rating_mean
+    games = sorted(network.iterate_over_games(), key=lambda g: g[3]['round'])
+    for r in range(n_rounds):
+        for away, home, key, d in games:
+            if d['round'] != r:
+                continue
+            home_expected, away_expected = rating.compute_expected_values(current[home], current[away])
+            home_score, away_score = rating.compute_scores(d['winner'])
+            current[home], current[away] = (
+                rating.update_elo(current[home], home_score, home_expected, d),
+                rating.update_elo(current[away], away_score, away_expected, d)
+            )
+        expected[:, r + 1] = [current[team] for team in teams]
+    expected[:, -1] = expected[:, -2]
+
+    difference = np.max(np.abs(stored - expected))
+    print(f"{backend}: {len(games)} matches in {n_rounds} rounds, max vectorized-reference difference {difference}")
+    assert difference < 1e-9
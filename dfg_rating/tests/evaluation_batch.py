@@ -0,0 +1,46 @@
+import numpy as np
+
+from dfg_rating.model.evaluators.accuracy import RankProbabilityScore, Likelihood, ForecastError, \
+    ExpectedRankProbabilityScore, ProbabilityDifference
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.simple_network import RoundRobinNetwork
+
+outcomes = ['home', 'draw', 'away']
+evaluators = [
+    (RankProbabilityScore(outcomes=outcomes, forecast_name='elo_forecast'), 'RPS'),
+    (Likelihood(outcomes=outcomes, forecast_name='elo_forecast'), 'Likelihood'),
+    (ForecastError(outcomes=outcomes, forecast_name='elo_forecast'), 'ForecastError'),
+    (ExpectedRankProbabilityScore(outcomes=outcomes, forecast_name='elo_forecast'), 'ExpectedRPS'),
+    (ProbabilityDifference(outcomes=outcomes, forecast_name='elo_forecast'), 'ProbabilityDifference'),
+]
+
+for backend in ['graph', 'columnar']:
+    network = RoundRobinNetwork(teams=12, days_between_rounds=3, seed=7, backend=backend)
+    network.add_forecast(
+        LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006),
+        'elo_forecast', 'true_rating'
+    )
+    # Leave the last rounds of the season unplayed
+    games = network.iterate_over_games()
+    unplayed = [(a, h, k) for a, h, k, d in games if d['round'] >= network.n_rounds]
+    if network.matches is not None:
+        network.matches.set_winner([k for _, _, k in unplayed], [None] * len(unplayed))
+    else:
+        for a, h, k in unplayed:
+            network.data.edges[a, h, k].pop('winner')
+    network.add_evaluation(evaluators)
+
+    unplayed = set(unplayed)
+    for evaluator, evaluator_name in evaluators:
+        differences = []
+        for a, h, k, d in network.iterate_over_games():
+            stored = d.get('metrics', {}).get(evaluator_name)
+            correct, expected = evaluator.eval(d)
+            if (a, h, k) in unplayed and evaluator.uses_result:
+                assert stored is None and expected is None, f"{evaluator_name} scored an unplayed match"
+            else:
+                differences.append(abs(stored - expected))
+        print(f"{backend} {evaluator_name}: {len(differences)} scored matches, max batch-scalar difference "
+              f"{np.max(differences)}")
+        assert np.max(differences) < 1e-12
+    print(f"{backend}: {len(unplayed)} unplayed matches")
@@ -0,0 +1,38 @@
+import numpy as np
+
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast, BradleyTerryForecast
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+outcomes = ['home', 'draw', 'away']
+forecasts = [
+    (LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006), 'log_forecast'),
+    (BradleyTerryForecast(outcomes=outcomes, exponent=10, ha=100), 'bradley_terry_forecast'),
+]
+
+for backend in ['graph', 'columnar']:
+    network = LeagueNetwork(
+        teams=10, seasons=2, league_teams=10, league_promotion=0, days_between_rounds=3, seed=7, backend=backend
+    )
+    # Ratings of the first season only, the matches of the second one have no rating to forecast from
+    network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating', season=0)
+    n_rounds, round_values = network.get_rounds()
+    for forecast, forecast_name in forecasts:
+        network.add_forecast(forecast, forecast_name, 'elo_rating')
+        differences = []
+        unrated = 0
+        for a, h, k, d in network.iterate_over_games():
+            stored = d.get('forecasts', {}).get(forecast_name)
+            if d['season'] > 0:
+                assert stored is None, f"{forecast_name} forecast of a match without ratings"
+                unrated += 1
+                continue
+            expected = forecast.get_forecast(
+                match_data=d, home_team=network.node_attributes[h], away_team=network.node_attributes[a],
+                base_ranking='elo_rating', round_values=round_values
+            )
+            differences.append(np.max(np.abs(np.asarray(stored.probabilities) - expected)))
+        print(f"{backend} {forecast_name}: {len(differences)} forecasts, {unrated} unrated matches left out, "
+              f"max batch-scalar difference {np.max(differences)}")
+        assert unrated > 0
+        assert np.max(differences) < 1e-12
@@ -0,0 +1,48 @@
+from copy import deepcopy
+
+import numpy as np
+
+from dfg_rating.model.forecast.base_forecast import ForecastRow, SimpleForecast
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+outcomes = ['home', 'draw', 'away']
+
+for backend in ['graph', 'columnar']:
+    network = LeagueNetwork(
+        teams=10, seasons=2, league_teams=10, league_promotion=0, days_between_rounds=3, seed=7, backend=backend
+    )
+    network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating')
+    n_rounds, round_values = network.get_rounds()
+    forecasts = [
+        (LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006), 'elo_forecast'),
+        (SimpleForecast(outcomes=outcomes, probs=[0.4523, 0.2975, 0.2502]), 'simple_forecast'),
+    ]
+    for forecast, forecast_name in forecasts:
+        network.add_forecast(forecast, forecast_name, 'elo_rating')
+        # Each match used to keep its own deepcopy of the forecast, computed on the ratings of the match
+        differences = []
+        for a, h, k, d in network.iterate_over_games():
+            stored = d['forecasts'][forecast_name]
+            match_forecast = deepcopy(forecast)
+            match_forecast.get_forecast(
+                match_data=d, home_team=network.node_attributes[h], away_team=network.node_attributes[a],
+                base_ranking='elo_rating', round_values=round_values
+            )
+            if backend == 'graph':
+                # Columnar matches build their forecasts out of the stacked probabilities
+                assert isinstance(stored, ForecastRow) and stored.definition is forecast
+                assert stored.type == match_forecast.type
+            assert list(stored.outcomes) == list(match_forecast.outcomes)
+            differences.append(np.max(np.abs(np.asarray(stored.probabilities) - match_forecast.probabilities)))
+        print(f"{backend} {forecast_name}: {len(differences)} forecast rows, "
+              f"max difference with the deepcopied forecasts {np.max(differences)}")
+        assert np.max(differences) < 1e-12
+
+    # Rows of different matches do not share their probabilities
+    games = network.iterate_over_games()
+    rows = [d['forecasts']['elo_forecast'] for a, h, k, d in games]
+    assert len({tuple(np.round(r.probabilities, 12)) for r in rows}) > 1
+    first = games[0][3]['forecasts']['elo_forecast'].probabilities
+    assert not any(np.shares_memory(first, r.probabilities) for r in rows[1:])
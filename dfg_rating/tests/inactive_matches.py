@@ -0,0 +1,37 @@
+import json
+import tempfile
+
+from dfg_rating.model.network.random_network import RandomNetwork
+from dfg_rating.model.network.simple_network import RoundRobinNetwork
+
+for backend in ['graph', 'columnar']:
+    network = RandomNetwork(teams=10, days_between_rounds=3, seed=3, edge_probability=0.5, backend=backend)
+    inactive = network.inactive_edges()
+    print(f"{backend}: {len(network.iterate_over_games())} active and {len(inactive)} inactive matches")
+    assert len(inactive) > 0
+
+    # Parquet round trip
+    with tempfile.TemporaryDirectory() as path:
+        network.to_parquet(path, 'random_network')
+        for load_backend in ['graph', 'columnar']:
+            loaded = RoundRobinNetwork(create=False, play=False, backend=load_backend)
+            loaded.from_parquet(path)
+            assert loaded.inactive_edges() == inactive, f"{backend} -> {load_backend} lost inactive matches"
+            assert len(loaded.iterate_over_games(include_inactive=True)) == \
+                len(network.iterate_over_games(include_inactive=True))
+            print(f"{backend} -> {load_backend} parquet: inactive matches restored")
+
+    # Serialized tables round trip, attributes as read from the database
+    serialized = network.serialize_network('random_network')
+    for table_name in ['forecasts', 'odds', 'bets', 'metrics']:
+        for row in serialized[table_name]:
+            row['attributes'] = json.loads(row['attributes'])
+    loaded = RoundRobinNetwork(create=False, play=False)
+    loaded.deserialize_network(
+        rounds=network.n_rounds, seasons=network.seasons, days=network.days_between_rounds,
+        matches=serialized['matches'], forecasts=serialized['forecasts'], ratings=serialized['ratings'],
+        odds=serialized['odds'], bets=serialized['bets'], metrics=serialized['metrics'],
+        inactive_matches=serialized['inactive_matches']
+    )
+    assert loaded.inactive_edges() == inactive, f"{backend} serialized network lost inactive matches"
+    print(f"{backend} serialized: {len(serialized['inactive_matches'])} inactive matches restored")
@@ -0,0 +1,22 @@
+import networkx as nx
+
+from dfg_rating.model.network.random_network import RandomNetwork
+
+for backend in ['graph', 'columnar']:
+    for edge_probability in [0.02, 0.3]:
+        network = RandomNetwork(
+            teams=30, days_between_rounds=3, seed=4, edge_probability=edge_probability, backend=backend
+        )
+        games = network.iterate_over_games(include_inactive=True)
+        # Graphs of the active matches and of all the generated matches, as the networks used to store them
+        active = nx.MultiDiGraph((a, h, k) for a, h, k, d in games if d.get('state', 'active') == 'active')
+        generated = nx.MultiDiGraph()
+        generated.add_nodes_from(network.data.nodes)
+        generated.add_edges_from((a, h) for a, h, k, d in games)
+
+        assert sorted(network.degree(filter_active=True)) == sorted(active.degree())
+        assert network.density(True) == nx.density(active)
+        assert sorted(network.degree()) == sorted(generated.degree())
+        assert network.density() == nx.density(generated)
+        print(f"{backend}, p={edge_probability}: {len(active)} of {len(generated)} teams with active matches, "
+              f"density {network.density(True):.4f} ({network.density():.4f} with inactive matches)")
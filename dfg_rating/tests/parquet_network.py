@@ -0,0 +1,66 @@
+import tempfile
+
+import numpy as np
+
+from dfg_rating.model.betting.betting import FixedBetting
+from dfg_rating.model.bookmaker.base_bookmaker import SimpleBookmaker, BookmakerMargin
+from dfg_rating.model.evaluators.accuracy import RankProbabilityScore
+from dfg_rating.model.forecast.forecast_error import ForecastSimulatedError
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.network.simple_network import RoundRobinNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+outcomes = ['home', 'draw', 'away']
+
+
+def matches(network):
+    return [
+        (
+            a, h, d['season'], d['round'], d['day'], d.get('winner'),
+            {name: np.asarray(f.probabilities).tolist() for name, f in d.get('forecasts', {}).items()},
+            {name: np.asarray(o).tolist() for name, o in d.get('odds', {}).items()},
+            {name: np.asarray(b).tolist() for name, b in d.get('bets', {}).items()},
+            {name: np.asarray(m).tolist() for name, m in d.get('metrics', {}).items()}
+        ) for a, h, k, d in network.iterate_over_games()
+    ]
+
+
+def ratings(network):
+    return {
+        team: {
+            rating_name: {season: np.asarray(values).tolist() for season, values in seasons.items()}
+            for rating_name, seasons in attributes['ratings'].items() if rating_name != 'hyper_parameters'
+        } for team, attributes in network.node_attributes.items()
+    }
+
+
+for backend in ['graph', 'columnar']:
+    network = LeagueNetwork(
+        teams=10, seasons=2, league_teams=10, league_promotion=0, days_between_rounds=3, seed=7, backend=backend
+    )
+    network.add_rating(ELORating(trained=True, param_k=20), 'elo_rating')
+    network.add_forecast(
+        LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006),
+        'elo_forecast', 'elo_rating'
+    )
+    network.add_odds(
+        'bookmaker',
+        SimpleBookmaker(error=ForecastSimulatedError(error='normal', loc=0, scale=0.1), margin=BookmakerMargin(0.05)),
+        'true_forecast'
+    )
+    network.add_bets('bettor', 'bookmaker', FixedBetting(1000), 'elo_forecast')
+    network.add_evaluation([(RankProbabilityScore(outcomes=outcomes, forecast_name='elo_forecast'), 'RPS')])
+
+    with tempfile.TemporaryDirectory() as path:
+        network.to_parquet(path, 'league')
+        for load_backend in ['graph', 'columnar']:
+            loaded = RoundRobinNetwork(create=False, play=False, backend=load_backend)
+            loaded.from_parquet(path)
+            assert (loaded.n_rounds, loaded.seasons, loaded.days_between_rounds, loaded.n_teams) == \
+                (network.n_rounds, network.seasons, network.days_between_rounds, network.n_teams)
+            assert list(loaded.node_attributes) == list(network.node_attributes)
+            assert matches(loaded) == matches(network), f"{backend} -> {load_backend} matches differ"
+            assert ratings(loaded) == ratings(network), f"{backend} -> {load_backend} ratings differ"
+            print(f"{backend} -> {load_backend}: {len(matches(loaded))} matches and ratings of "
+                  f"{len(loaded.node_attributes)} teams restored")
@@ -0,0 +1,30 @@
+from dfg_rating.model.network.simple_network import RoundRobinNetwork
+
+
+def winners(network):
+    return [(a, h, d['round'], d.get('winner')) for a, h, k, d in network.iterate_over_games()]
+
+
+for backend in ['graph', 'columnar']:
+    results = {}
+    for batch in [True, False]:
+        network = RoundRobinNetwork(teams=16, days_between_rounds=3, seed=7, play=False, backend=backend)
+        network.play(batch=batch)
+        results[batch] = winners(network)
+    played = sum(w is not None for _, _, _, w in results[True])
+    print(f"{backend}: {played} of {len(results[True])} matches played")
+    assert results[True] == results[False]
+    assert played == len(results[True])
+
+# Matches without a true forecast are left unplayed and do not consume draws
+results = {}
+for batch in [True, False]:
+    network = RoundRobinNetwork(teams=16, days_between_rounds=3, seed=7, play=False)
+    for a, h, k, d in network.iterate_over_games()[::5]:
+        network.data.edges[a, h, k]['forecasts'].pop('true_forecast')
+    network.play(batch=batch)
+    results[batch] = winners(network)
+unplayed = sum(w is None for _, _, _, w in results[True])
+print(f"{unplayed} matches without true forecast left unplayed")
+assert results[True] == results[False]
+assert unplayed == len(results[True][::5])
@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+import numpy as np
+
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+
+def build(**params):
+    network = LeagueNetwork(
+        teams=10, seasons=3, league_teams=10, league_promotion=0, days_between_rounds=3, seed=7, **params
+    )
+    network.add_rating(ELORating(trained=True, param_k=[10, 20]), 'elo_rating_{k}')
+    return network
+
+
+def ratings(network):
+    return {
+        (team, rating_name, season): np.asarray(values).tolist()
+        for team, attributes in network.node_attributes.items()
+        for rating_name, seasons in attributes['ratings'].items() if rating_name != 'hyper_parameters'
+        for season, values in seasons.items()
+    }
+
+
+in_memory = build()
+with tempfile.TemporaryDirectory() as path:
+    ratings_path = os.path.join(path, 'ratings.dat')
+    memory_mapped = build(ratings_path=ratings_path)
+    assert isinstance(memory_mapped.rating_store.values, np.memmap)
+    assert os.path.getsize(ratings_path) > 0
+    assert ratings(memory_mapped) == ratings(in_memory)
+    print(f"{len(ratings(in_memory))} team ratings equal in memory and in {ratings_path}")
+    del memory_mapped
+
+# Ratings are read through the store as (teams x rounds) matrices
+n_rounds, round_values = in_memory.get_rounds()
+teams = list(in_memory.node_attributes)
+for season in in_memory.get_seasons():
+    matrix = in_memory.rating_store.matrix('elo_rating_10', season, teams, n_rounds + 2)
+    assert np.array_equal(matrix, [in_memory.node_attributes[t]['ratings']['elo_rating_10'][season] for t in teams])
+assert set(in_memory.node_attributes[teams[0]]['ratings']) >= {'true_rating', 'elo_rating_10', 'elo_rating_20'}
+print(f"Rating matrices of {len(in_memory.get_seasons())} seasons match the team views")
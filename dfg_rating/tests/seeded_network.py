@@ -0,0 +1,58 @@
+import numpy as np
+
+from dfg_rating.model.betting.betting import FixedBetting
+from dfg_rating.model.bookmaker.base_bookmaker import SimpleBookmaker, BookmakerMargin
+from dfg_rating.model.forecast.forecast_error import ForecastSimulatedError
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.multiple_network import LeagueNetwork
+from dfg_rating.model.rating.base_rating import RatingFunctionError
+
+outcomes = ['home', 'draw', 'away']
+
+
+def build(seed, error_forecast=False):
+    network = LeagueNetwork(
+        teams=10, seasons=2, league_teams=10, league_promotion=0, days_between_rounds=3, seed=seed
+    )
+    if error_forecast:
+        # Draws from the forecast error generator only
+        network.add_forecast(LogFunctionForecast(
+            outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006,
+            home_team_error=RatingFunctionError(error='normal', loc=0, scale=50)
+        ), 'error_forecast', 'true_rating')
+    network.add_odds(
+        'bookmaker',
+        SimpleBookmaker(error=ForecastSimulatedError(error='normal', loc=0, scale=0.1), margin=BookmakerMargin(0.05)),
+        'true_forecast'
+    )
+    network.add_bets('bettor', 'bookmaker', FixedBetting(1000, ForecastSimulatedError(error='normal', scale=0.1)),
+                     'true_forecast')
+    return network
+
+
+def snapshot(network):
+    matches = [
+        (a, h, d['season'], d['round'], d.get('winner'), np.asarray(d['odds']['bookmaker']).tolist(),
+         np.asarray(d['bets']['bettor']).tolist()) for a, h, k, d in network.iterate_over_games()
+    ]
+    ratings = {
+        team: {season: np.asarray(values).tolist() for season, values in attributes['ratings']['true_rating'].items()}
+        for team, attributes in network.node_attributes.items()
+    }
+    return matches, ratings
+
+
+reference = snapshot(build(5))
+assert snapshot(build(5)) == reference, "Networks of the same seed differ"
+assert snapshot(build(np.random.SeedSequence(5))) == reference, "Networks of the same seed sequence differ"
+assert snapshot(build(6)) != reference, "Networks of different seeds are equal"
+print("Networks are reproducible from their seed")
+
+networks = [build(5, error_forecast=True) for _ in range(2)]
+error_forecasts = [
+    [d['forecasts']['error_forecast'].probabilities.tolist() for a, h, k, d in network.iterate_over_games()]
+    for network in networks
+]
+assert error_forecasts[0] == error_forecasts[1], "Forecast errors are not bound to the seed of the network"
+assert snapshot(networks[0]) == reference, "Forecast errors shift the draws of other components"
+print("Forecast errors leave the schedule, results, odds and bets unchanged")
@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+from dfg_rating.logic.runner import SimulationRunner
+from dfg_rating.model.evaluators.accuracy import RankProbabilityScore, Likelihood
+from dfg_rating.model.forecast.true_forecast import LogFunctionForecast
+from dfg_rating.model.network.random_network import RandomRoundsNetwork
+from dfg_rating.model.rating.elo_rating import ELORating
+
+outcomes = ['home', 'draw', 'away']
+
+
+def configuration(teams, k, network='round-robin', **network_params):
+    return {
+        "network": network,
+        "network_params": {"teams": teams, "days_between_rounds": 3, **network_params},
+        "ratings": [(ELORating(trained=True, param_k=k), f"elo_rating_{k}")],
+        "forecasts": [(
+            LogFunctionForecast(outcomes=outcomes, coefficients=[-0.9, 0.3], beta_parameter=0.006),
+            f"elo_forecast_{k}", f"elo_rating_{k}"
+        )],
+        "evaluators": [
+            (RankProbabilityScore(outcomes=outcomes, forecast_name=f"elo_forecast_{k}"), "RPS"),
+            (Likelihood(outcomes=outcomes, forecast_name=f"elo_forecast_{k}"), "Likelihood")
+        ],
+        "attributes": {"Teams": teams, "K": k}
+    }
+
+
+if __name__ == '__main__':
+    configurations = [configuration(teams, k) for teams in [10, 14] for k in [15, 25]] + [
+        configuration(12, 20, RandomRoundsNetwork, absolute_rounds=8)
+    ]
+    with tempfile.TemporaryDirectory() as path:
+        results = {}
+        for workers in [1, 3]:
+            file_path = os.path.join(path, f"runner_{workers}.csv")
+            n_rows = SimulationRunner(configurations, replications=3, seed=42, workers=workers).run(file_path)
+            with open(file_path) as results_file:
+                results[workers] = results_file.read()
+            print(f"{workers} workers: {n_rows} match rows")
+        assert results[1] == results[3], "Results depend on the number of workers"
+        print("Results are independent of the number of workers")
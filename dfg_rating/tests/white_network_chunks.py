@@ -0,0 +1,53 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from dfg_rating.model import factory
+from dfg_rating.model.network.base_network import WhiteNetwork
+
+file_path = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'real', 'ATP_Network_2010_2019.csv')
+n_rows = 3000
+mapping = factory.pre_mappings['atp']
+
+
+def snapshot(network):
+    # Missing odds are NaN, compared as -1
+    matches = sorted(
+        (str(a), str(h), d['season'], d['day'], d.get('winner'), sorted(
+            (name, np.nan_to_num(np.asarray(o, dtype=float), nan=-1).tolist()) for name, o in d.get('odds', {}).items()
+        )) for a, h, k, d in network.iterate_over_games()
+    )
+    ratings = {
+        (str(team), rating_name, season): np.asarray(values).tolist()
+        for team, attributes in network.node_attributes.items()
+        for rating_name, seasons in attributes.get('ratings', {}).items() if rating_name != 'hyper_parameters'
+        for season, values in seasons.items()
+    }
+    return matches, ratings
+
+
+columns, dtypes = WhiteNetwork.mapping_columns(mapping)
+data = pd.read_csv(file_path, nrows=n_rows, usecols=lambda c: c in columns, dtype=dtypes)
+# Streamed files must be sorted by day
+sorted_file = tempfile.NamedTemporaryFile(suffix='.csv', delete=False)
+sorted_file.close()
+data.iloc[np.argsort(pd.to_datetime(data[mapping['day']]).to_numpy(), kind='stable')].to_csv(
+    sorted_file.name, index=False
+)
+
+for backend in ['graph', 'columnar']:
+    whole = WhiteNetwork(data=data.copy(), mapping=mapping, backend=backend)
+    chunks = pd.read_csv(sorted_file.name, chunksize=700, usecols=lambda c: c in columns, dtype=dtypes)
+    streamed = WhiteNetwork(data=chunks, mapping=mapping, backend=backend)
+    whole_matches, whole_ratings = snapshot(whole)
+    streamed_matches, streamed_ratings = snapshot(streamed)
+    print(f"{backend}: {len(whole_matches)} matches and {len(whole_ratings)} team ratings read whole, "
+          f"{len(streamed_matches)} matches and {len(streamed_ratings)} team ratings streamed")
+    assert whole_matches == streamed_matches
+    assert whole_ratings.keys() == streamed_ratings.keys()
+    assert all(np.array_equal(whole_ratings[k], streamed_ratings[k], equal_nan=True) for k in whole_ratings)
+    assert whole.get_seasons() == streamed.get_seasons()
+
+os.remove(sorted_file.name)
@@ -0,0 +1,160 @@
+import math
+import os
+import tempfile
+from collections.abc import Mapping
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from dfg_rating.model import factory
+from dfg_rating.model.network.base_network import WhiteNetwork
+
+
+def iterrows_network(data, mapping):
+    """Row by row reference of WhiteNetwork, as the networks were built with iterrows"""
+    if mapping['dayIsTimestamp']:
+        data[mapping['day']] = pd.to_datetime(data[mapping['day']], format=mapping['ts_format'])
+        data['Year'] = pd.DatetimeIndex(data[mapping['day']]).year
+    data.sort_values(by=mapping['day'], inplace=True)
+    graph = nx.MultiDiGraph()
+    network_info = {}
+    daily_ratings = {}
+    round_values = []
+    current_season = -1
+    day = -1
+    first_date = None
+    for row_id, row in data.iterrows():
+        if current_season != row[mapping['season']]:
+            current_season = row[mapping['season']]
+            day = -1
+        if mapping['dayIsTimestamp']:
+            if day == -1:
+                first_date = row[mapping['day']]
+            day = (row[mapping['day']] - first_date).days
+        else:
+            day = int(row[mapping['day']])
+        edge_dict = {key: value for key, value in row.items()}
+        edge_dict['day'] = day
+        edge_dict['round'] = edge_dict.get(mapping['round'], '0') if 'round' in mapping else '0'
+        edge_dict['season'] = edge_dict.get(mapping['season'], '0') if 'season' in mapping else '0'
+        if edge_dict['round'] not in round_values:
+            round_values.append(edge_dict['round'])
+        winner_mapping = mapping.get('winner', {})
+        if 'id' in winner_mapping:
+            for n in ['node1', 'node2']:
+                if winner_mapping['id'] == mapping[n]['id']:
+                    edge_dict['winner'] = n
+        elif 'result' in winner_mapping:
+            edge_dict['winner'] = winner_mapping.get('translation', {}).get(
+                edge_dict.get(winner_mapping['result'], 'ErrorReadingResult')
+            )
+        for entity in ['forecasts', 'bets', 'odds']:
+            for entity_name, entity_options in mapping.get(entity, {}).items():
+                values = [row[v] for v in entity_options.values()]
+                edge_dict.setdefault(entity, {})[entity_name] = (
+                    (list(entity_options.keys()), values) if entity == 'forecasts' else values
+                )
+        node1_id, node2_id = row[mapping['node1']['id']], row[mapping['node2']['id']]
+        if 'tournament' in mapping:
+            for n in [node1_id, node2_id]:
+                network_info.setdefault(edge_dict.get(mapping['tournament'], 'main'), {}).setdefault(
+                    str(edge_dict['season']), {}
+                ).setdefault('teams_playing', {})[n] = n
+        graph.add_edge(node1_id, node2_id, **edge_dict)
+        for n in ['node1', 'node2']:
+            for node_property_key, row_column in mapping[n].items():
+                if node_property_key not in ['id', 'ratings']:
+                    graph.nodes[row[mapping[n]['id']]][node_property_key] = row[row_column]
+                elif node_property_key == 'ratings':
+                    for rating_name, rating_column in row_column.items():
+                        daily_ratings.setdefault(rating_name, {}).setdefault(edge_dict['season'], {}).setdefault(
+                            day, {}
+                        )[row[mapping[n]['id']]] = row[rating_column]
+    for rating_name, rating_info in daily_ratings.items():
+        for season_id, season_info in rating_info.items():
+            for day_number, day_info in season_info.items():
+                for t in graph.nodes():
+                    season_ratings = graph.nodes[t].setdefault('ratings', {}).setdefault(rating_name, {})
+                    node_value = day_info[t] if t in day_info else season_ratings.get(season_id, [0])[-1]
+                    season_ratings.setdefault(season_id, []).append(node_value)
+    return graph, sorted(round_values), network_info
+
+
+def normalized(value):
+    if hasattr(value, 'probabilities'):
+        return normalized((list(value.outcomes), list(value.probabilities)))
+    if isinstance(value, (dict, Mapping)):
+        return {k: normalized(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [normalized(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return 'nan'
+    return value
+
+
+def without_missing(edge):
+    for entity in ['odds', 'bets']:
+        if entity in edge:
+            edge[entity] = {name: values for name, values in edge[entity].items() if set(values) != {'nan'}}
+            if not edge[entity]:
+                del edge[entity]
+    return edge
+
+
+def snapshot(nodes, edges, round_values, network_info):
+    nodes = {
+        t: normalized({
+            key: value if key != 'ratings' else {k: v for k, v in value.items() if k != 'hyper_parameters'}
+            for key, value in attributes.items()
+        }) for t, attributes in nodes
+    }
+    # Columnar matches report their state, active unless said otherwise, and keep all-NaN odds and bets as missing
+    edges = sorted(
+        (str(a), str(h), str(d['season']), d['day'], str(sorted(
+            (key, value) for key, value in without_missing(normalized(d)).items() if (key, value) != ('state', 'active')
+        ))) for a, h, k, d in edges
+    )
+    return nodes, edges, normalized(round_values), normalized(network_info)
+
+
+# A small table with all the mapping features, rows in day order within each season
+generator = np.random.default_rng(0)
+n_rows = 300
+table = pd.DataFrame({
+    'Away': generator.integers(0, 12, n_rows), 'Home': generator.integers(12, 24, n_rows),
+    'Day': np.sort(generator.integers(0, 60, n_rows)), 'Season': np.repeat([2019, 2020, 2021], n_rows // 3),
+    'Result': generator.choice(['H', 'D', 'A'], n_rows), 'Tournament': generator.choice(['cup', 'league'], n_rows),
+    'PHome': generator.uniform(size=n_rows), 'PDraw': generator.uniform(size=n_rows),
+    'PAway': generator.uniform(size=n_rows), 'OHome': generator.uniform(1, 5, n_rows),
+    'OAway': generator.uniform(1, 5, n_rows), 'AwayName': generator.choice(['x', 'y'], n_rows),
+    'AwayRating': np.where(generator.uniform(size=n_rows) < 0.2, np.nan, generator.uniform(size=n_rows)),
+    'HomeRating': generator.integers(0, 9, n_rows),
+})
+table_mapping = {
+    'node1': {'id': 'Away', 'name': 'AwayName', 'ratings': {'rating': 'AwayRating'}},
+    'node2': {'id': 'Home', 'ratings': {'rating': 'HomeRating'}},
+    'day': 'Day', 'dayIsTimestamp': False, 'round': 'Day', 'season': 'Season', 'tournament': 'Tournament',
+    'winner': {'result': 'Result', 'translation': {'H': 'home', 'D': 'draw', 'A': 'away'}},
+    'forecasts': {'table_forecast': {'home': 'PHome', 'draw': 'PDraw', 'away': 'PAway'}},
+    'odds': {'table_odds': {'home': 'OHome', 'away': 'OAway'}}, 'bets': {}
+}
+atp_file = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'real', 'ATP_Network_2010_2019.csv')
+with tempfile.TemporaryDirectory() as path:
+    table_file = os.path.join(path, 'table.csv')
+    table.to_csv(table_file, index=False)
+    for file_path, n_rows, mapping in [(table_file, None, table_mapping), (atp_file, 800, factory.pre_mappings['atp'])]:
+        for backend in ['graph', 'columnar']:
+            network = WhiteNetwork(data=pd.read_csv(file_path, nrows=n_rows), mapping=mapping, backend=backend)
+            graph, round_values, network_info = iterrows_network(pd.read_csv(file_path, nrows=n_rows), mapping)
+            network_nodes = [
+                (t, {**network.data.nodes[t], 'ratings': network.node_attributes[t].get('ratings', {})})
+                for t in network.data.nodes
+            ]
+            assert snapshot(
+                network_nodes, network.iterate_over_games(), network.round_values, network.network_info
+            ) == snapshot(graph.nodes(data=True), graph.edges(keys=True, data=True), round_values, network_info)
+            print(f"{os.path.basename(file_path)} {backend}: {graph.number_of_edges()} matches and "
+                  f"{graph.number_of_nodes()} teams equal to the row by row network")
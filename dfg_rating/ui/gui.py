@@ -265,12 +265,9 @@ def ratings_gui(app, mc):
 
 
 def forecasts_gui(app, mc):
-    bettings_data = mc.profitability_study(
-        "test_network",
-        BettingReturnsEvaluator(outcomes=['home', 'draw', 'away']),
-        ["simple_bookmaker"],
-        ["elo_bettor"],
-    )
+    evaluator = BettingReturnsEvaluator(outcomes=['home', 'draw', 'away'], true_model='true_forecast')
+    betting_returns = mc.betting_returns("test_network", evaluator, ["simple_bookmaker"], ["elo_bettor"])
+    bettings_data = mc.profitability_study("test_network", evaluator, ["simple_bookmaker"], ["elo_bettor"])
     df = pd.DataFrame(bettings_data)
     layout = [
         dbc.Row(
@@ -281,7 +278,7 @@ def forecasts_gui(app, mc):
                     children=html.Div(
                         dcc.Graph(
                             id="betting_chart",
-                            figure=accumulated_betting_chart(bettings_data)
+                            figure=accumulated_betting_chart(betting_returns[0])
                         )
                     ),
                     width=6
@@ -6,6 +6,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
 
+from dfg_rating.model.evaluators.profitability import BettingReturns
 from dfg_rating.model.network.base_network import BaseNetwork
 
 
@@ -220,27 +221,12 @@ def publication_chart(
 
 
 def accumulated_betting_chart(
-        data_dict
+        betting_returns: BettingReturns,
+        from_season=5
 ):
-    bets = []
-    acc_bets = 0
-    bet_returns = []
-    acc_returns = 0
-    bet_expected = []
-    acc_expected = 0
-    for v in data_dict:
-        if v['Season'] > 4:
-            for value in ["home", "draw", "away"]:
-                bet_value = v[f"bet#{value}"]
-                bet_return = v[f"return#bet#{value}"]
-                bet_expected_return = v[f"expected#bet#{value}"]
-                if bet_value > 0:
-                    acc_bets += bet_value
-                    acc_returns += bet_return
-                    acc_expected += bet_expected_return
-                    bets.append(acc_bets)
-                    bet_returns.append(acc_returns)
-                    bet_expected.append(acc_expected)
+    """Accumulated actual and expected returns after each bet placed from season <from_season> on"""
+    bet_returns = betting_returns.path('actual', from_season=from_season)
+    bet_expected = betting_returns.path('expected', from_season=from_season)
     fig = go.Figure()
     for index, (name, trace, line_dash) in enumerate([
         ("Actual returns", bet_returns, 'solid'),
@@ -233,7 +233,7 @@ class NetworkExplorer(BaseWidget):
         evaluation_dict = []
         number_of_clusters = self.network.number_of_clusters or 1
         nodes_added_to_elements = []
-        for node1, node2, edge_key, edge_info in self.network.iterate_over_games():
+        for node1, node2, edge_key, edge_info in self.network.iterate_over_games(include_inactive=show_inactive):
             if all(node not in list_of_ids for node in [node1, node2]):
                 continue
             next_match = False
@@ -907,7 +907,7 @@ class DegreeExplorer(BaseWidget):
         analysis_dict = []
         evaluation_dict = []
         number_of_clusters = self.network.number_of_clusters or 1
-        for node1, node2, edge_key, edge_info in self.network.iterate_over_games():
+        for node1, node2, edge_key, edge_info in self.network.iterate_over_games(include_inactive=show_inactive):
             if all(node not in list_of_ids for node in [node1, node2]):
                 continue
             next_match = False
@@ -1102,7 +1102,7 @@ class ForecastExplorer(BaseWidget):
         list_of_ids = nodes_filter.get('id', [n for n in self.network.data.nodes()])
         analysis_dict = []
         evaluation_dict = []
-        for node1, node2, edge_key, edge_info in self.network.iterate_over_games():
+        for node1, node2, edge_key, edge_info in self.network.iterate_over_games(include_inactive=show_inactive):
             if all(node not in list_of_ids for node in [node1, node2]):
                 continue
             next_match = False
@@ -49,7 +49,8 @@ for variance in variance_range:
             starting_point=ControlledRandomFunction(distribution='normal', loc=1000, scale=100),
             delta=ControlledRandomFunction(distribution='normal', loc=0, scale=.1),
             trend=ControlledRandomFunction(distribution='normal', loc=0, scale=30/36000000),
-            season_delta=ControlledRandomFunction(distribution='normal', loc=0, scale=0)
+            season_delta=ControlledRandomFunction(distribution='normal', loc=0, scale=0),
+            aggregated_deltas=True
         ),
         expected_matches=in_degree,
         variance_matches=variance
@@ -58,11 +59,16 @@ for variance in variance_range:
     real_degree = network_degrees.mean()
     real_variance = network_degrees.std()
     print(f"Added network with Degree variance of {variance} in {time.time() -  start_time} seconds.")
+    start_time = time.time()
+    current_network.add_rating(
+        rating=ELORating(trained=True, param_k=k_options, rating_name="elo_rating_{k}"),
+        rating_name="elo_rating_{k}"
+    )
+    print(f"Added ELO Ratings with k in {k_options} in {time.time() - start_time} seconds.")
     for k_parameter in k_options:
         start_time = time.time()
         rating_name = f"elo_rating_{k_parameter}"
         forecast_name = f"elo_forecast_{k_parameter}"
-        elo = ELORating(trained=True, param_k=k_parameter)
         rps = RankProbabilityScore(
             outcomes=['home', 'draw', 'away'],
             forecast_name=forecast_name
@@ -71,10 +77,6 @@ for variance in variance_range:
             outcomes=['home', 'draw', 'away'],
             forecast_name=forecast_name
         )
-        current_network.add_rating(
-            rating=elo,
-            rating_name=rating_name
-        )
         current_network.add_forecast(
             LogFunctionForecast(
                 outcomes=['home', 'draw', 'away'],
@@ -85,7 +87,7 @@ for variance in variance_range:
             rating_name
         )
         current_network.add_evaluation(get_evaluation_list(rating_name, forecast_name))
-        print(f"Added ELO Rating with k = {k_parameter} in {time.time() - start_time} seconds.")
+        print(f"Added ELO Forecast with k = {k_parameter} in {time.time() - start_time} seconds.")
         experiment_results += get_evaluation(
             current_network, k_parameter,
             evaluators=['RPS', 'Likelihood', 'ForecastError', 'ExpectedRPS', 'Forecastability'],
@@ -54,21 +54,23 @@ for step, current_density in enumerate(density_range):
             starting_point=ControlledRandomFunction(distribution='normal', loc=1000, scale=100),
             delta=ControlledRandomFunction(distribution='normal', loc=0, scale=.1),
             trend=ControlledRandomFunction(distribution='normal', loc=0, scale=0),
-            season_delta=ControlledRandomFunction(distribution='normal', loc=0, scale=10)
+            season_delta=ControlledRandomFunction(distribution='normal', loc=0, scale=10),
+            aggregated_deltas=True
         )
     )
     print("Density ", current_network.density(True))
     print(f"Added network {number_of_nodes}:{d} in {time.time() - start_time} seconds.")
 
+    start_time = time.time()
+    current_network.add_rating(
+        rating=ELORating(trained=True, param_k=k_options, rating_name="elo_rating_{k}"),
+        rating_name="elo_rating_{k}"
+    )
+    print(f"Added ELO Ratings with k in {k_options} in {time.time() - start_time} seconds.")
     for k_parameter in k_options:
         start_time = time.time()
         rating_name = f"elo_rating_{k_parameter}"
         forecast_name = f"elo_forecast_{k_parameter}"
-        elo = ELORating(trained=True, param_k=k_parameter)
-        current_network.add_rating(
-            rating=elo,
-            rating_name=rating_name
-        )
         current_network.add_forecast(
             LogFunctionForecast(
                 outcomes=['home', 'draw', 'away'],
@@ -81,7 +83,7 @@ for step, current_density in enumerate(density_range):
         current_network.add_evaluation(
             get_evaluation_list(rating_name, forecast_name)
         )
-        print(f"Added ELO Rating with k = {k_parameter} in {time.time() - start_time} seconds.")
+        print(f"Added ELO Forecast with k = {k_parameter} in {time.time() - start_time} seconds.")
         experiment_results += get_evaluation(
             current_network, k_parameter,
             evaluators=['RPS', 'Likelihood', 'ForecastError', 'ExpectedRPS', 'Forecastability'],